@@ -19,12 +19,22 @@ import streamlit as st
 from pathlib import Path
 
 from psl_dashboard import tabs
+from psl_dashboard.cancellation import begin_fetch_scope
+from psl_dashboard.components import render_fetch_metrics
+from psl_dashboard.metrics import start_exporter
+from psl_dashboard.profiler import finish_rerun, render_profile, start_rerun
 from psl_dashboard.config import (
     PROJECT_NAME,
     PROJECT_VERSION,
     PROJECT_DESCRIPTION,
     API_BASE_URL,
+    LOCAL_DATA_PATH,
+    METRICS_FILE,
+    METRICS_FILE_INTERVAL,
+    METRICS_PORT,
+    MEMORY_DIAGNOSTICS,
     get_psl_logo,
+    is_local_source,
     validate_images_directory,
 )
 
@@ -75,19 +85,35 @@ def render_sidebar():
         st.write(f"✅ PSL logo: {'Found' if validation['psl_logo_exists'] else '❌ Missing'}")
         st.write(f"✅ Team logos: {validation['team_logos_found']}/{validation['total_teams']}")
     
-    st.sidebar.info("💡 Responses are cached per endpoint to reduce API load.")
+    # Filled after the tabs render so they include this rerun's requests
+    diagnostics = st.sidebar.expander("📈 Fetch Diagnostics")
+    memory = st.sidebar.container() if MEMORY_DIAGNOSTICS else None
+
+    if is_local_source():
+        st.sidebar.info(f"💾 Serving stats from local dataset: {Path(LOCAL_DATA_PATH).name}")
+    else:
+        st.sidebar.info("💡 Responses are cached per endpoint to reduce API load.")
     
     # Footer
     st.sidebar.divider()
     st.sidebar.caption("Built with FastAPI, Streamlit & ❤️")
+    return diagnostics, memory
 
 
 def main():
     """Main application entry point."""
     setup_page_config()
+    start_exporter(METRICS_PORT, METRICS_FILE, METRICS_FILE_INTERVAL)
+    start_rerun()
+    begin_fetch_scope()
+    if MEMORY_DIAGNOSTICS:
+        from psl_dashboard.memory import get_monitor
+
+        # Start tracing before the tabs allocate anything
+        get_monitor()
     
     # Render sidebar
-    render_sidebar()
+    diagnostics, memory = render_sidebar()
     
     # Main header
     st.title(f"🏏 {PROJECT_NAME}")
@@ -114,6 +140,15 @@ def main():
     tabs.render_leaderboards(tab_handles[5])
     tabs.render_api_docs(tab_handles[6])
 
+    with diagnostics:
+        render_fetch_metrics()
+    if memory is not None:
+        from psl_dashboard.memory import render_memory_diagnostics
+
+        with memory:
+            render_memory_diagnostics()
+    render_profile(finish_rerun())
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
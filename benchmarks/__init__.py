@@ -0,0 +1,11 @@
+"""
+PSL Analytics Hub - Benchmarks
+==============================
+Reproducible performance benchmarks for the dashboard.
+
+- ``benchmarks.stub_api``: local stub of every documented API endpoint with
+  configurable latency, jitter and payload size
+- ``benchmarks.run``: headless cold/warm rerun benchmark written as JSON
+- ``benchmarks.load``: concurrent-session load test
+- ``benchmarks.replay``: replay of ``PSL_TRAFFIC_CAPTURE`` traces
+"""
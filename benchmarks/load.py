@@ -0,0 +1,235 @@
+"""
+PSL Analytics Hub - Load Test
+=============================
+Simulate N concurrent dashboard sessions in one process against the stub
+API, and report how throughput, latency and memory change as N grows.
+
+Each session is a ``streamlit.testing.v1.AppTest`` on its own thread that
+follows a scripted journey. Switching ``st.tabs`` does not rerun a Streamlit
+script, so each journey step is the rerun triggered by a widget in that tab:
+
+1. ``home``: first page load
+2. ``players``: pick a player
+3. ``compare``: pick two players to compare
+4. ``leaderboards``: change the custom leaderboard metric (a plain rerun
+   when the tab has no widgets, as with the API data source)
+
+Sessions share the process's Streamlit caches, as they would on one
+server. Each concurrency level reports:
+
+- reruns per second;
+- rerun latency percentiles, overall and per step;
+- backend requests per session;
+- process RSS.
+
+Usage:
+    python -m benchmarks.load --sessions 1,5,10,20 --out load.json
+    python -m benchmarks.load --sessions 10 --journeys 3 --think-ms 500 --latency-ms 60
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from .run import _clear_caches, _new_session, use_benchmark_settings
+
+PERCENTILES = (50, 90, 95, 99)
+
+_MB = 1024 * 1024
+
+
+def _widget(widgets, label: str):
+    return next((widget for widget in widgets if widget.label == label), None)
+
+
+def _pick(widget, rng: random.Random, exclude=()):
+    if widget is None:
+        return None
+    options = [option for option in widget.options if option not in exclude]
+    if options:
+        widget.set_value(rng.choice(options))
+    return widget.value
+
+
+def _step_players(at, rng: random.Random):
+    _pick(_widget(at.selectbox, "Select player"), rng)
+
+
+def _step_compare(at, rng: random.Random):
+    first = _pick(_widget(at.selectbox, "Player 1"), rng)
+    _pick(_widget(at.selectbox, "Player 2"), rng, exclude={first})
+
+
+def _step_leaderboards(at, rng: random.Random):
+    _pick(_widget(at.selectbox, "Metric"), rng)
+
+
+# Step name -> widget changes made before that step's rerun
+JOURNEY: list[tuple[str, Callable | None]] = [
+    ("home", None),
+    ("players", _step_players),
+    ("compare", _step_compare),
+    ("leaderboards", _step_leaderboards),
+]
+
+
+def _percentiles(values: list[float]) -> dict[str, float | None]:
+    if not values:
+        return {f"p{p}": None for p in PERCENTILES}
+    ordered = sorted(values)
+    return {f"p{p}": round(1000 * ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))], 1) for p in PERCENTILES}
+
+
+def _run_session(index: int, url: str, journeys: int, think: float, timeout: float, seed: int, start: threading.Barrier, results: list):
+    rng = random.Random(f"{seed}:{index}")
+    timings: list[tuple[str, float]] = []
+    errors: list[str] = []
+    try:
+        start.wait()
+        at = _new_session(url, timeout)
+        for _ in range(journeys):
+            for step, interact in JOURNEY:
+                if interact is not None:
+                    interact(at, rng)
+                started = time.perf_counter()
+                at.run(timeout=timeout)
+                timings.append((step, time.perf_counter() - started))
+                errors.extend(str(exception.value) for exception in at.exception)
+                if think:
+                    time.sleep(think * rng.uniform(0.5, 1.5))
+    except Exception as exc:  # a failed session is reported, not fatal
+        errors.append(f"{type(exc).__name__}: {exc}")
+    results[index] = {"timings": timings, "errors": errors}
+
+
+def run_level(stub, sessions: int, journeys: int = 1, think_ms: float = 0.0, timeout: float = 120.0, seed: int = 0, cold: bool = True) -> dict:
+    """
+    Run ``sessions`` concurrent journeys and summarize them.
+
+    Args:
+        stub: Started :class:`benchmarks.stub_api.StubServer`
+        sessions: Concurrent sessions
+        journeys: Times each session repeats the journey
+        think_ms: Mean pause between steps (uniform ±50%)
+        timeout: Seconds allowed per rerun
+        seed: Seed for widget choices and pauses
+        cold: Clear every Streamlit cache before the level starts
+
+    Returns:
+        Throughput, latency percentiles, backend requests and RSS for the level
+    """
+    from psl_dashboard.memory import rss_bytes
+
+    if cold:
+        _clear_caches()
+    stub.reset_counts()
+    rss_before = rss_bytes()
+    results: list[dict | None] = [None] * sessions
+    start = threading.Barrier(sessions + 1)
+    threads = [
+        threading.Thread(
+            target=_run_session,
+            args=(index, stub.url, journeys, think_ms / 1000, timeout, seed, start, results),
+            name=f"psl-load-{index}",
+            daemon=True,
+        )
+        for index in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+
+    peak = rss_before or 0
+    start.wait()
+    started = time.perf_counter()
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=0.2)
+        peak = max(peak, rss_bytes() or 0)
+    elapsed = time.perf_counter() - started
+
+    timings = [timing for result in results if result for timing in result["timings"]]
+    errors = [error for result in results if result for error in result["errors"]]
+    by_step = {step: [seconds for name, seconds in timings if name == step] for step, _ in JOURNEY}
+    rss_after = rss_bytes()
+    return {
+        "sessions": sessions,
+        "reruns": len(timings),
+        "seconds": round(elapsed, 2),
+        "reruns_per_s": round(len(timings) / elapsed, 2) if elapsed else None,
+        "latency_ms": {"mean": round(1000 * statistics.fmean(seconds for _, seconds in timings), 1) if timings else None, **_percentiles([seconds for _, seconds in timings])},
+        "steps": {step: _percentiles(values) for step, values in by_step.items()},
+        "backend_requests": sum(stub.counts().values()),
+        "backend_requests_per_session": round(sum(stub.counts().values()) / sessions, 1),
+        "rss_mb": round(rss_after / _MB, 1) if rss_after else None,
+        "rss_peak_mb": round(peak / _MB, 1) if peak else None,
+        "rss_growth_mb": round((rss_after - rss_before) / _MB, 1) if rss_after and rss_before else None,
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+    }
+
+
+_COLUMNS = f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'backend/sess':>12} {'RSS MB':>8} {'peak MB':>8} {'errors':>6}"
+
+
+def _print_level(level: dict):
+    latency = level["latency_ms"]
+    print(
+        f"{level['sessions']:>8} {level['reruns_per_s']:>9} {latency['p50']:>8} {latency['p95']:>8} {latency['p99']:>8} "
+        f"{level['backend_requests_per_session']:>12} {level['rss_mb']:>8} {level['rss_peak_mb']:>8} {level['errors']:>6}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    use_benchmark_settings(profile=False)
+
+    from psl_dashboard.config import PROJECT_VERSION
+
+    from .run import _git_revision
+    from .stub_api import StubServer, add_stub_arguments
+
+    parser = argparse.ArgumentParser(description="Load-test one dashboard process with concurrent sessions.")
+    parser.add_argument("--sessions", default="1,5,10", help="Comma-separated concurrency levels")
+    parser.add_argument("--journeys", type=int, default=1, help="Journeys per session")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean pause between steps")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds allowed per rerun")
+    parser.add_argument("--warm", action="store_true", help="Keep caches between levels instead of starting each cold")
+    parser.add_argument("--out", help="Results file (JSON)")
+    add_stub_arguments(parser.add_argument_group("stub API"))
+    args = parser.parse_args(argv)
+
+    try:
+        levels = sorted({int(value) for value in args.sessions.split(",") if value.strip()})
+    except ValueError:
+        parser.error("--sessions must be comma-separated integers")
+    if not levels or min(levels) < 1:
+        parser.error("--sessions must be positive")
+
+    results = []
+    print(_COLUMNS)
+    with StubServer(0, args.latency_ms, args.jitter_ms, args.players, args.payload_scale, args.seed, args.msgpack) as stub:
+        for sessions in levels:
+            results.append(run_level(stub, sessions, max(1, args.journeys), args.think_ms, args.timeout, args.seed, cold=not args.warm))
+            _print_level(results[-1])
+
+    if args.out:
+        Path(args.out).write_text(json.dumps({
+            "version": PROJECT_VERSION,
+            "revision": _git_revision(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": {key: value for key, value in vars(args).items() if key != "out"},
+            "journey": [step for step, _ in JOURNEY],
+            "levels": results,
+        }, indent=2))
+        print(f"Wrote {args.out}")
+    return 1 if any(level["errors"] for level in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+PSL Analytics Hub - Traffic Replay
+==================================
+Re-issue a captured ``PSL_TRAFFIC_CAPTURE`` trace against a backend and
+report latency percentiles per endpoint template, next to the latencies
+captured in production.
+
+Requests are dispatched at their original offsets, divided by ``--speed``
+(``--speed 0`` sends them back to back). They run on a thread pool, so the
+original concurrency is kept.
+
+Replay goes through the dashboard's fetch layer (``fetch_timed``), so
+requests captured as cached use the Streamlit data cache and those captured
+as uncached bypass it. This lets caching and concurrency changes be judged on
+real traffic shapes.
+
+Backends:
+
+- ``--stub``: the local stub API (``benchmarks.stub_api`` options apply)
+- ``--api-base URL``: any running API
+- ``--local --data PATH``: the local engine on a dataset snapshot
+
+Usage:
+    python -m benchmarks.replay trace.jsonl --stub --speed 10
+    python -m benchmarks.replay trace.jsonl --local --data Data/PSL.csv --speed 0 --out replay.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .load import _percentiles
+from .run import use_benchmark_settings
+
+# Dispatch delays above this are reported as replay lag (the pool saturated)
+LAG_WARNING_MS = 50.0
+
+
+def _captured(entries: list[dict]) -> dict[str, dict]:
+    by_template: dict[str, list[dict]] = {}
+    for entry in entries:
+        by_template.setdefault(entry.get("tpl") or entry["ep"], []).append(entry)
+    summary = {}
+    for template, group in by_template.items():
+        cacheable = [entry for entry in group if entry.get("out") in ("hit", "miss", "stale")]
+        summary[template] = {
+            **_percentiles([entry.get("ms", 0.0) / 1000 for entry in group]),
+            "hit_pct": round(100 * sum(entry["out"] == "hit" for entry in cacheable) / len(cacheable), 1) if cacheable else None,
+        }
+    return summary
+
+
+def api_sender(base_url: str) -> Callable[[dict], str]:
+    """Send an entry through the fetch layer; returns "error" when it failed."""
+    import requests
+
+    from psl_dashboard.api import fetch_timed
+
+    def send(entry: dict) -> str:
+        use_cache = entry.get("out") != "uncached"
+        try:
+            fetch_timed(base_url, entry["ep"], entry.get("m", "GET"), entry.get("p"), entry.get("b"), use_cache)
+        except requests.RequestException:
+            return "error"
+        return "sent"
+
+    return send
+
+
+def local_sender(data_path: str) -> Callable[[dict], str]:
+    """Answer an entry from the local engine on ``data_path``."""
+    from psl_dashboard.engine import BadRequestError, DeliveryStore, handle_request
+
+    store = DeliveryStore.from_path(data_path)
+
+    def send(entry: dict) -> str:
+        try:
+            handle_request(store, entry["ep"], entry.get("m", "GET"), entry.get("p"), entry.get("b"))
+        except (BadRequestError, LookupError):
+            return "error"
+        return "local"
+
+    return send
+
+
+def replay(entries: list[dict], send: Callable[[dict], str], speed: float = 1.0, workers: int = 32) -> dict:
+    """
+    Re-issue ``entries`` and time each one.
+
+    Args:
+        entries: Trace entries, oldest first (see :func:`psl_dashboard.traffic.read_trace`)
+        send: Issues one entry and returns "error" when it failed
+        speed: Time compression factor (0 sends back to back)
+        workers: Maximum requests in flight
+
+    Returns:
+        Per-template latency percentiles and errors, plus overall rate and lag
+    """
+    if not entries:
+        return {"requests": 0, "endpoints": {}}
+    results: list[tuple[str, float, bool]] = []
+    lags: list[float] = []
+    lock = threading.Lock()
+    origin = entries[0]["t"]
+
+    def issue(entry: dict, due: float):
+        started = time.perf_counter()
+        outcome = send(entry)
+        elapsed = time.perf_counter() - started
+        with lock:
+            results.append((entry.get("tpl") or entry["ep"], elapsed, outcome == "error"))
+            # Back-to-back replay has no schedule to lag behind
+            if speed:
+                lags.append(max(0.0, started - due))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for entry in entries:
+            due = started + ((entry["t"] - origin) / speed if speed else 0.0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(issue, entry, due)
+    elapsed = time.perf_counter() - started
+
+    by_template: dict[str, list[tuple[float, bool]]] = {}
+    for template, seconds, failed in results:
+        by_template.setdefault(template, []).append((seconds, failed))
+    endpoints = {
+        template: {
+            "requests": len(group),
+            **_percentiles([seconds for seconds, _ in group]),
+            "errors": sum(failed for _, failed in group),
+        }
+        for template, group in sorted(by_template.items(), key=lambda item: len(item[1]), reverse=True)
+    }
+    return {
+        "requests": len(results),
+        "seconds": round(elapsed, 2),
+        "requests_per_s": round(len(results) / elapsed, 1) if elapsed else None,
+        "trace_seconds": round(entries[-1]["t"] - origin, 2),
+        "lag_ms": _percentiles(lags),
+        "endpoints": endpoints,
+    }
+
+
+def _cache_hit_pct() -> dict[str, float | None]:
+    from psl_dashboard.metrics import FETCH_METRICS
+
+    return {row["endpoint"]: row["hit_pct"] for row in FETCH_METRICS.summary()}
+
+
+def _print_report(report: dict, captured: dict[str, dict]):
+    print(f"{'endpoint':<40} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'cap p50':>8} {'cap p95':>8} {'hit %':>6} {'cap hit':>7} {'err':>4}")
+    for template, row in report["endpoints"].items():
+        before = captured.get(template, {})
+        print(
+            f"{template:<40} {row['requests']:>6} {row['p50']:>8} {row['p95']:>8} {row['p99']:>8} "
+            f"{str(before.get('p50')):>8} {str(before.get('p95')):>8} {str(row.get('hit_pct')):>6} {str(before.get('hit_pct')):>7} {row['errors']:>4}"
+        )
+    print(
+        f"{report['requests']} requests in {report['seconds']} s ({report['requests_per_s']}/s; "
+        f"trace spans {report['trace_seconds']} s); dispatch lag p95 {report['lag_ms']['p95']} ms"
+    )
+    if (report["lag_ms"]["p95"] or 0) > LAG_WARNING_MS:
+        print("warning: requests were dispatched late; raise --workers or lower --speed", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    use_benchmark_settings(profile=False)
+    # Replayed requests must not be captured again
+    os.environ.pop("PSL_TRAFFIC_CAPTURE", None)
+
+    from psl_dashboard.traffic import read_trace
+
+    from .stub_api import StubServer, add_stub_arguments
+
+    parser = argparse.ArgumentParser(description="Replay a captured dashboard traffic trace.")
+    parser.add_argument("trace", help="JSONL trace written with PSL_TRAFFIC_CAPTURE")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--stub", action="store_true", help="Replay against the local stub API")
+    target.add_argument("--api-base", help="Replay against this API base URL")
+    target.add_argument("--local", action="store_true", help="Replay against the local engine")
+    parser.add_argument("--data", help="Dataset snapshot used with --local")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time compression (2 = twice as fast, 0 = back to back)")
+    parser.add_argument("--workers", type=int, default=32, help="Maximum requests in flight")
+    parser.add_argument("--limit", type=int, help="Replay only the first N requests")
+    parser.add_argument("--out", help="Results file (JSON)")
+    add_stub_arguments(parser.add_argument_group("stub API (with --stub)"))
+    args = parser.parse_args(argv)
+    if args.local and not args.data:
+        parser.error("--local requires --data")
+    if args.speed < 0:
+        parser.error("--speed must be >= 0")
+
+    entries = read_trace(args.trace)[: args.limit]
+    if not entries:
+        print(f"No requests in {args.trace}", file=sys.stderr)
+        return 1
+
+    stub = None
+    if args.local:
+        send = local_sender(args.data)
+    elif args.stub:
+        stub = StubServer(0, args.latency_ms, args.jitter_ms, args.players, args.payload_scale, args.seed, args.msgpack).start()
+        send = api_sender(stub.url)
+    else:
+        send = api_sender(args.api_base.rstrip("/"))
+    try:
+        report = replay(entries, send, args.speed, args.workers)
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    if not args.local:
+        for template, hit_pct in _cache_hit_pct().items():
+            if template in report["endpoints"]:
+                report["endpoints"][template]["hit_pct"] = hit_pct
+    captured = _captured(entries)
+    _print_report(report, captured)
+    if args.out:
+        Path(args.out).write_text(json.dumps({
+            "trace": str(args.trace),
+            "config": {key: value for key, value in vars(args).items() if key not in ("trace", "out")},
+            "captured": captured,
+            "replay": report,
+        }, indent=2))
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
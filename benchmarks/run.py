@@ -0,0 +1,368 @@
+"""
+PSL Analytics Hub - Rerun Benchmark
+===================================
+Drive the dashboard headlessly against the stub API and write rerun costs as
+JSON, so performance can be compared between versions.
+
+Each benchmark measures three phases with ``streamlit.testing.v1.AppTest``:
+
+- ``first``: the first run in the process (module imports, empty caches)
+- ``cold``: new sessions after every Streamlit cache is cleared
+- ``warm``: reruns of one session with the caches populated
+
+Each phase records:
+
+- the median rerun time, and time per tab (from the render profiler);
+- app fetches and backend requests per rerun;
+- the cache hit ratio;
+- time spent in ``st.image``.
+
+Image lookup cost (``local_image_for_name``) is measured separately over the
+stub roster and the team names. So is response decode cost, for each wire
+format the stub and the installed codecs support.
+
+Usage:
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --latency-ms 80 --payload-scale 4 --out slow_api.json
+    python -m benchmarks.run --out new.json --baseline bench.json --tolerance 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+# Differences below these are never regressions (rerun and tab timings in
+# milliseconds, image lookups in microseconds)
+MIN_REGRESSION_MS = 5.0
+MIN_REGRESSION_US = 5.0
+
+
+def _git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=APP_PATH.parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _spans(node: dict, kind: str, name: str | None = None):
+    if node["kind"] == kind and (name is None or node["name"] == name):
+        yield node
+    for child in node["children"]:
+        yield from _spans(child, kind, name)
+
+
+def _fetch_totals() -> dict[str, int]:
+    from psl_dashboard.metrics import FETCH_METRICS
+
+    totals: dict[str, int] = {}
+    for row in FETCH_METRICS.summary():
+        for outcome in ("requests", "hit", "miss", "stale", "uncached", "local"):
+            totals[outcome] = totals.get(outcome, 0) + (row.get(outcome) or 0)
+    return totals
+
+
+def _measure(at, stub, timeout: float) -> dict:
+    """Run the app once and collect that rerun's costs."""
+    before = _fetch_totals()
+    stub.reset_counts()
+    started = time.perf_counter()
+    at.run(timeout=timeout)
+    elapsed = time.perf_counter() - started
+    after = _fetch_totals()
+    fetches = {outcome: after.get(outcome, 0) - before.get(outcome, 0) for outcome in after}
+
+    profiles = at.session_state["_render_profiles"] if "_render_profiles" in at.session_state else []
+    profile = profiles[-1] if profiles else None
+    tabs = {}
+    image_ms = 0.0
+    if profile is not None:
+        tabs = {span["name"].removeprefix("tabs.render_"): span["ms"] for span in _spans(profile, "tab")}
+        image_ms = sum(span["ms"] for span in _spans(profile, "streamlit", "st.image"))
+    return {
+        "total_ms": round(1000 * elapsed, 1),
+        "tabs": tabs,
+        "fetches": fetches.get("requests", 0),
+        "hits": fetches.get("hit", 0),
+        "cacheable": fetches.get("hit", 0) + fetches.get("miss", 0) + fetches.get("stale", 0),
+        "backend_requests": sum(stub.counts().values()),
+        "backend_kb": round(stub.bytes_served() / 1000, 1),
+        "st_image_ms": round(image_ms, 1),
+        "exceptions": [str(exception.value) for exception in at.exception],
+    }
+
+
+def _summarize(runs: list[dict]) -> dict:
+    """Median of each metric across a phase's runs."""
+    tab_names = list(dict.fromkeys(name for run in runs for name in run["tabs"]))
+    cacheable = sum(run["cacheable"] for run in runs)
+    return {
+        "runs": len(runs),
+        "total_ms": round(statistics.median(run["total_ms"] for run in runs), 1),
+        "total_ms_max": max(run["total_ms"] for run in runs),
+        "tabs": {name: round(statistics.median(run["tabs"].get(name, 0.0) for run in runs), 1) for name in tab_names},
+        "fetches": statistics.median(run["fetches"] for run in runs),
+        "backend_requests": statistics.median(run["backend_requests"] for run in runs),
+        "backend_kb": statistics.median(run["backend_kb"] for run in runs),
+        "cache_hit_ratio": round(sum(run["hits"] for run in runs) / cacheable, 3) if cacheable else None,
+        "st_image_ms": round(statistics.median(run["st_image_ms"] for run in runs), 1),
+        "exceptions": sorted({exception for run in runs for exception in run["exceptions"]}),
+    }
+
+
+def _new_session(url: str, timeout: float):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    at.session_state["api_base_override"] = url
+    return at
+
+
+def _clear_caches():
+    import streamlit as st
+
+    from psl_dashboard.metrics import FETCH_METRICS
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    FETCH_METRICS.reset()
+
+
+def image_lookup_cost(names: list[str], rounds: int = 3) -> dict:
+    """Per-call cost of ``local_image_for_name`` over ``names``."""
+    from psl_dashboard.utils import local_image_for_name
+
+    timings = []
+    found = 0
+    for round_index in range(rounds):
+        for name in names:
+            started = time.perf_counter()
+            path = local_image_for_name(name)
+            timings.append(time.perf_counter() - started)
+            if round_index == 0 and path:
+                found += 1
+    timings.sort()
+    return {
+        "lookups": len(names),
+        "found": found,
+        "mean_us": round(1e6 * statistics.fmean(timings), 1),
+        "p95_us": round(1e6 * timings[int(0.95 * (len(timings) - 1))], 1),
+    }
+
+
+def _decode_timing(decode, bodies: list[bytes], rounds: int) -> dict:
+    timings = []
+    for _ in range(rounds):
+        for body in bodies:
+            started = time.perf_counter()
+            decode(body)
+            timings.append(time.perf_counter() - started)
+    return {"mean_us": round(1e6 * statistics.fmean(timings), 1), "kb": round(statistics.fmean(len(body) for body in bodies) / 1000, 1)}
+
+
+def decode_cost(stub, rounds: int = 5) -> dict:
+    """
+    Per-body decode cost of the stub's largest payloads, per wire format.
+
+    ``json_requests`` is the previous decode path (``response.json()``:
+    charset guess, bytes to str, standard library parser) on the same bodies.
+    """
+    import requests
+    from requests.utils import guess_json_utf
+
+    from psl_dashboard.codecs import CODECS
+    from psl_dashboard.tabs.leaderboards import LEADERBOARDS
+
+    names = stub.data.players[:10]
+    endpoints = [board["endpoint"] for board in LEADERBOARDS]
+    endpoints += [f"/players/{name}/{route}" for name in names for route in ("stats", "growth")]
+    results = {}
+    for codec in dict.fromkeys(CODECS.values()):
+        bodies = [requests.get(f"{stub.url}{endpoint}", headers={"Accept": codec.media_type}, timeout=30).content for endpoint in endpoints]
+        results[codec.name] = {"library": codec.library, **_decode_timing(codec.decode, bodies, rounds)}
+        if codec.name == "json":
+            baseline = _decode_timing(lambda body: requests.models.complexjson.loads(body.decode(guess_json_utf(body))), bodies, rounds)
+            results["json_requests"] = {"library": "requests", **baseline}
+    return results
+
+
+def run_benchmark(stub, repeat: int = 3, reruns: int = 3, timeout: float = 120.0) -> dict:
+    """
+    Benchmark the dashboard against a running stub server.
+
+    Args:
+        stub: Started :class:`benchmarks.stub_api.StubServer`
+        repeat: Cold runs (new session, caches cleared)
+        reruns: Warm reruns of one session
+        timeout: Seconds allowed per rerun
+
+    Returns:
+        ``first``, ``cold`` and ``warm`` phase summaries plus image lookup
+        and decode costs
+    """
+    from psl_dashboard.config import TEAM_NAMES
+
+    _clear_caches()
+    first = _measure(_new_session(stub.url, timeout), stub, timeout)
+
+    cold = []
+    for _ in range(max(1, repeat)):
+        _clear_caches()
+        cold.append(_measure(_new_session(stub.url, timeout), stub, timeout))
+
+    # A new session on the populated caches; its first run fills session state
+    at = _new_session(stub.url, timeout)
+    at.run(timeout=timeout)
+    warm = [_measure(at, stub, timeout) for _ in range(max(1, reruns))]
+
+    return {
+        "phases": {"first": _summarize([first]), "cold": _summarize(cold), "warm": _summarize(warm)},
+        "images": image_lookup_cost([*stub.data.players, *TEAM_NAMES]),
+        "decode": decode_cost(stub),
+    }
+
+
+def _flatten(results: dict) -> dict[str, float]:
+    """Comparable metrics keyed by path, e.g. ``warm.tabs.players``."""
+    flat = {}
+    for phase, summary in results["phases"].items():
+        flat[f"{phase}.total_ms"] = summary["total_ms"]
+        flat[f"{phase}.backend_requests"] = summary["backend_requests"]
+        flat[f"{phase}.fetches"] = summary["fetches"]
+        for tab, ms in summary["tabs"].items():
+            flat[f"{phase}.tabs.{tab}"] = ms
+    flat["images.mean_us"] = results["images"]["mean_us"]
+    for name, timing in results.get("decode", {}).items():
+        flat[f"decode.{name}.mean_us"] = timing["mean_us"]
+    return flat
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> list[dict]:
+    """
+    Metrics that got worse than ``baseline`` by more than ``tolerance``.
+
+    Timings must also worsen by at least :data:`MIN_REGRESSION_MS`
+    (:data:`MIN_REGRESSION_US` for image lookups and decoding); request
+    counts regress on any increase.
+    """
+    current, previous = _flatten(results), _flatten(baseline)
+    regressions = []
+    for key, value in current.items():
+        old = previous.get(key)
+        if old is None or value is None:
+            continue
+        if key.endswith(("backend_requests", "fetches")):
+            worse = value > old
+        else:
+            floor = MIN_REGRESSION_US if key.endswith("_us") else MIN_REGRESSION_MS
+            worse = value > old * (1 + tolerance) and value - old >= floor
+        if worse:
+            regressions.append({"metric": key, "baseline": old, "current": value, "change_pct": round(100 * (value - old) / old, 1) if old else None})
+    return regressions
+
+
+def _print_summary(results: dict):
+    for phase, summary in results["phases"].items():
+        hit_ratio = summary["cache_hit_ratio"]
+        print(
+            f"{phase:>5}: {summary['total_ms']:8.1f} ms  fetches {summary['fetches']:>5}  "
+            f"backend {summary['backend_requests']:>5}  hit ratio {'-' if hit_ratio is None else f'{hit_ratio:.0%}'}  "
+            f"st.image {summary['st_image_ms']:.1f} ms"
+        )
+        print("       " + "  ".join(f"{tab} {ms:.0f}" for tab, ms in summary["tabs"].items()))
+    images = results["images"]
+    print(f"images: {images['mean_us']} µs mean, {images['p95_us']} µs p95 ({images['found']}/{images['lookups']} found)")
+    decode = results.get("decode", {})
+    if decode:
+        print("decode: " + "  ".join(f"{name} ({timing['library']}) {timing['mean_us']} µs/{timing['kb']} kB" for name, timing in decode.items()))
+
+
+def use_benchmark_settings(profile: bool = True):
+    """
+    Point the dashboard at the stub API with diagnostics off.
+
+    Must run before ``psl_dashboard.config`` is first imported, which reads
+    these settings.
+    """
+    os.environ["PSL_PROFILE"] = "1" if profile else ""
+    os.environ["PSL_DATA_SOURCE"] = "api"
+    os.environ["PSL_METRICS_PORT"] = "0"
+    os.environ["PSL_METRICS_FILE"] = ""
+    os.environ.pop("PSL_MEMORY", None)
+
+
+def main(argv: list[str] | None = None) -> int:
+    use_benchmark_settings()
+
+    import streamlit
+
+    from psl_dashboard.config import PROJECT_VERSION
+
+    from .stub_api import StubServer, add_stub_arguments
+
+    parser = argparse.ArgumentParser(description="Benchmark dashboard reruns against a local stub API.")
+    parser.add_argument("--out", default="bench.json", help="Results file (JSON)")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold runs (new session, caches cleared)")
+    parser.add_argument("--reruns", type=int, default=3, help="Warm reruns of one session")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds allowed per rerun")
+    parser.add_argument("--baseline", help="Earlier results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown against --baseline")
+    add_stub_arguments(parser.add_argument_group("stub API"))
+    args = parser.parse_args(argv)
+
+    with StubServer(0, args.latency_ms, args.jitter_ms, args.players, args.payload_scale, args.seed, args.msgpack) as stub:
+        results = {
+            "version": PROJECT_VERSION,
+            "revision": _git_revision(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "config": {
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "players": args.players,
+                "payload_scale": args.payload_scale,
+                "seed": args.seed,
+                "repeat": args.repeat,
+                "reruns": args.reruns,
+            },
+            **run_benchmark(stub, args.repeat, args.reruns, args.timeout),
+        }
+
+    status = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("config") != results["config"]:
+            print("warning: baseline was run with a different configuration", file=sys.stderr)
+        results["regressions"] = compare(results, baseline, args.tolerance)
+        status = 1 if results["regressions"] else 0
+
+    Path(args.out).write_text(json.dumps(results, indent=2))
+    _print_summary(results)
+    for regression in results.get("regressions", []):
+        print(f"REGRESSION {regression['metric']}: {regression['baseline']} -> {regression['current']} ({regression['change_pct']}%)")
+    exceptions = {exception for summary in results["phases"].values() for exception in summary["exceptions"]}
+    if exceptions:
+        print(f"{len(exceptions)} exception(s) raised while rendering; see {args.out}", file=sys.stderr)
+        status = status or 2
+    print(f"Wrote {args.out}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+PSL Analytics Hub - Stub API
+============================
+Local stand-in for the PSL stats API, serving every endpoint listed in the
+API Docs tab with deterministic synthetic data.
+
+- Latency: each response is delayed by ``latency_ms`` plus a uniform
+  ``±jitter_ms``.
+- Payload size: ``players`` sets the roster size, and ``payload_scale``
+  multiplies the rows of list and breakdown payloads.
+- Names: player names come from ``downloads_psl_players`` when present, so
+  image lookups exercise both hits and misses.
+- Counts: requests are counted per endpoint template, so benchmarks can
+  report backend requests per rerun.
+- Wire format: responses are MessagePack when the client's ``Accept``
+  header prefers it and msgpack or msgspec is installed, otherwise JSON.
+  ``--no-msgpack`` always serves JSON.
+
+Usage:
+    python -m benchmarks.stub_api --port 8765 --latency-ms 40 --jitter-ms 10
+    PSL_API_BASE=http://127.0.0.1:8765 streamlit run app.py
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from psl_dashboard.codecs import JSON_CODEC, negotiate
+from psl_dashboard.config import BASE_DIR, TEAM_NAMES
+from psl_dashboard.metrics import endpoint_template
+
+SEASONS = list(range(2016, 2026))
+
+# Breakdown rows per payload at payload_scale=1
+OPPONENT_ROWS = len(TEAM_NAMES)
+LEADERBOARD_ROWS = 10
+
+
+def _roster(size: int) -> list[str]:
+    """Names from the player image directory, padded with synthetic names."""
+    image_dir = BASE_DIR / "downloads_psl_players"
+    names = sorted(path.stem.replace("_", " ") for path in image_dir.glob("*.jpg")) if image_dir.exists() else []
+    names = names[:size]
+    names += [f"Stub Player {index:04d}" for index in range(size - len(names))]
+    return names
+
+
+class StubData:
+    """Deterministic payloads for every documented endpoint."""
+
+    def __init__(self, players: int = 60, payload_scale: float = 1.0, seed: int = 0):
+        self.players = _roster(max(2, players))
+        self.scale = max(payload_scale, 0.1)
+        self.seed = seed
+        self._routes = [
+            (re.compile(pattern), handler)
+            for pattern, handler in (
+                (r"/", lambda: {"message": "PSL stub API"}),
+                (r"/health", lambda: {"status": "ok"}),
+                (r"/players", lambda: self.players),
+                (r"/bowlers", lambda: self.players),
+                (r"/players/top", lambda limit=LEADERBOARD_ROWS: self._top("batter", "batsman_runs", 900, limit)),
+                (r"/players/top-sixes", lambda limit=LEADERBOARD_ROWS: self._top("batter", "sixes", 90, limit)),
+                (r"/players/top-fours", lambda limit=LEADERBOARD_ROWS: self._top("batter", "fours", 200, limit)),
+                (r"/players/top-catches", lambda limit=LEADERBOARD_ROWS: self._top("fielder", "catches", 40, limit)),
+                (r"/players/top-mom", lambda limit=LEADERBOARD_ROWS: self._top("player_of_match", "awards", 12, limit)),
+                (r"/bowlers/top", lambda limit=LEADERBOARD_ROWS: self._top("bowler", "bowler_wickets", 90, limit)),
+                (r"/players/compare", lambda players=(): self._compare("player", self.batting, players)),
+                (r"/bowlers/compare", lambda bowlers=(): self._compare("bowler", self.bowling, bowlers)),
+                (r"/teams/compare", lambda teams=(): self._compare("team", self.team, teams)),
+                (r"/teams/top-totals", lambda: self._team_top("total_runs", 240)),
+                (r"/teams/top-chases", lambda: self._team_top("target", 230)),
+                (r"/players/(?P<name>[^/]+)/stats", lambda name: self._with_against(self.batting(name), name)),
+                (r"/players/(?P<name>[^/]+)/growth", lambda name: self.growth(name)),
+                (r"/players/(?P<name>[^/]+)/vs-team/(?P<team>[^/]+)", lambda name, team: self.batting(f"{name}|{team}")),
+                (r"/players/(?P<batter>[^/]+)/vs-bowler/(?P<bowler>[^/]+)", lambda batter, bowler: self.matchup(batter, bowler)),
+                (r"/bowlers/(?P<name>[^/]+)/stats", lambda name: self._with_against(self.bowling(name), name)),
+                (r"/teams/(?P<team1>[^/]+)/vs/(?P<team2>[^/]+)", lambda team1, team2: self.head_to_head(team1, team2)),
+                (r"/teams/(?P<name>[^/]+)/stats", lambda name: self._with_against(self.team(name), name)),
+                (r"/teams/(?P<name>[^/]+)/all", lambda name: self.squad(name)),
+            )
+        ]
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random("|".join([str(self.seed), *map(str, key)]))
+
+    def _rows(self, base: int) -> int:
+        return max(1, round(base * self.scale))
+
+    def batting(self, name: str) -> dict:
+        rng = self._rng("bat", name)
+        innings = rng.randint(5, 90)
+        runs = rng.randint(innings * 8, innings * 40)
+        return {
+            "runs": runs,
+            "innings": innings,
+            "avg": round(runs / max(1, innings - rng.randint(0, innings // 4)), 2),
+            "strikeRate": round(rng.uniform(100, 170), 2),
+            "hundreds": rng.randint(0, 3),
+            "highestScore": f"{rng.randint(30, 130)}{rng.choice(['', '*'])}",
+            "fours": runs // rng.randint(8, 14),
+            "sixes": runs // rng.randint(20, 40),
+            "notOut": rng.randint(0, innings // 4),
+            "mom": rng.randint(0, 12),
+        }
+
+    def bowling(self, name: str) -> dict:
+        rng = self._rng("bowl", name)
+        innings = rng.randint(3, 80)
+        wickets = rng.randint(0, innings * 2)
+        return {
+            "innings": innings,
+            "wicket": wickets,
+            "economy": round(rng.uniform(6.0, 10.5), 2),
+            "average": round(rng.uniform(15, 45), 2),
+            "strikeRate": round(rng.uniform(12, 30), 2),
+            "best_figure": f"{rng.randint(1, 6)}/{rng.randint(8, 40)}",
+            "three_w": rng.randint(0, 6),
+            "fours": rng.randint(10, 300),
+            "sixes": rng.randint(5, 120),
+            "mom": rng.randint(0, 8),
+        }
+
+    def team(self, name: str) -> dict:
+        rng = self._rng("team", name)
+        played = rng.randint(60, 110)
+        won = rng.randint(played // 3, 2 * played // 3)
+        no_results = rng.randint(0, 4)
+        return {"match_played": played, "match_won": won, "no_results": no_results, "loss": played - won - no_results, "titles_won": rng.randint(0, 3)}
+
+    def growth(self, name: str) -> list[dict]:
+        rng = self._rng("growth", name)
+        seasons = [SEASONS[index % len(SEASONS)] + len(SEASONS) * (index // len(SEASONS)) for index in range(self._rows(len(SEASONS)))]
+        return [{"season": season, "batsman_runs": rng.randint(0, 550)} for season in seasons]
+
+    def matchup(self, batter: str, bowler: str) -> dict:
+        rng = self._rng("matchup", batter, bowler)
+        balls = rng.randint(6, 90)
+        runs = rng.randint(balls // 2, balls * 2)
+        outs = rng.randint(0, 4)
+        return {
+            "batting_view": {"runs": runs, "balls": balls, "strike_rate": round(100 * runs / balls, 2), "average": round(runs / outs, 2) if outs else None, "fours": runs // 10, "sixes": runs // 25, "outs": outs},
+            "bowling_view": {"runs_conceded": runs, "balls": balls, "wickets": outs, "economy": round(6 * runs / balls, 2), "strike_rate": round(balls / outs, 2) if outs else None},
+        }
+
+    def head_to_head(self, team1: str, team2: str) -> dict:
+        first, second = sorted((team1, team2))
+        rng = self._rng("h2h", first, second)
+        matches = rng.randint(8, 25)
+        wins_1 = rng.randint(0, matches)
+        wins_2 = matches - wins_1 - rng.randint(0, min(2, matches - wins_1))
+        # Same record whichever way round the pair is requested
+        if team1 != first:
+            wins_1, wins_2 = wins_2, wins_1
+        return {"team1": team1, "team2": team2, "matches": matches, "team1_wins": wins_1, "team2_wins": wins_2, "no_results": matches - wins_1 - wins_2}
+
+    def squad(self, name: str) -> dict:
+        rng = self._rng("squad", name)
+        size = min(len(self.players), self._rows(18))
+        members = rng.sample(self.players, size)
+        return {"team": name, "batters": members[: 2 * size // 3 or 1], "bowlers": members[size // 3 :]}
+
+    def _with_against(self, overall: dict, name: str) -> dict:
+        rng = self._rng("against", name)
+        opponents = [TEAM_NAMES[index % len(TEAM_NAMES)] + ("" if index < len(TEAM_NAMES) else f" {index // len(TEAM_NAMES)}") for index in range(self._rows(OPPONENT_ROWS))]
+        return {"overall": overall, "against": {team: {key: round(value * rng.uniform(0.05, 0.25), 2) if isinstance(value, (int, float)) else value for key, value in overall.items()} for team in opponents}}
+
+    def _compare(self, kind: str, build, names) -> dict:
+        plural = f"{kind}s"
+        names = list(names)
+        records = [{kind: name, **build(name)} for name in names]
+        payload = {plural: records}
+        if len(records) >= 2:
+            payload[f"{kind}_a"], payload[f"{kind}_b"] = records[0], records[1]
+        return payload
+
+    def _top(self, field: str, value_field: str, top: int, limit) -> list[dict]:
+        limit = self._rows(int(limit))
+        return [{field: name, value_field: max(0, top - 7 * rank)} for rank, name in enumerate(self.players[:limit])]
+
+    def _team_top(self, value_field: str, top: int) -> list[dict]:
+        return [{"batting_team": team, value_field: top - 3 * rank} for rank, team in enumerate(TEAM_NAMES * self._rows(1))]
+
+    def respond(self, path: str, query: dict, body: dict | None):
+        """
+        Payload for a request path, or None when no endpoint matches.
+
+        Query parameters and JSON body fields are passed to the handler by
+        name; unknown ones are ignored.
+        """
+        path = path.rstrip("/") or "/"
+        for pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            kwargs = {key: unquote(value) for key, value in match.groupdict().items()}
+            extra = {**{key: values[-1] for key, values in query.items()}, **(body or {})}
+            accepted = handler.__code__.co_varnames[: handler.__code__.co_argcount]
+            kwargs.update({key: value for key, value in extra.items() if key in accepted and key not in kwargs})
+            return handler(**kwargs)
+        return None
+
+
+class StubServer:
+    """
+    Threaded HTTP server for :class:`StubData`.
+
+    Args:
+        port: Port to bind on 127.0.0.1 (0 picks a free one)
+        latency_ms: Mean added delay per response
+        jitter_ms: Maximum deviation from ``latency_ms``
+        players: Roster size
+        payload_scale: Multiplier for list and breakdown rows
+        seed: Seed for the synthetic data and the jitter
+        msgpack: Serve MessagePack to clients that ask for it
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        players: int = 60,
+        payload_scale: float = 1.0,
+        seed: int = 0,
+        msgpack: bool = True,
+    ):
+        self.data = StubData(players, payload_scale, seed)
+        self.msgpack = msgpack
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+        self._formats: dict[str, int] = {}
+        self._bytes = 0
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + jitter)
+
+    def _record(self, path: str, size: int, wire_format: str):
+        template = endpoint_template(path)
+        with self._lock:
+            self._counts[template] = self._counts.get(template, 0) + 1
+            self._formats[wire_format] = self._formats.get(wire_format, 0) + 1
+            self._bytes += size
+
+    def counts(self) -> dict[str, int]:
+        """Requests served per endpoint template since the last reset."""
+        with self._lock:
+            return dict(self._counts)
+
+    def formats(self) -> dict[str, int]:
+        """Responses served per wire format since the last reset."""
+        with self._lock:
+            return dict(self._formats)
+
+    def bytes_served(self) -> int:
+        with self._lock:
+            return self._bytes
+
+    def reset_counts(self):
+        with self._lock:
+            self._counts = {}
+            self._formats = {}
+            self._bytes = 0
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length)) if length else None
+                except ValueError:
+                    body = None
+                payload = server.data.respond(parts.path, parse_qs(parts.query), body if isinstance(body, dict) else None)
+                time.sleep(server._delay())
+                codec = negotiate(self.headers.get("Accept")) if server.msgpack else JSON_CODEC
+                if payload is None:
+                    content, status, codec = b'{"detail":"Not Found"}', 404, JSON_CODEC
+                elif codec is JSON_CODEC:
+                    content, status = json.dumps(payload).encode("utf-8"), 200
+                else:
+                    content, status = codec.encode(payload), 200
+                server._record(parts.path, len(content), codec.name)
+                self.send_response(status)
+                self.send_header("Content-Type", codec.media_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = _respond  # noqa: N815
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="psl-stub-api", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser | argparse._ArgumentGroup):
+    """Stub server options shared by the benchmark CLIs."""
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean added delay per response")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="Maximum deviation from --latency-ms")
+    parser.add_argument("--players", type=int, default=60, help="Players and bowlers in the stub roster")
+    parser.add_argument("--payload-scale", type=float, default=1.0, help="Multiplier for list and breakdown rows")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic data and jitter")
+    parser.add_argument("--no-msgpack", dest="msgpack", action="store_false", help="Always serve JSON")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a local stub of the PSL stats API.")
+    parser.add_argument("--port", type=int, default=8765)
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = StubServer(args.port, args.latency_ms, args.jitter_ms, args.players, args.payload_scale, args.seed, args.msgpack).start()
+    print(f"Stub API on {server.url} (latency {args.latency_ms:g}±{args.jitter_ms:g} ms, {len(server.data.players)} players)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,61 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
 from urllib.parse import quote
 
 import requests
 import streamlit as st
 
-from .config import TEAM_FALLBACK, get_base_url
+from .cancellation import FetchCancelled, FetchToken, current_token
+from .codecs import Decoded, accept_header, read_response
+from .config import (
+    FETCH_ABANDONED,
+    FETCH_CONCURRENCY,
+    FETCH_DEADLINE,
+    FETCH_SESSION_REQUESTS,
+    FETCH_SESSIONS,
+    LOCAL_DATA_PATH,
+    LOCAL_INGEST_PATH,
+    LOCAL_TABLES_PATH,
+    TEAM_FALLBACK,
+    TRAFFIC_CAPTURE,
+    get_base_url,
+    is_local_source,
+)
+from .metrics import FETCH_METRICS, error_kind
+from .profiler import profiled
+from .traffic import TrafficRecorder
+
+# Per-thread record of the network fetch made by the current request, if any
+_request_state = threading.local()
+
+_TRAFFIC = TrafficRecorder(TRAFFIC_CAPTURE) if TRAFFIC_CAPTURE else None
+
+# Network requests made for a rerun run here, so the rerun can stop waiting
+# for a response once it is superseded. Shared by every session; each session
+# holds at most PSL_FETCH_SESSION_REQUESTS of its threads (FetchToken.slots),
+# so PSL_FETCH_SESSIONS sessions can fetch at once without queueing
+_NETWORK_POOL = ThreadPoolExecutor(
+    max_workers=max(1, FETCH_SESSION_REQUESTS) * max(1, FETCH_SESSIONS),
+    thread_name_prefix="psl-fetch",
+)
+_CANCEL_POLL_SECONDS = 0.05
+
+# Responses of abandoned requests, kept briefly for the next rerun ("warm")
+_WARM_MAX_ENTRIES = 128
+_WARM_TTL_SECONDS = 60.0
+
+# Reentrant: future callbacks can run immediately on the thread holding it
+_inflight_lock = threading.RLock()
+_inflight: dict[tuple, "_InFlight"] = {}
+_warm: OrderedDict[tuple, tuple[float, Decoded]] = OrderedDict()
+
+_REQUEST_HEADERS = {"Accept": accept_header()}
 
 
 def _encode(name: str) -> str:
@@ -21,26 +71,239 @@ def _cached_request(base_url: str, endpoint: str, method: str, params: dict | No
     return _make_request(base_url, endpoint, method, params, json_data)
 
 
+class _InFlight:
+    """A network request shared by every rerun waiting on the same key."""
+
+    __slots__ = ("future", "waiters", "abandoned")
+
+    def __init__(self, future: Future):
+        self.future = future
+        self.waiters = 0
+        self.abandoned = False
+
+
+def _send(url: str, method: str, params: dict | None, json_data: dict | None) -> Decoded:
+    # Read and decoded on the sending thread, so abandoned requests keep a usable result
+    response = requests.request(method, url, params=params, json=json_data, headers=_REQUEST_HEADERS, timeout=12, stream=True)
+    return read_response(response)
+
+
+def _keep_if_abandoned(key: tuple, request: _InFlight):
+    """Keep a finished, abandoned response for the next rerun (caller holds the lock)."""
+    future = request.future
+    if not request.abandoned or FETCH_ABANDONED != "warm" or not future.done() or future.cancelled() or future.exception() is not None:
+        return
+    _warm[key] = (time.monotonic(), future.result())
+    _warm.move_to_end(key)
+    while len(_warm) > _WARM_MAX_ENTRIES:
+        _warm.popitem(last=False)
+
+
+def _settle(key: tuple, request: _InFlight, _future: Future):
+    with _inflight_lock:
+        if _inflight.get(key) is request:
+            del _inflight[key]
+        _keep_if_abandoned(key, request)
+
+
+def _take_warm(key: tuple) -> Decoded | None:
+    with _inflight_lock:
+        entry = _warm.pop(key, None)
+    if entry is None or time.monotonic() - entry[0] > _WARM_TTL_SECONDS:
+        return None
+    return entry[1]
+
+
+def _join(token: FetchToken, key: tuple, url: str, method: str, params: dict | None, json_data: dict | None) -> _InFlight:
+    """
+    Join the identical request in flight, or send it once the session has a free slot.
+
+    Raises:
+        FetchCancelled: If the rerun is superseded while waiting for a slot
+    """
+    slots = token.slots
+    holding = False
+    while True:
+        with _inflight_lock:
+            request = _inflight.get(key)
+            if request is None and (slots is None or holding):
+                request = _InFlight(_NETWORK_POOL.submit(_send, url, method, params, json_data))
+                _inflight[key] = request
+                if slots is not None:
+                    request.future.add_done_callback(lambda _future: slots.release())
+                request.future.add_done_callback(partial(_settle, key, request))
+                holding = False
+            if request is not None:
+                if holding:
+                    # Another rerun sent it while this one waited for a slot
+                    slots.release()
+                request.waiters += 1
+                request.abandoned = False
+                return request
+        holding = slots.acquire(timeout=_CANCEL_POLL_SECONDS)
+        if token.cancelled():
+            if holding:
+                slots.release()
+            token.check()
+
+
+def _await_response(token: FetchToken, key: tuple, url: str, method: str, params: dict | None, json_data: dict | None) -> Decoded:
+    """
+    Send a request (or join the identical one in flight) and wait while the rerun is current.
+
+    Raises:
+        FetchCancelled: If the rerun is superseded before the response arrives
+    """
+    request = _join(token, key, url, method, params, json_data)
+    while True:
+        try:
+            return request.future.result(timeout=_CANCEL_POLL_SECONDS)
+        except FutureTimeout:
+            if not token.cancelled():
+                continue
+        with _inflight_lock:
+            request.waiters -= 1
+            if request.waiters == 0:
+                request.abandoned = True
+                if FETCH_ABANDONED != "warm":
+                    # Only stops requests still queued; sent ones finish unread
+                    request.future.cancel()
+                _keep_if_abandoned(key, request)
+        token.check()
+
+
 def _make_request(base_url: str, endpoint: str, method: str, params: dict | None, json_data: dict | None):
     url = f"{base_url}{endpoint if endpoint.startswith('/') else '/' + endpoint}"
-    response = requests.request(method, url, params=params, json=json_data, timeout=12)
+    token = current_token()
+    if token is None:
+        decoded = _send(url, method, params, json_data)
+    else:
+        token.check()
+        key = (url, method, repr(params), repr(json_data))
+        decoded = _take_warm(key)
+        if decoded is None:
+            decoded = _await_response(token, key, url, method, params, json_data)
+    # Only set when the request reached the network (not on a cache hit)
+    _request_state.fetched_bytes = decoded.size
+    response = decoded.response
     if response.status_code >= 400:
         raise requests.HTTPError(response.text or response.reason, response=response)
+    FETCH_METRICS.record_decode(endpoint, decoded.codec, decoded.seconds)
+    return decoded.payload
+
+
+def fetch_uncached(base_url: str, endpoint: str, params: dict | None = None, method: str = "GET", json_data: dict | None = None):
+    """
+    Send one request straight to the API, bypassing the data cache.
+
+    Needs no Streamlit session, so CLIs and worker processes can use it.
+
+    Returns:
+        Decoded response payload
+
+    Raises:
+        requests.RequestException: On connection errors and HTTP error statuses
+    """
+    return _make_request(base_url, endpoint, method.upper(), params, json_data)
+
+
+def _record(
+    endpoint: str,
+    method: str,
+    params: dict | None,
+    json_data: dict | None,
+    outcome: str,
+    seconds: float,
+    size: int | None = None,
+    error: str | None = None,
+):
+    """Record one logical request in the fetch metrics and, when enabled, the traffic trace."""
+    FETCH_METRICS.record(endpoint, method, outcome, seconds, size, error)
+    if _TRAFFIC is not None:
+        _TRAFFIC.record(endpoint, method, params, json_data, outcome, seconds, size, error)
+
+
+def _timed_request(base_url: str, endpoint: str, method: str, params: dict | None, json_data: dict | None, use_cache: bool):
+    """Run a request, through the data cache unless ``use_cache`` is False, and record its metrics."""
+    _request_state.fetched_bytes = None
+    started = time.perf_counter()
     try:
-        return response.json()
-    except ValueError:
-        return response.text
+        if use_cache:
+            result = _cached_request(base_url, endpoint, method, params, json_data)
+        else:
+            result = _make_request(base_url, endpoint, method, params, json_data)
+    except FetchCancelled:
+        _record(endpoint, method, params, json_data, "cancelled", time.perf_counter() - started)
+        raise
+    except Exception as exc:
+        _record(endpoint, method, params, json_data, "error", time.perf_counter() - started, _request_state.fetched_bytes, error_kind(exc))
+        raise
+    size = _request_state.fetched_bytes
+    if not use_cache:
+        outcome = "uncached"
+    elif size is None:
+        outcome = "hit"
+    else:
+        request_key = (base_url, endpoint, method, repr(params), repr(json_data))
+        outcome = "stale" if FETCH_METRICS.was_fetched(request_key) else "miss"
+    _record(endpoint, method, params, json_data, outcome, time.perf_counter() - started, size)
+    return result
 
 
-def fetch_api(
+def notify_cancelled(exc: FetchCancelled, suppress_warning: bool = False):
+    """
+    Tell the user when a fetch was cut off by the rerun's deadline.
+
+    A rerun superseded by a pending rerun or stop is replaced before its
+    output is seen, so nothing is shown for it.
+    """
+    if exc.timed_out and not suppress_warning:
+        st.warning(f"Stopped waiting for the API after {FETCH_DEADLINE:g}s (PSL_FETCH_DEADLINE); some data is missing.")
+
+
+def fetch_timed(
+    base_url: str,
     endpoint: str,
     method: str = "GET",
     params: dict | None = None,
     json_data: dict | None = None,
     use_cache: bool = True,
+):
+    """
+    Send one request as the dashboard does, recording it in the fetch metrics.
+
+    The request goes through the data cache unless ``use_cache`` is False,
+    and is written to the traffic trace when capture is on. Unlike
+    :func:`fetch_api`, failures are raised rather than shown.
+
+    Returns:
+        Decoded response payload
+
+    Raises:
+        requests.RequestException: On connection errors and HTTP error statuses
+    """
+    return _timed_request(base_url, endpoint, method.upper(), params, json_data, use_cache)
+
+
+@profiled("fetch", lambda endpoint, *args, **kwargs: endpoint)
+def fetch_api(
+    endpoint: str,
+    method: str = "GET",
+    params: dict | None = None,
+    json_data: dict | None = None,
+    use_cache: bool | None = None,
     suppress_warning: bool = False,
 ):
-    """Fetch data from API with error handling."""
+    """
+    Fetch data from API with error handling.
+
+    GET responses are cached unless ``use_cache`` is False. POST requests
+    are not cached unless ``use_cache`` is True; pass it only for POST
+    endpoints known to be read-only queries.
+    """
+    if is_local_source():
+        return _fetch_local(endpoint, method, params, json_data, suppress_warning)
+
     base_url = get_base_url()
     if not base_url:
         if not suppress_warning:
@@ -48,10 +311,12 @@ def fetch_api(
         return None
 
     method = method.upper()
+    if use_cache is None:
+        use_cache = method == "GET"
     try:
-        if method == "GET" and use_cache:
-            return _cached_request(base_url, endpoint, method, params, json_data)
-        return _make_request(base_url, endpoint, method, params, json_data)
+        return _timed_request(base_url, endpoint, method, params, json_data, use_cache)
+    except FetchCancelled as exc:
+        notify_cancelled(exc, suppress_warning)
     except requests.HTTPError as http_err:
         status = http_err.response.status_code if http_err.response else ""
         message = http_err.response.text if http_err.response else str(http_err)
@@ -73,6 +338,90 @@ def fetch_api(
     return None
 
 
+@profiled("fetch", lambda endpoints, *args, **kwargs: f"fetch_many ({len(endpoints)} endpoints)")
+def fetch_many(endpoints: list[str], max_workers: int = FETCH_CONCURRENCY) -> dict[str, object]:
+    """
+    Fetch several GET endpoints concurrently through the request cache.
+
+    Cached endpoints return immediately; the rest run on a bounded thread
+    pool. No warnings are rendered for failures.
+
+    Args:
+        endpoints: Endpoint paths (duplicates are fetched once)
+        max_workers: Maximum concurrent requests
+
+    Returns:
+        Mapping of endpoint to payload (None when the request failed)
+
+    Raises:
+        FetchCancelled: If the rerun is superseded or passes its deadline
+            (see :func:`notify_cancelled`)
+    """
+    unique = list(dict.fromkeys(endpoints))
+    if is_local_source():
+        return {endpoint: fetch_api(endpoint, suppress_warning=True) for endpoint in unique}
+    base_url = get_base_url()
+    if not base_url or not unique:
+        return dict.fromkeys(unique)
+
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+
+    def fetch(endpoint: str):
+        try:
+            return _timed_request(base_url, endpoint, "GET", None, None, True)
+        except FetchCancelled:
+            raise
+        except requests.RequestException:
+            return None
+
+    # Workers share the session's script context so the data cache works in them
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(unique))),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+    ) as pool:
+        return dict(zip(unique, pool.map(fetch, unique)))
+
+
+def _fetch_local(
+    endpoint: str,
+    method: str,
+    params: dict | None,
+    json_data: dict | None,
+    suppress_warning: bool,
+):
+    """Answer a request from the local analytics engine (PSL_DATA_SOURCE=local)."""
+    from .engine import BadRequestError, EndpointNotSupported, get_live_store, handle_request
+
+    started = time.perf_counter()
+    outcome, error = "error", "exception"
+    try:
+        store = get_live_store(LOCAL_DATA_PATH, LOCAL_TABLES_PATH, LOCAL_INGEST_PATH).current()
+        result = handle_request(store, endpoint, method, params, json_data)
+        outcome, error = "local", None
+        return result
+    except EndpointNotSupported as exc:
+        error = "unsupported"
+        if not suppress_warning:
+            st.warning(str(exc))
+    except LookupError:
+        error = "not_found"
+        if not suppress_warning:
+            st.warning("Requested item not found. Check the name or try suggestions.")
+    except BadRequestError as exc:
+        error = "bad_request"
+        if not suppress_warning:
+            st.error(f"Request failed (400): {exc}")
+    except (OSError, ValueError) as exc:
+        error = "unavailable"
+        if not suppress_warning:
+            st.error(f"Local data source unavailable: {exc}")
+    finally:
+        _record(endpoint, method.upper(), params, json_data, outcome, time.perf_counter() - started, error=error)
+    return None
+
+
 def list_players() -> list[str]:
     data = fetch_api("/players")
     return sorted(data) if isinstance(data, list) else []
@@ -84,10 +433,34 @@ def list_bowlers() -> list[str]:
 
 
 def list_teams() -> list[str]:
+    if is_local_source():
+        data = fetch_api("/teams", suppress_warning=True)
+        return data if isinstance(data, list) and data else TEAM_FALLBACK
     # Backend does not expose /teams list; rely on fallback to avoid repeated 404s.
     return TEAM_FALLBACK
 
 
+def fetch_percentiles(entity_endpoint: str, season: int | None = None, min_innings: int = 0) -> dict | None:
+    """
+    League percentiles for a player or bowler (local data source only).
+
+    Args:
+        entity_endpoint: ``player_endpoint(name)`` or ``bowler_endpoint(name)``
+        season: Season to rank within (career if None)
+        min_innings: Innings needed to be part of the population
+
+    Returns:
+        Percentile payload, or None when unavailable
+    """
+    if not is_local_source():
+        return None
+    params = {"min_innings": min_innings}
+    if season is not None:
+        params["season"] = season
+    data = fetch_api(f"{entity_endpoint}/percentiles", params=params, suppress_warning=True)
+    return data if isinstance(data, dict) else None
+
+
 def player_endpoint(path: str) -> str:
     return f"/players/{_encode(path)}"
 
@@ -0,0 +1,169 @@
+"""
+PSL Analytics Hub - Fetch Cancellation
+======================================
+Per-rerun cancellation tokens for API fetches.
+
+When a widget changes mid-run, Streamlit asks the running script to stop at
+its next interrupt point. A script blocked in a ``requests`` call does not
+reach one until the call returns, and its queued ``fetch_many`` requests
+would still be sent.
+
+:func:`begin_fetch_scope` attaches a fresh :class:`FetchToken` to the
+session's script context at the start of each rerun. ``fetch_many`` worker
+threads share that context. The token becomes cancelled, and stays
+cancelled, once either:
+
+- Streamlit has a rerun or stop request pending for the session, or
+- the rerun's fetch deadline (``PSL_FETCH_DEADLINE``) has passed.
+
+Fetches check the token before they start and while they wait on the
+network. Abandoned fetches raise :class:`FetchCancelled`, also out of
+``fetch_many``, so the script reaches Streamlit's interrupt point straight
+away. A superseded rerun's output is replaced, so callers stay silent; when
+the deadline passed (``FetchCancelled.timed_out``) the output is what the
+user sees, so they say the data timed out.
+
+Streamlit has no public way to ask whether a rerun is pending, so the token
+reads ``ScriptRequests._state`` under the object's own lock. If a Streamlit
+release drops either private attribute, tokens fall back to the deadline
+alone (a warning is logged once) rather than guessing.
+
+Tokens of one session also share that session's :attr:`FetchToken.slots`,
+which bound its network requests in flight (``PSL_FETCH_SESSION_REQUESTS``).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+
+import requests
+
+from .config import FETCH_CANCELLATION, FETCH_DEADLINE, FETCH_SESSION_REQUESTS
+
+_TOKEN_ATTR = "psl_fetch_token"
+
+_LOGGER = logging.getLogger(__name__)
+
+# Private ScriptRequests attributes read by pending_request (Streamlit 1.x)
+_REQUEST_ATTRS = ("_lock", "_state")
+_warned_unsupported = False
+
+# In-flight request slots per session; an entry lives as long as a token uses it
+_slots_lock = threading.Lock()
+_session_slots: weakref.WeakValueDictionary[str, threading.BoundedSemaphore] = weakref.WeakValueDictionary()
+
+
+class FetchCancelled(requests.RequestException):
+    """The rerun that started this fetch was superseded or ran out of time."""
+
+    def __init__(self, *args, timed_out: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        # True when the rerun's deadline passed; its output is still shown
+        self.timed_out = timed_out
+
+
+class FetchToken:
+    """Cancellation state of one script run's fetches."""
+
+    __slots__ = ("_script_requests", "deadline", "slots", "_cancelled", "timed_out")
+
+    def __init__(self, script_requests=None, deadline: float | None = None, slots: threading.BoundedSemaphore | None = None):
+        self._script_requests = script_requests
+        self.deadline = deadline
+        # Shared by the session's tokens; each network request holds one slot
+        self.slots = slots
+        self._cancelled = False
+        # Cancelled by the deadline rather than by a pending rerun or stop
+        self.timed_out = False
+
+    def cancelled(self) -> bool:
+        if self._cancelled:
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self._cancelled = self.timed_out = True
+        elif self._script_requests is not None:
+            self._cancelled = pending_request(self._script_requests) != "CONTINUE"
+        return self._cancelled
+
+    def check(self):
+        """
+        Raise if the run's fetches should be abandoned.
+
+        Raises:
+            FetchCancelled: If the token is cancelled
+        """
+        if not self.cancelled():
+            return
+        if self.timed_out:
+            raise FetchCancelled("Fetch abandoned: the rerun passed its deadline", timed_out=True)
+        raise FetchCancelled("Fetch abandoned: the rerun was superseded")
+
+
+def supports_pending_request(script_requests) -> bool:
+    """Whether this Streamlit's ScriptRequests exposes the state :func:`pending_request` reads."""
+    global _warned_unsupported
+    if all(hasattr(script_requests, attr) for attr in _REQUEST_ATTRS):
+        return True
+    if not _warned_unsupported:
+        _warned_unsupported = True
+        _LOGGER.warning("This Streamlit version hides its pending rerun state; fetches are cancelled by deadline only")
+    return False
+
+
+def pending_request(script_requests) -> str:
+    """
+    Streamlit's pending request for a session, read under its lock.
+
+    Args:
+        script_requests: The session's ``ScriptRequests``; check it with
+            :func:`supports_pending_request` first
+
+    Returns:
+        ``"CONTINUE"``, ``"RERUN"`` or ``"STOP"``
+    """
+    with script_requests._lock:
+        state = script_requests._state
+    return getattr(state, "value", state)
+
+
+def session_slots(session_id: str) -> threading.BoundedSemaphore:
+    """The in-flight request slots shared by one session's reruns."""
+    with _slots_lock:
+        slots = _session_slots.get(session_id)
+        if slots is None:
+            slots = threading.BoundedSemaphore(max(1, FETCH_SESSION_REQUESTS))
+            _session_slots[session_id] = slots
+        return slots
+
+
+def _script_ctx():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    return get_script_run_ctx(suppress_warning=True)
+
+
+def begin_fetch_scope() -> FetchToken | None:
+    """Give this rerun's fetches a fresh token (call once at the start of each rerun)."""
+    if not FETCH_CANCELLATION and not FETCH_DEADLINE:
+        return None
+    ctx = _script_ctx()
+    if ctx is None:
+        return None
+    script_requests = ctx.script_requests if FETCH_CANCELLATION else None
+    if script_requests is not None and not supports_pending_request(script_requests):
+        script_requests = None
+    token = FetchToken(
+        script_requests,
+        time.monotonic() + FETCH_DEADLINE if FETCH_DEADLINE else None,
+        session_slots(ctx.session_id),
+    )
+    setattr(ctx, _TOKEN_ATTR, token)
+    return token
+
+
+def current_token() -> FetchToken | None:
+    """Token of the rerun this thread works for (None outside a rerun)."""
+    ctx = _script_ctx()
+    return getattr(ctx, _TOKEN_ATTR, None) if ctx is not None else None
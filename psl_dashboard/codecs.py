@@ -0,0 +1,213 @@
+"""
+PSL Analytics Hub - Wire Codecs
+===============================
+Response decoding for ``_make_request``.
+
+- JSON is decoded straight from the response bytes with the fastest
+  installed decoder (orjson, then msgspec, then the standard library). This
+  skips requests' charset detection and the bytes-to-str copy of
+  ``response.json()``.
+- With ``PSL_WIRE_FORMAT=msgpack`` and msgpack or msgspec installed,
+  requests send ``Accept: application/msgpack, application/json;q=0.9``.
+  Servers that ignore the header keep answering JSON. MessagePack bodies are
+  smaller, but msgpack decodes slower than orjson, so JSON stays the default
+  (compare both with ``python -m benchmarks.run``).
+- Bodies larger than ``PSL_STREAM_DECODE_KB`` are streamed from the socket
+  into one preallocated buffer and decoded in place, instead of being
+  collected as chunks and joined.
+- A body that is not valid JSON is returned as text, as before.
+
+Each decode is timed, and the fetch metrics record decode time per endpoint
+template and wire format.
+
+Further formats can be added with :func:`register_codec`.
+"""
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import NamedTuple
+
+import requests
+
+from .config import STREAM_DECODE_KB, WIRE_FORMAT
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Read size for bodies that cannot be read into a preallocated buffer
+STREAM_CHUNK_SIZE = 64 * 1024
+
+STREAM_DECODE_BYTES = int(STREAM_DECODE_KB * 1024)
+
+
+class Codec(NamedTuple):
+    """Encoder and decoder for one media type."""
+
+    name: str
+    media_type: str
+    library: str
+    encode: Callable[[object], bytes]
+    decode: Callable[[bytes | bytearray], object]
+
+
+class Decoded(NamedTuple):
+    """A response read to the end."""
+
+    response: requests.Response
+    payload: object
+    size: int
+    # Codec name, "text" for the text fallback, None for error responses
+    codec: str | None
+    seconds: float
+
+
+CODECS: dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec, *aliases: str):
+    """Decode responses of ``codec.media_type`` (and ``aliases``) with ``codec``."""
+    for media_type in (codec.media_type, *aliases):
+        CODECS[media_type] = codec
+
+
+def _with_fallback(decode: Callable, errors: tuple[type[BaseException], ...]) -> Callable:
+    def decode_json(body):
+        try:
+            return decode(body)
+        except errors:
+            # NaN, Infinity and integers beyond 64 bits only parse with the standard library
+            return json.loads(body)
+
+    return decode_json
+
+
+def _json_codec() -> Codec:
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        encode = partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+        return Codec("json", JSON_MEDIA_TYPE, "orjson", encode, _with_fallback(orjson.loads, (orjson.JSONDecodeError,)))
+    try:
+        import msgspec
+    except ImportError:
+        pass
+    else:
+        return Codec("json", JSON_MEDIA_TYPE, "msgspec", msgspec.json.encode, _with_fallback(msgspec.json.decode, (msgspec.DecodeError,)))
+    return Codec("json", JSON_MEDIA_TYPE, "json", lambda payload: json.dumps(payload).encode("utf-8"), json.loads)
+
+
+def _msgpack_codec() -> Codec | None:
+    try:
+        import msgpack
+    except ImportError:
+        pass
+    else:
+        encode = partial(msgpack.packb, use_bin_type=True)
+        decode = partial(msgpack.unpackb, raw=False, strict_map_key=False)
+        return Codec("msgpack", MSGPACK_MEDIA_TYPE, "msgpack", encode, decode)
+    try:
+        import msgspec
+    except ImportError:
+        return None
+    return Codec("msgpack", MSGPACK_MEDIA_TYPE, "msgspec", msgspec.msgpack.encode, msgspec.msgpack.decode)
+
+
+JSON_CODEC = _json_codec()
+register_codec(JSON_CODEC)
+_msgpack = _msgpack_codec()
+if _msgpack is not None:
+    register_codec(_msgpack, "application/x-msgpack")
+
+
+def codec_for(content_type: str | None) -> Codec | None:
+    """Codec registered for a ``Content-Type`` header (``+json`` types decode as JSON)."""
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    codec = CODECS.get(media_type)
+    if codec is None and media_type.endswith("+json"):
+        codec = JSON_CODEC
+    return codec
+
+
+def accept_header(wire_format: str = WIRE_FORMAT) -> str:
+    """``Accept`` header for API requests."""
+    if wire_format == "msgpack" and MSGPACK_MEDIA_TYPE in CODECS:
+        return f"{MSGPACK_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.9"
+    return JSON_MEDIA_TYPE
+
+
+def negotiate(accept: str | None) -> Codec:
+    """Preferred registered codec for an ``Accept`` header (JSON when nothing matches)."""
+    best, best_q = JSON_CODEC, 0.0
+    for item in (accept or "").split(","):
+        media_type, _, parameters = item.strip().partition(";")
+        codec = CODECS.get(media_type.strip().lower())
+        if codec is None:
+            continue
+        q = 1.0
+        for parameter in parameters.split(";"):
+            key, _, value = parameter.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        # Earlier entries win ties
+        if q > best_q:
+            best, best_q = codec, q
+    return best
+
+
+def _read_body(response: requests.Response) -> bytes | bytearray:
+    """Read a streamed body, straight into one buffer when its length is known."""
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and not response.headers.get("Content-Encoding"):
+        buffer = bytearray(int(length))
+        received = 0
+        with memoryview(buffer) as view:
+            while received < len(buffer):
+                count = response.raw.readinto(view[received:])
+                if not count:
+                    break
+                received += count
+        if received < len(buffer):
+            del buffer[received:]
+        return buffer
+    buffer = bytearray()
+    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+        buffer += chunk
+    return buffer
+
+
+def read_response(response: requests.Response, stream_threshold: int = STREAM_DECODE_BYTES) -> Decoded:
+    """
+    Read a response sent with ``stream=True`` to the end, decode it and close it.
+
+    Error responses (status >= 400) are read but not decoded, so their text
+    stays available for error messages.
+
+    Raises:
+        requests.exceptions.ContentDecodingError: If a binary body is malformed
+    """
+    with response:
+        if response.status_code >= 400:
+            return Decoded(response, None, len(response.content), None, 0.0)
+        length = response.headers.get("Content-Length", "")
+        body = response.content if length.isdigit() and int(length) <= stream_threshold else _read_body(response)
+        codec = codec_for(response.headers.get("Content-Type")) or JSON_CODEC
+        started = time.perf_counter()
+        if codec.name == "json":
+            try:
+                payload, name = codec.decode(body), codec.name
+            except ValueError:
+                payload, name = bytes(body).decode(response.encoding or "utf-8", errors="replace"), "text"
+        else:
+            try:
+                payload, name = codec.decode(body), codec.name
+            except Exception as exc:
+                raise requests.exceptions.ContentDecodingError(f"Malformed {codec.name} response: {exc or type(exc).__name__}", response=response) from exc
+        return Decoded(response, payload, len(body), name, time.perf_counter() - started)
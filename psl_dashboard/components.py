@@ -5,18 +5,152 @@ This module provides backward compatibility by exporting functions
 under both old and new names.
 """
 
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import streamlit as st
 
-from .config import get_base_url, get_team_logo, get_team_color
+from .config import (
+    PERCENTILE_MIN_INNINGS,
+    PERCENTILE_SEASON_MIN_INNINGS,
+    TABLE_PAGE_SIZE,
+    TEAM_COLORS,
+    get_base_url,
+    get_team_color,
+    get_team_logo,
+    is_local_source,
+)
+from .profiler import profiled
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _ordinal(number: int) -> str:
+    suffix = "th" if 11 <= number % 100 <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+    return f"{number}{suffix}"
 
 
-def render_metric_card(label: str, value, help_text: str | None = None):
-    """Render a metric card with proper formatting."""
+@profiled("component")
+def render_metric_card(label: str, value, help_text: str | None = None, percentile: float | None = None):
+    """Render a metric card with proper formatting and an optional league percentile."""
     display_value = "N/A" if value in (None, "", []) else value
     st.metric(label, display_value, help=help_text)
+    if percentile is not None:
+        st.caption(f"{_ordinal(int(round(percentile)))} percentile")
+
+
+@profiled("component")
+def render_metric_grid(metrics: list[tuple[str, object]], percentiles: list | None = None, per_row: int = 5):
+    """Render (label, value) metric cards in rows, with aligned percentiles if given."""
+    percentiles = percentiles or [None] * len(metrics)
+    for chunk_start in range(0, len(metrics), per_row):
+        cols = st.columns(per_row)
+        chunk = zip(metrics[chunk_start : chunk_start + per_row], percentiles[chunk_start : chunk_start + per_row])
+        for col, ((label, value), percentile) in zip(cols, chunk):
+            with col:
+                render_metric_card(label, value, percentile=percentile)
+
+
+@profiled("component")
+def render_percentile_scope(key: str, seasons: list[int], career_min_innings: int, season_min_innings: int) -> tuple[int | None, int]:
+    """
+    Render percentile scope controls.
+
+    Returns:
+        Tuple of (season or None for career, minimum innings)
+    """
+    cols = st.columns([2, 1])
+    with cols[0]:
+        scope = st.selectbox("Percentile scope", ["Career", *seasons], key=f"{key}_scope")
+    season = None if scope == "Career" else int(scope)
+    with cols[1]:
+        min_innings = st.number_input(
+            "Min innings",
+            min_value=0,
+            value=career_min_innings if season is None else season_min_innings,
+            step=1,
+            key=f"{key}_min_innings_{scope}",
+        )
+    return season, int(min_innings)
+
+
+@profiled("component")
+def render_ranked_metrics(kind: str, name: str, overall: dict, entity_endpoint: str):
+    """
+    Render a player's or bowler's metric cards with league percentiles when
+    the local engine is available.
+
+    With a season as the percentile scope the cards show that season's
+    stats, so each value sits next to its own percentile.
+    """
+    from .api import fetch_api, fetch_percentiles
+    from .view_models import entity_metrics, metric_percentiles
+
+    stats, percentiles = overall, None
+    if is_local_source():
+        season, min_innings = render_percentile_scope(
+            f"{kind}_pct", fetch_api("/seasons") or [], PERCENTILE_MIN_INNINGS, PERCENTILE_SEASON_MIN_INNINGS
+        )
+        payload = fetch_percentiles(entity_endpoint, season, min_innings)
+        if payload:
+            percentiles = metric_percentiles(kind, payload)
+            if season is not None:
+                stats = payload["stats"]
+            scope = "Career" if season is None else f"{season} season"
+            note = "" if payload["qualified"] else f"; {name} does not qualify"
+            st.caption(f"{scope} stats; percentiles vs {payload['population']} players with {min_innings}+ innings{note}")
+        elif season is None:
+            st.caption(f"No percentiles for {name}.")
+        else:
+            st.caption(f"No {season} innings for {name}; showing career stats.")
+    render_metric_grid(entity_metrics(kind, stats), percentiles)
+
+
+@profiled("component")
+def render_similar(kind: str, name: str, entity_endpoint: str):
+    """Render the nearest-neighbour "players like X" panel (local data source only)."""
+    if not is_local_source():
+        return
+    from .api import fetch_api
+    from .frames import to_frame
+
+    data = fetch_api(f"{entity_endpoint}/similar", params={"limit": 5}, suppress_warning=True)
+    st.markdown(f"#### {kind.title()}s like {name}")
+    if not data:
+        st.info("Not enough innings to find similar players.")
+        return
+    df = to_frame(data).rename(columns=lambda column: column.replace("_", " ").title())
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.caption("Nearest neighbours by standardized career rates; lower distance is more similar.")
 
 
+def render_fetch_metrics():
+    """Per-endpoint request counts, cache hit rate, latency and errors for this process."""
+    from .metrics import FETCH_METRICS
+
+    rows = FETCH_METRICS.summary()
+    if not rows:
+        st.caption("No requests yet.")
+        return
+    total = sum(row["requests"] for row in rows)
+    hits = sum(row["hit"] for row in rows)
+    cacheable = hits + sum(row["miss"] + row["stale"] for row in rows)
+    hit_rate = f"{100 * hits / cacheable:.0f}%" if cacheable else "n/a"
+    st.caption(f"{total} requests · cache hit rate {hit_rate} · {sum(row['errors'] for row in rows)} errors")
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+    st.download_button(
+        "Prometheus metrics",
+        data=FETCH_METRICS.to_prometheus(),
+        file_name="psl_fetch_metrics.prom",
+        mime="text/plain",
+        on_click="ignore",
+        key="fetch_metrics_download",
+    )
+
+
+@profiled("component")
 def render_team_header(team_name: str, subtitle: str | None = None):
     """Render a team header with logo and name."""
     col1, col2 = st.columns([1, 4])
@@ -34,6 +168,7 @@ def render_team_header(team_name: str, subtitle: str | None = None):
             st.caption(subtitle)
 
 
+@profiled("component")
 def render_team_card(team_name: str, stats: dict | None = None):
     """Render a team card with logo and basic stats."""
     logo_path = get_team_logo(team_name)
@@ -54,6 +189,7 @@ def render_team_card(team_name: str, stats: dict | None = None):
                     st.caption(f"{key}: {value}")
 
 
+@profiled("component")
 def render_endpoint_copy(label: str, endpoint: str):
     """Render a copyable API endpoint URL."""
     base_url = get_base_url()
@@ -66,6 +202,7 @@ def render_endpoint_copy(label: str, endpoint: str):
     st.code(full_url, language="text")
 
 
+@profiled("component")
 def render_comparison_chart(
     title: str,
     labels: list[str],
@@ -77,50 +214,64 @@ def render_comparison_chart(
     color_b: str | None = None,
 ):
     """Render a grouped bar chart for comparing two entities."""
-    import plotly.graph_objects as go
-    
-    # Use team colors if available
-    marker_a = {"color": color_a} if color_a else {}
-    marker_b = {"color": color_b} if color_b else {}
+    from .view_models import comparison_figure
     
-    fig = go.Figure()
-    fig.add_trace(go.Bar(name=name_a, x=labels, y=values_a, marker=marker_a))
-    fig.add_trace(go.Bar(name=name_b, x=labels, y=values_b, marker=marker_b))
-    
-    fig.update_layout(
-        barmode="group",
-        height=400,
-        title=title,
-        template="plotly_white",
-        showlegend=True,
+    fig = comparison_figure(
+        title, tuple(labels), tuple(values_a), tuple(values_b), name_a, name_b, color_a, color_b
     )
-    
     st.plotly_chart(fig, use_container_width=True)
 
 
-def render_table(data, index_label: str = "item", use_team_colors: bool = False):
-    """Display a dataframe safely by coercing mixed types to strings if needed."""
-    normalized = data
+def _team_row_styles(df: pd.DataFrame) -> pd.DataFrame:
+    """Build the full style matrix in one pass, tinting each row by its team."""
+    import numpy as np
+    import pandas as pd
+    
+    colors = df["team"].map(TEAM_COLORS).astype(object).fillna(get_team_color(""))
+    css = ("background-color: " + colors + "22").to_numpy()  # 22 = 13% opacity
+    return pd.DataFrame(np.repeat(css[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
+
+
+@profiled("component")
+def render_table(
+    data,
+    index_label: str = "item",
+    use_team_colors: bool = False,
+    *,
+    key: str,
+    page_size: int = TABLE_PAGE_SIZE,
+):
+    """
+    Display a payload as a typed dataframe built through the frame cache.
+
+    Tables longer than ``page_size`` get filter, sort and page controls; only
+    the visible page is styled and sent to the browser. ``key`` prefixes the
+    control widgets and must be unique among the tables on a page.
+    """
+    from .frames import filter_frame, page_frame, sort_frame, to_frame
     
-    if isinstance(data, dict):
-        # dict of dicts
-        if all(isinstance(v, dict) for v in data.values()):
-            normalized = [{index_label: k, **v} for k, v in data.items()]
-        else:  # dict of scalars
-            normalized = [{index_label: k, "value": v} for k, v in data.items()]
+    df = to_frame(data, index_label)
     
-    df = pd.DataFrame(normalized)
+    if len(df) > page_size:
+        controls = st.columns([3, 2, 1, 1])
+        with controls[0]:
+            query = st.text_input("Filter", key=f"{key}_filter", placeholder="Search rows...")
+        with controls[1]:
+            sort_by = st.selectbox("Sort by", ["—", *df.columns], key=f"{key}_sort")
+        with controls[2]:
+            ascending = st.checkbox("Ascending", value=True, key=f"{key}_asc")
+        
+        view = sort_frame(filter_frame(df, query), sort_by, ascending)
+        page_count = max(1, -(-len(view) // page_size))
+        with controls[3]:
+            page = st.selectbox("Page", range(1, page_count + 1), key=f"{key}_page")
+        df = page_frame(view, page, page_size)
+        st.caption(f"Showing {len(df)} of {len(view)} rows (page {page}/{page_count})")
     
     try:
         # Apply styling if team colors requested
         if use_team_colors and "team" in df.columns:
-            def highlight_team(row):
-                team_name = row.get("team", "")
-                color = get_team_color(team_name)
-                return [f"background-color: {color}22" for _ in row]  # 22 = 13% opacity
-            
-            styled_df = df.style.apply(highlight_team, axis=1)
-            st.dataframe(styled_df, use_container_width=True)
+            st.dataframe(df.style.apply(_team_row_styles, axis=None), use_container_width=True)
         else:
             st.dataframe(df, use_container_width=True)
     except Exception:
@@ -128,6 +279,7 @@ def render_table(data, index_label: str = "item", use_team_colors: bool = False)
         st.dataframe(df.astype(str), use_container_width=True)
 
 
+@profiled("component")
 def render_stat_comparison(stat_name: str, value_a, value_b, name_a: str, name_b: str):
     """Render a side-by-side stat comparison."""
     col1, col2, col3 = st.columns([2, 2, 2])
@@ -147,6 +299,7 @@ def render_stat_comparison(stat_name: str, value_a, value_b, name_a: str, name_b
         st.metric(f"{name_b} - {stat_name}", value_b)
 
 
+@profiled("component")
 def render_player_image(player_name: str, width: int = 150):
     """Render player image if available."""
     try:
@@ -12,6 +12,65 @@ import streamlit as st
 # API Configuration
 API_BASE_URL = os.getenv("PSL_API_BASE", "https://psl-stats-api.vercel.app")
 
+# Maximum concurrent API requests when fetching many endpoints at once
+FETCH_CONCURRENCY = int(os.getenv("PSL_FETCH_CONCURRENCY", "8"))
+
+# Seconds a session remembers a failed head-to-head pair before the matrix requests it again
+H2H_RETRY_SECONDS = float(os.getenv("PSL_H2H_RETRY_SECONDS", "60"))
+
+# Seconds a session skips a compare endpoint that failed (e.g. an API without
+# it) and fetches per-entity stats straight away
+COMPARE_RETRY_SECONDS = float(os.getenv("PSL_COMPARE_RETRY_SECONDS", "300"))
+
+# Fetch cancellation: abandon a rerun's fetches once Streamlit has a newer
+# rerun pending (PSL_FETCH_CANCEL=0 disables) or PSL_FETCH_DEADLINE seconds
+# into the rerun (0 = no deadline). Abandoned network requests either warm
+# the cache for the next rerun ("warm") or are discarded ("drop").
+FETCH_CANCELLATION = os.getenv("PSL_FETCH_CANCEL", "1").strip().lower() not in ("0", "false", "no", "off")
+FETCH_DEADLINE = float(os.getenv("PSL_FETCH_DEADLINE", "0"))
+FETCH_ABANDONED = os.getenv("PSL_FETCH_ABANDONED", "warm").strip().lower()
+
+# Network requests one session may have in flight on the shared fetch pool,
+# so one busy session cannot hold every thread while others queue behind it
+FETCH_SESSION_REQUESTS = int(os.getenv("PSL_FETCH_SESSION_REQUESTS", str(FETCH_CONCURRENCY)))
+
+# Sessions expected to fetch at the same time. The shared pool has
+# PSL_FETCH_SESSION_REQUESTS threads for each, so up to this many sessions
+# never wait on each other; more sessions share the threads in turn
+FETCH_SESSIONS = int(os.getenv("PSL_FETCH_SESSIONS", "4"))
+
+# Response wire format: "json", or "msgpack" to ask for MessagePack when
+# msgpack or msgspec is installed (JSON fallback). Bodies above
+# PSL_STREAM_DECODE_KB are streamed into one buffer before decoding.
+WIRE_FORMAT = os.getenv("PSL_WIRE_FORMAT", "json").strip().lower()
+STREAM_DECODE_KB = float(os.getenv("PSL_STREAM_DECODE_KB", "256"))
+
+# Fetch metrics export (Prometheus text format): serve /metrics on this
+# localhost port (0 disables) and/or rewrite this file periodically
+METRICS_PORT = int(os.getenv("PSL_METRICS_PORT", "0"))
+METRICS_FILE = os.getenv("PSL_METRICS_FILE", "")
+METRICS_FILE_INTERVAL = float(os.getenv("PSL_METRICS_FILE_INTERVAL", "15"))
+
+# Traffic capture: append every fetch_api request to this JSONL trace for
+# replay with python -m benchmarks.replay (empty disables)
+TRAFFIC_CAPTURE = os.getenv("PSL_TRAFFIC_CAPTURE", "")
+
+# Render profiler: time tabs, fetches and components per rerun (PSL_PROFILE=1)
+# and keep this many reruns per session for download
+PROFILE_RENDERS = os.getenv("PSL_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+PROFILE_HISTORY = int(os.getenv("PSL_PROFILE_HISTORY", "20"))
+
+# Memory diagnostics (PSL_MEMORY=1): tracemalloc sampling interval, RSS
+# high-water alert threshold (0 disables), traceback depth and sites listed
+MEMORY_DIAGNOSTICS = os.getenv("PSL_MEMORY", "").strip().lower() in ("1", "true", "yes", "on")
+MEMORY_SNAPSHOT_SECONDS = float(os.getenv("PSL_MEMORY_SNAPSHOT_SECONDS", "60"))
+MEMORY_ALERT_MB = float(os.getenv("PSL_MEMORY_ALERT_MB", "0"))
+MEMORY_TRACE_FRAMES = int(os.getenv("PSL_MEMORY_TRACE_FRAMES", "4"))
+MEMORY_TOP_SITES = 10
+
+# Data source: "api" (remote FastAPI backend) or "local" (ball-by-ball dataset)
+DATA_SOURCE = os.getenv("PSL_DATA_SOURCE", "api").strip().lower()
+
 # Project branding
 PROJECT_NAME = "PSL Analytics Hub"
 PROJECT_VERSION = "1.0.0"
@@ -21,6 +80,24 @@ PROJECT_DESCRIPTION = "Comprehensive Pakistan Super League statistics, analytics
 BASE_DIR = Path(__file__).resolve().parent.parent
 IMAGES_DIR = BASE_DIR / "images"
 
+# Local ball-by-ball dataset (CSV or Parquet) used when PSL_DATA_SOURCE=local
+LOCAL_DATA_PATH = os.getenv("PSL_DATA_PATH", str(BASE_DIR / "Data" / "PSL_Complete_Dataset_2016_2025.csv"))
+
+# Prebuilt memory-mapped stat tables (python -m psl_dashboard.engine.tables)
+LOCAL_TABLES_PATH = os.getenv("PSL_TABLES_PATH", str(BASE_DIR / "Data" / "tables"))
+
+# New match files staged with python -m psl_dashboard.engine.ingest; each
+# dashboard process polls this directory and ingests them incrementally
+LOCAL_INGEST_PATH = os.getenv("PSL_INGEST_PATH", str(BASE_DIR / "Data" / "incoming"))
+INGEST_POLL_SECONDS = float(os.getenv("PSL_INGEST_POLL_SECONDS", "10"))
+
+# Static site pre-rendered with python -m psl_dashboard.site
+SITE_OUT_PATH = os.getenv("PSL_SITE_PATH", str(BASE_DIR / "site"))
+
+# Default minimum innings for a player to count in league percentiles
+PERCENTILE_MIN_INNINGS = 10
+PERCENTILE_SEASON_MIN_INNINGS = 3
+
 # Default placeholder
 PLACEHOLDER_IMAGE = str(IMAGES_DIR / "psl_logo.png") if (IMAGES_DIR / "psl_logo.png").exists() else "https://via.placeholder.com/150?text=PSL"
 
@@ -58,6 +135,14 @@ TEAM_COLORS = {
 }
 
 
+# Import budget (ms) for the first render: app.py plus the Home tab,
+# measured on top of Streamlit itself (already loaded by the server)
+STARTUP_BUDGET_MS = float(os.getenv("PSL_STARTUP_BUDGET_MS", "250"))
+
+# Tables longer than this are paginated server-side
+TABLE_PAGE_SIZE = 25
+
+
 def get_base_url() -> str | None:
     """Return sanitized base URL if configured, else None."""
     override = st.session_state.get("api_base_override") or API_BASE_URL
@@ -66,6 +151,11 @@ def get_base_url() -> str | None:
     return override.rstrip("/")
 
 
+def is_local_source() -> bool:
+    """Return True when payloads are computed from the local dataset."""
+    return DATA_SOURCE == "local"
+
+
 def get_psl_logo() -> str | None:
     """Return path to PSL logo if it exists."""
     logo_path = IMAGES_DIR / "psl_logo.png"
@@ -0,0 +1,58 @@
+"""
+PSL Analytics Hub - Local Analytics Engine
+==========================================
+Compute API payloads from a local ball-by-ball dataset instead of the remote
+backend. Enable with ``PSL_DATA_SOURCE=local`` and point ``PSL_DATA_PATH`` at a
+CSV or Parquet file. Aggregates prebuilt with ``python -m
+psl_dashboard.engine.tables`` are memory-mapped from ``PSL_TABLES_PATH``, and
+new matches staged with ``python -m psl_dashboard.engine.ingest`` are added
+incrementally.
+"""
+import streamlit as st
+
+from .leaderboards import LEADERBOARD_METRICS, top_k
+from .payloads import UnknownEntityError
+from .router import BadRequestError, EndpointNotSupported, handle_request
+from .store import DeliveryStore, load_deliveries, normalize_deliveries
+
+
+@st.cache_resource(show_spinner="Loading local PSL dataset...")
+def get_store(path: str, tables_path: str | None = None) -> DeliveryStore:
+    """
+    Load the dataset once per process; the store is shared by all sessions.
+
+    When ``tables_path`` holds a build made from this dataset, the whole
+    store (deliveries, innings tables and aggregates) is memory-mapped from
+    it and the dataset is not parsed. Otherwise the dataset is loaded and
+    aggregated here.
+    """
+    if tables_path:
+        from .tables import load_store
+
+        store = load_store(tables_path, path)
+        if store is not None:
+            return store
+    return DeliveryStore.from_path(path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_live_store(path: str, tables_path: str | None = None, incoming_path: str | None = None):
+    """Per-process :class:`LiveStore` that ingests matches staged in ``incoming_path``."""
+    from .ingest import LiveStore
+
+    return LiveStore(get_store(path, tables_path), incoming_path)
+
+
+__all__ = [
+    "BadRequestError",
+    "DeliveryStore",
+    "EndpointNotSupported",
+    "LEADERBOARD_METRICS",
+    "UnknownEntityError",
+    "get_live_store",
+    "get_store",
+    "handle_request",
+    "load_deliveries",
+    "normalize_deliveries",
+    "top_k",
+]
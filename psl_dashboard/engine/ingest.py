@@ -0,0 +1,286 @@
+"""
+PSL Analytics Hub - Incremental Ingestion
+=========================================
+Add new matches to a loaded :class:`DeliveryStore` without recomputing the
+league from scratch.
+
+The new deliveries are aggregated on their own (a "delta" store) and
+appended as new chunks of the store's frames, so the history is neither
+copied nor re-aggregated; finals and the team -> matches index are updated
+from the delta too. Additive aggregates (leaderboard partials, matchup
+matrix, award and catch counts, innings totals) are merged with the delta.
+Summary tables are recomputed only for the players, bowlers and teams that
+appear in the new matches, from their own rows. The old store is never
+modified: a new store is built and published by swapping one reference, so
+concurrent readers see either the old or the new data, never a mix.
+
+New match files are staged into the incoming directory with this module's
+CLI; every dashboard process polls that directory and ingests them.
+
+Usage:
+    python -m psl_dashboard.engine.ingest match_2025_31.csv
+    python -m psl_dashboard.engine.ingest match.csv --incoming Data/incoming
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..config import INGEST_POLL_SECONDS, LOCAL_INGEST_PATH
+from .leaderboards import PartialAggregates, partial_aggregates
+from .matchups import MATCHUP_METRICS, MatchupMatrix, matchup_matrix
+from .payloads import build_summary, catches_by_fielder, innings_totals, team_matches
+from .store import PLAYER_COLUMNS, TEAM_COLUMNS, DeliveryStore, normalize_deliveries, read_frame
+
+INGEST_SUFFIXES = (".csv", ".parquet", ".pq")
+
+
+def _extend(index: pd.Index, frame: pd.DataFrame, columns) -> pd.Index:
+    """Append names used in ``columns`` that ``index`` lacks (existing codes stay stable)."""
+    names = set()
+    for column in columns:
+        if column in frame.columns:
+            names.update(frame[column].dropna().astype(str).unique())
+    missing = sorted(names.difference(index))
+    return index.append(pd.Index(missing)) if missing else index
+
+
+def _with_categories(frame: pd.DataFrame, players: pd.Index, teams: pd.Index) -> pd.DataFrame:
+    """Recode player/team categoricals of ``frame`` onto the shared category sets."""
+    updates = {}
+    for column in frame.columns:
+        dtype = frame[column].dtype
+        if not isinstance(dtype, pd.CategoricalDtype):
+            continue
+        target = players if column in PLAYER_COLUMNS else teams if column in TEAM_COLUMNS else None
+        if target is not None and not dtype.categories.equals(target):
+            updates[column] = frame[column].cat.set_categories(target)
+    return frame.assign(**updates) if updates else frame
+
+
+def _entity_rows(store: DeliveryStore, kind: str, names: list[str]) -> pd.DataFrame:
+    if kind == "batting":
+        return store._batting.take(np.sort(np.concatenate([store._batting_rows[name] for name in names])))
+    if kind == "bowling":
+        return store._bowling.take(np.sort(np.concatenate([store._bowling_rows[name] for name in names])))
+    return team_matches(store, names)
+
+
+def _update_summary(table: pd.DataFrame, store: DeliveryStore, kind: str, keys: tuple, names: list[str]) -> pd.DataFrame:
+    """Recompute the rows of ``names`` (first index level) and splice them in."""
+    if not names:
+        return table
+    fresh = build_summary(_entity_rows(store, kind, names), kind, keys)
+    if isinstance(table.index, pd.MultiIndex):
+        kept = table.drop(index=names, level=0, errors="ignore")
+    else:
+        kept = table.drop(index=names, errors="ignore")
+    return pd.concat([kept, fresh]).sort_index()
+
+
+def _merge_partials(old: PartialAggregates, delta: PartialAggregates, players: pd.Index) -> PartialAggregates:
+    return PartialAggregates(
+        players=players,
+        player=np.concatenate([old.player, delta.player]),
+        season=np.concatenate([old.season, delta.season]),
+        team=np.concatenate([old.team, delta.team]),
+        sums={name: np.concatenate([values, delta.sums[name]]) for name, values in old.sums.items()},
+    )
+
+
+def _merge_matchups(old: MatchupMatrix, delta: MatchupMatrix) -> MatchupMatrix:
+    batters = old.batters.append(delta.batters.difference(old.batters, sort=False))
+    bowlers = old.bowlers.append(delta.bowlers.difference(old.bowlers, sort=False))
+    values = np.zeros((len(MATCHUP_METRICS), len(batters), len(bowlers)), dtype=np.int32)
+    values[:, : len(old.batters), : len(old.bowlers)] = old.values
+    rows = batters.get_indexer(delta.batters)
+    cols = bowlers.get_indexer(delta.bowlers)
+    values[:, rows[:, None], cols[None, :]] += delta.values
+    return MatchupMatrix(batters, bowlers, values)
+
+
+def _add_counts(old: pd.Series, new: pd.Series) -> pd.Series:
+    old = pd.Series(old.to_numpy(), index=old.index.astype(object), name=old.name)
+    new = pd.Series(new.to_numpy(), index=new.index.astype(object), name=old.name)
+    return old.add(new, fill_value=0).astype(np.int64).sort_values(ascending=False, kind="stable")
+
+
+def _merge_cache(old: DeliveryStore, delta: DeliveryStore, merged: DeliveryStore, affected: dict) -> dict:
+    """
+    Carry ``old.cache`` forward to ``merged``.
+
+    Keyed tables are copied with the delta's keys updated (linear in the
+    number of keys, not in the history). Entries without an incremental rule
+    are dropped and rebuilt on first use.
+    """
+    cache = {}
+    for key, value in old.cache.items():
+        if isinstance(key, tuple) and key[0] == "summary":
+            _, kind, keys = key
+            cache[key] = _update_summary(value, merged, kind, keys, affected[kind])
+        elif isinstance(key, tuple) and key[0] == "partials":
+            cache[key] = _merge_partials(value, partial_aggregates(delta, key[1]), merged.players)
+        elif key == "matchups":
+            cache[key] = _merge_matchups(value, matchup_matrix(delta))
+        elif key == "awards":
+            cache[key] = _add_counts(value, delta.matches["player_of_match"].value_counts())
+        elif key == "catches":
+            cache[key] = _add_counts(value, catches_by_fielder(delta))
+        elif key == "innings_totals":
+            cache[key] = pd.concat([value, innings_totals(delta)], ignore_index=True)
+    return cache
+
+
+def ingest_deliveries(store: DeliveryStore, raw: pd.DataFrame) -> tuple[DeliveryStore, dict]:
+    """
+    Return a new store with the matches in ``raw`` added.
+
+    Args:
+        store: Current store (left unchanged)
+        raw: Ball-by-ball rows of one or more new matches
+
+    Returns:
+        Tuple of (new store, summary of what was ingested)
+
+    Raises:
+        ValueError: If required columns are missing or a match is already loaded
+    """
+    rows = normalize_deliveries(raw)
+    if rows.empty:
+        raise ValueError("No deliveries to ingest")
+    duplicates = store.loaded_matches(rows["match_id"].unique())
+    if duplicates:
+        raise ValueError(f"Matches already ingested: {', '.join(duplicates)}")
+
+    # New names are appended, so existing codes (and mapped chunks) stay valid
+    players = _extend(store.players, rows, PLAYER_COLUMNS)
+    teams = _extend(store.teams, rows, TEAM_COLUMNS)
+    rows = _with_categories(rows, players, teams)
+    rows["match_code"] += store.match_count
+
+    # Aggregates of the new data only
+    delta = DeliveryStore(rows)
+    merged = store.extend(delta)
+
+    # A new last-of-season match can move the "final" (and a title) between teams
+    moved = sorted(code for code in store.finals.codes ^ merged.finals.codes if code < store.match_count)
+    moved = merged._matches.take(moved)
+    affected_teams = set(delta.matches["team1"].astype(str)) | set(delta.matches["team2"].astype(str))
+    affected_teams |= set(moved["team1"].astype(str)) | set(moved["team2"].astype(str))
+    affected = {
+        "batting": sorted(delta._batting_rows),
+        "bowling": sorted(delta._bowling_rows),
+        "team": sorted(affected_teams),
+    }
+    merged.cache = _merge_cache(store, delta, merged, affected)
+    summary = {
+        "matches": sorted(delta.matches["match_id"]),
+        "deliveries": len(rows),
+        "batters": len(affected["batting"]),
+        "bowlers": len(affected["bowling"]),
+        "teams": affected["team"],
+    }
+    return merged, summary
+
+
+class LiveStore:
+    """
+    Holder of the current store for one dashboard process.
+
+    Readers call :meth:`current`; new files in the incoming directory are
+    ingested at most once per poll interval by whichever caller gets the
+    lock, while everyone else keeps reading the previous store.
+    """
+
+    def __init__(self, store: DeliveryStore, incoming: str | Path | None = None, poll_seconds: float = INGEST_POLL_SECONDS):
+        self.store = store
+        self.incoming = Path(incoming) if incoming else None
+        self.poll_seconds = poll_seconds
+        self.applied: list[dict] = []
+        self.failed: dict[str, str] = {}
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+        self._next_poll = 0.0
+
+    def current(self) -> DeliveryStore:
+        if self.incoming is not None and time.monotonic() >= self._next_poll and self._lock.acquire(blocking=False):
+            try:
+                self._next_poll = time.monotonic() + self.poll_seconds
+                self.refresh()
+            finally:
+                self._lock.release()
+        return self.store
+
+    def pending(self) -> list[Path]:
+        if self.incoming is None or not self.incoming.is_dir():
+            return []
+        return sorted(
+            path for path in self.incoming.iterdir()
+            if path.suffix.lower() in INGEST_SUFFIXES and not path.name.startswith(".") and path.name not in self._seen
+        )
+
+    def refresh(self) -> int:
+        """Ingest staged files in name order; returns how many were applied."""
+        applied = 0
+        for path in self.pending():
+            self._seen.add(path.name)
+            try:
+                store, summary = ingest_deliveries(self.store, read_frame(path))
+            except (OSError, ValueError) as exc:
+                self.failed[path.name] = str(exc)
+                continue
+            # Publishing is a single reference swap
+            self.store = store
+            self.applied.append({"file": path.name, **summary})
+            applied += 1
+        return applied
+
+
+def stage_match(path: str | Path, incoming: str | Path = LOCAL_INGEST_PATH) -> Path:
+    """
+    Validate a match file and move a copy into the incoming directory atomically.
+
+    Returns:
+        Path of the staged file
+
+    Raises:
+        ValueError: If the file is not a valid deliveries file
+    """
+    path = Path(path)
+    normalize_deliveries(read_frame(path))
+    incoming = Path(incoming)
+    incoming.mkdir(parents=True, exist_ok=True)
+    target = incoming / f"{time.strftime('%Y%m%dT%H%M%S')}-{path.name}"
+    # Dot-prefixed temporaries are ignored by pollers until the rename
+    temporary = incoming / f".{target.name}.tmp"
+    shutil.copyfile(path, temporary)
+    os.replace(temporary, target)
+    return target
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stage new match deliveries for running dashboards.")
+    parser.add_argument("files", nargs="+", help="CSV or Parquet files of new matches")
+    parser.add_argument("--incoming", default=LOCAL_INGEST_PATH, help="Directory polled by the dashboards")
+    args = parser.parse_args(argv)
+
+    status = 0
+    for file in args.files:
+        try:
+            print(f"Staged {stage_match(file, args.incoming)}")
+        except (OSError, ValueError) as exc:
+            print(f"Skipped {file}: {exc}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
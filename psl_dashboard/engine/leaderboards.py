@@ -0,0 +1,228 @@
+"""
+PSL Analytics Hub - Leaderboard Engine
+======================================
+Top-k leaderboards for any metric under any season / team / qualifier filter.
+
+Per (player, season, team) partial sums are precomputed once per domain.
+A query masks the partial rows, folds them per player with ``np.bincount``,
+derives rates, applies qualifiers and selects the top k with
+``np.argpartition`` (only the k winners are fully sorted).
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .store import CATCH_DISMISSALS, DeliveryStore
+
+# metric -> (domain, label, higher_is_better)
+LEADERBOARD_METRICS = {
+    "runs": ("batting", "Runs", True),
+    "batting_average": ("batting", "Batting Average", True),
+    "batting_strike_rate": ("batting", "Batting Strike Rate", True),
+    "fours": ("batting", "Fours", True),
+    "sixes": ("batting", "Sixes", True),
+    "hundreds": ("batting", "Hundreds", True),
+    "fifties": ("batting", "Fifties", True),
+    "wickets": ("bowling", "Wickets", True),
+    "economy": ("bowling", "Economy", False),
+    "bowling_average": ("bowling", "Bowling Average", False),
+    "bowling_strike_rate": ("bowling", "Bowling Strike Rate", False),
+    "three_w": ("bowling", "3W+ Hauls", True),
+    "catches": ("fielding", "Catches", True),
+    "mom": ("awards", "Player of Match", True),
+}
+
+# Summed columns kept per (player, season, team) for each domain
+_DOMAIN_SUMS = {
+    "batting": ("innings", "runs", "balls", "outs", "fours", "sixes", "hundreds", "fifties"),
+    "bowling": ("innings", "wickets", "runs", "balls", "three_w"),
+    "fielding": ("catches",),
+    "awards": ("mom",),
+}
+
+# Columns shown next to the ranked metric
+_CONTEXT_COLUMNS = {
+    "batting": ("innings", "runs", "balls"),
+    "bowling": ("innings", "wickets", "balls"),
+    "fielding": (),
+    "awards": (),
+}
+
+
+class PartialAggregates:
+    """Flat NumPy columns of per (player, season, team) sums for one domain."""
+
+    def __init__(self, players: pd.Index, player: np.ndarray, season: np.ndarray, team: np.ndarray, sums: dict[str, np.ndarray]):
+        self.players = players
+        self.player = player
+        self.season = season
+        self.team = team
+        self.sums = sums
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, players: pd.Index, player_col: str, team_col: str, columns: tuple[str, ...]) -> "PartialAggregates":
+        df = df.dropna(subset=[player_col])
+        grouped = df.groupby([player_col, "season", team_col], observed=True, dropna=False).agg({c: "sum" for c in columns}).reset_index()
+        return cls(
+            players=players,
+            player=players.get_indexer(grouped[player_col].astype(str)),
+            season=grouped["season"].to_numpy(dtype=np.int16),
+            team=grouped[team_col].astype(str).to_numpy(),
+            sums={c: grouped[c].to_numpy(dtype=np.float64) for c in columns},
+        )
+
+    def fold(self, seasons=None, teams=None) -> dict[str, np.ndarray]:
+        """Sum the partial rows matching the filters into one value per player."""
+        mask = np.ones(len(self.player), dtype=bool)
+        if seasons:
+            mask &= np.isin(self.season, np.asarray(list(seasons), dtype=self.season.dtype))
+        if teams:
+            mask &= np.isin(self.team, np.asarray(list(teams), dtype=object))
+        index = self.player[mask]
+        size = len(self.players)
+        return {c: np.bincount(index, weights=values[mask], minlength=size) for c, values in self.sums.items()}
+
+
+def _batting_partials(store: DeliveryStore) -> PartialAggregates:
+    rows = store.batting.assign(innings=1, outs=store.batting["out"], hundreds=store.batting["is_hundred"], fifties=store.batting["is_fifty"])
+    return PartialAggregates.from_frame(rows, store.players, "batter", "batting_team", _DOMAIN_SUMS["batting"])
+
+
+def _bowling_partials(store: DeliveryStore) -> PartialAggregates:
+    rows = store.bowling.assign(innings=1, three_w=store.bowling["wickets"].ge(3))
+    return PartialAggregates.from_frame(rows, store.players, "bowler", "bowling_team", _DOMAIN_SUMS["bowling"])
+
+
+def _fielding_partials(store: DeliveryStore) -> PartialAggregates:
+    d = store.deliveries
+    caught = d[d["dismissal_kind"].isin(CATCH_DISMISSALS)]
+    fielder = caught["fielder"].where(caught["fielder"].notna(), caught["bowler"])
+    rows = pd.DataFrame({"fielder": fielder, "season": caught["season"], "bowling_team": caught["bowling_team"], "catches": 1})
+    return PartialAggregates.from_frame(rows, store.players, "fielder", "bowling_team", _DOMAIN_SUMS["fielding"])
+
+
+def _award_partials(store: DeliveryStore) -> PartialAggregates:
+    m = store.matches.dropna(subset=["player_of_match"])
+    rows = pd.DataFrame({"player_of_match": m["player_of_match"], "season": m["season"], "winner": m["winner"], "mom": 1})
+    return PartialAggregates.from_frame(rows, store.players, "player_of_match", "winner", _DOMAIN_SUMS["awards"])
+
+
+_BUILDERS = {
+    "batting": _batting_partials,
+    "bowling": _bowling_partials,
+    "fielding": _fielding_partials,
+    "awards": _award_partials,
+}
+
+
+def partial_aggregates(store: DeliveryStore, domain: str) -> PartialAggregates:
+    """Return the domain's partial aggregates, building them on first use."""
+    cache_key = ("partials", domain)
+    partials = store.cache.get(cache_key)
+    if partials is None:
+        partials = _BUILDERS[domain](store)
+        store.cache[cache_key] = partials
+    return partials
+
+
+def _ratio(num: np.ndarray, den: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num * scale / np.where(den > 0, den, 1), np.nan)
+
+
+def _metric_values(metric: str, totals: dict[str, np.ndarray]) -> np.ndarray:
+    if metric == "batting_average":
+        return _ratio(totals["runs"], totals["outs"])
+    if metric == "batting_strike_rate":
+        return _ratio(totals["runs"], totals["balls"], 100)
+    if metric == "economy":
+        return _ratio(totals["runs"], totals["balls"], 6)
+    if metric == "bowling_average":
+        return _ratio(totals["runs"], totals["wickets"])
+    if metric == "bowling_strike_rate":
+        return _ratio(totals["balls"], totals["wickets"])
+    return totals[metric]
+
+
+def top_k_indices(values: np.ndarray, k: int, higher_is_better: bool = True, order: np.ndarray | None = None) -> np.ndarray:
+    """
+    Positions of the best ``k`` finite values, best first.
+
+    Uses ``np.partition`` so only values tied with or better than the k-th
+    are sorted. Ties are broken by ``order`` (lowest first), or by position
+    if None.
+    """
+    candidates = np.flatnonzero(np.isfinite(values))
+    if not len(candidates) or k <= 0:
+        return candidates[:0]
+    scores = values[candidates] if higher_is_better else -values[candidates]
+    if len(candidates) > k:
+        keep = scores >= np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates, scores = candidates[keep], scores[keep]
+    tiebreak = candidates if order is None else order[candidates]
+    return candidates[np.lexsort((tiebreak, -scores))][:k]
+
+
+def top_k(
+    store: DeliveryStore,
+    metric: str,
+    k: int = 10,
+    seasons=None,
+    teams=None,
+    min_balls: int = 0,
+    min_innings: int = 0,
+) -> list[dict]:
+    """
+    Rank players by ``metric`` under the given filters.
+
+    Args:
+        store: Loaded delivery store
+        metric: Key of :data:`LEADERBOARD_METRICS`
+        k: Number of players to return
+        seasons: Seasons to include (all if empty)
+        teams: Teams the player represented (all if empty)
+        min_balls: Minimum balls faced / bowled to qualify
+        min_innings: Minimum innings to qualify
+
+    Returns:
+        Records with rank, player, the metric value and context columns
+
+    Raises:
+        ValueError: If ``metric`` is unknown
+    """
+    if metric not in LEADERBOARD_METRICS:
+        raise ValueError(f"Unknown leaderboard metric: {metric}")
+    domain, _, higher_is_better = LEADERBOARD_METRICS[metric]
+    partials = partial_aggregates(store, domain)
+    totals = partials.fold(seasons, teams)
+
+    values = _metric_values(metric, totals).astype(np.float64)
+    qualified = np.ones(len(values), dtype=bool)
+    if "balls" in totals:
+        qualified &= totals["balls"] >= min_balls
+    if "innings" in totals:
+        qualified &= totals["innings"] >= max(min_innings, 1)
+    is_count = metric in _DOMAIN_SUMS[domain]
+    if is_count:
+        qualified &= values > 0
+    values = np.where(qualified, values, np.nan)
+
+    # Ties rank by name, so the order does not depend on player codes
+    name_order = np.empty(len(partials.players), dtype=np.int64)
+    name_order[partials.players.argsort()] = np.arange(len(partials.players))
+
+    records = []
+    for rank, pos in enumerate(top_k_indices(values, k, higher_is_better, name_order), start=1):
+        value = int(values[pos]) if is_count else round(float(values[pos]), 2)
+        record = {"rank": rank, "player": str(partials.players[pos]), metric: value}
+        for column in _CONTEXT_COLUMNS[domain]:
+            if column != metric:
+                record[column] = int(totals[column][pos])
+        records.append(record)
+    return records
+
+
+def season_list(store: DeliveryStore) -> list[int]:
+    """Seasons present in the dataset, oldest first."""
+    return sorted(int(s) for s in store.matches["season"].unique())
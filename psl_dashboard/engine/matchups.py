@@ -0,0 +1,107 @@
+"""
+PSL Analytics Hub - Matchup Matrix
+==================================
+Dense batter x bowler matrix of head-to-head totals built from deliveries.
+
+Each metric is one ``int32`` layer indexed by (batter row, bowler column), so
+single-pair lookups are O(1) array reads and a batter's row or a bowler's
+column is a single slice.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .store import DeliveryStore
+
+MATCHUP_METRICS = ("runs", "balls", "dismissals", "fours", "sixes", "runs_conceded", "legal_balls")
+
+
+def _safe_ratio(num: np.ndarray, den: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, np.round(num * scale / np.where(den > 0, den, 1), 2), np.nan)
+
+
+class MatchupMatrix:
+    """Batter x bowler totals for every metric in :data:`MATCHUP_METRICS`."""
+
+    def __init__(self, batters: pd.Index, bowlers: pd.Index, values: np.ndarray):
+        self.batters = batters
+        self.bowlers = bowlers
+        self.values = values
+        self._batter_pos = {name: i for i, name in enumerate(batters)}
+        self._bowler_pos = {name: i for i, name in enumerate(bowlers)}
+
+    @classmethod
+    def from_deliveries(cls, deliveries: pd.DataFrame) -> "MatchupMatrix":
+        d = deliveries[(deliveries["batter"].cat.codes >= 0) & (deliveries["bowler"].cat.codes >= 0)]
+        batter_codes = d["batter"].cat.codes.to_numpy()
+        bowler_codes = d["bowler"].cat.codes.to_numpy()
+        batter_ids, batter_idx = np.unique(batter_codes, return_inverse=True)
+        bowler_ids, bowler_idx = np.unique(bowler_codes, return_inverse=True)
+        shape = (len(batter_ids), len(bowler_ids))
+        flat = batter_idx * shape[1] + bowler_idx
+
+        striker_out = d["bowler_wicket"].to_numpy() & (d["player_dismissed"].cat.codes.to_numpy() == batter_codes)
+        layers = {
+            "runs": d["batsman_runs"].to_numpy(),
+            "balls": ~d["is_wide"].to_numpy(),
+            "dismissals": striker_out,
+            "fours": d["is_four"].to_numpy(),
+            "sixes": d["is_six"].to_numpy(),
+            "runs_conceded": d["bowler_runs"].to_numpy(),
+            "legal_balls": d["is_legal"].to_numpy(),
+        }
+        values = np.stack([
+            np.bincount(flat, weights=layers[metric], minlength=shape[0] * shape[1]).reshape(shape).astype(np.int32)
+            for metric in MATCHUP_METRICS
+        ])
+        categories = d["batter"].cat.categories
+        return cls(categories[batter_ids], categories[bowler_ids], values)
+
+    def has_batter(self, name: str) -> bool:
+        return name in self._batter_pos
+
+    def has_bowler(self, name: str) -> bool:
+        return name in self._bowler_pos
+
+    def pair(self, batter: str, bowler: str) -> dict[str, int]:
+        """Raw totals for one batter/bowler pair (zeros if they never met)."""
+        row = self._batter_pos.get(batter)
+        col = self._bowler_pos.get(bowler)
+        if row is None or col is None:
+            return {metric: 0 for metric in MATCHUP_METRICS}
+        return {metric: int(v) for metric, v in zip(MATCHUP_METRICS, self.values[:, row, col])}
+
+    def _frame(self, block: np.ndarray, index: pd.Index, label: str) -> pd.DataFrame:
+        df = pd.DataFrame(block.T, index=index, columns=MATCHUP_METRICS)
+        df = df[(df["balls"] > 0) | (df["legal_balls"] > 0)]
+        runs, balls, outs = df["runs"].to_numpy(), df["balls"].to_numpy(), df["dismissals"].to_numpy()
+        df["strike_rate"] = _safe_ratio(runs, balls, 100)
+        df["average"] = _safe_ratio(runs, outs)
+        df["economy"] = _safe_ratio(df["runs_conceded"].to_numpy(), df["legal_balls"].to_numpy(), 6)
+        # Names ingested later have higher positions, so order rows by name rather than position
+        return df.rename_axis(label).sort_index().reset_index()
+
+    def row(self, batter: str) -> pd.DataFrame:
+        """Every bowler the batter has faced, one row per bowler."""
+        pos = self._batter_pos.get(batter)
+        if pos is None:
+            return pd.DataFrame(columns=["bowler", *MATCHUP_METRICS])
+        return self._frame(self.values[:, pos, :], self.bowlers, "bowler")
+
+    def column(self, bowler: str) -> pd.DataFrame:
+        """Every batter the bowler has bowled to, one row per batter."""
+        pos = self._bowler_pos.get(bowler)
+        if pos is None:
+            return pd.DataFrame(columns=["batter", *MATCHUP_METRICS])
+        return self._frame(self.values[:, :, pos], self.batters, "batter")
+
+
+def matchup_matrix(store: DeliveryStore) -> MatchupMatrix:
+    """Return the store's matchup matrix, building it on first use."""
+    matrix = store.cache.get("matchups")
+    if matrix is None:
+        matrix = MatchupMatrix.from_deliveries(store.deliveries)
+        store.cache["matchups"] = matrix
+    return matrix
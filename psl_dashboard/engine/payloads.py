@@ -0,0 +1,477 @@
+"""
+PSL Analytics Hub - Local Payloads
+==================================
+Build the same JSON payloads the FastAPI backend returns, computed from a
+:class:`DeliveryStore` with vectorized groupbys.
+
+League-wide summary tables (per player, per player and opponent, per player
+and season, ...) are built once and memoized on ``store.cache``; a payload is
+then a sorted-index lookup into those tables.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .matchups import matchup_matrix
+from .store import CATCH_DISMISSALS, DeliveryStore
+
+
+class UnknownEntityError(LookupError):
+    """Raised when a player, bowler or team is not in the local dataset."""
+
+
+def _ratio(num: pd.Series, den: pd.Series, scale: float = 1.0) -> pd.Series:
+    den = den.astype("float64")
+    return (num.astype("float64") * scale / den.where(den > 0)).round(2)
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    """Convert a frame to JSON-safe records (Python scalars, None for missing)."""
+    records = df.to_dict("records")
+    for record in records:
+        for key, value in record.items():
+            if value is pd.NA or (isinstance(value, float) and value != value):
+                record[key] = None
+    return records
+
+
+def _keyed(df: pd.DataFrame) -> dict[str, dict]:
+    """Records keyed by the frame's (single-level) index."""
+    return {str(key): row for key, row in zip(df.index, _records(df))}
+
+
+def _with_keys(rows: pd.DataFrame, by) -> tuple[pd.DataFrame, list[str]]:
+    if not by:
+        return rows.assign(_all=0), ["_all"]
+    return rows, [by] if isinstance(by, str) else list(by)
+
+
+def batting_summary(rows: pd.DataFrame, by=None) -> pd.DataFrame:
+    """
+    Aggregate batting innings rows, optionally per ``by`` column(s).
+
+    Returns:
+        Frame indexed by ``by`` with runs, innings, balls, avg, strikeRate,
+        hundreds, fifties, highestScore, fours, sixes and notOut
+    """
+    rows, keys = _with_keys(rows, by)
+    summary = rows.groupby(keys, observed=True).agg(
+        innings=("runs", "size"),
+        runs=("runs", "sum"),
+        balls=("balls", "sum"),
+        outs=("out", "sum"),
+        hundreds=("is_hundred", "sum"),
+        fifties=("is_fifty", "sum"),
+        fours=("fours", "sum"),
+        sixes=("sixes", "sum"),
+    )
+    # Highest score per group; a not-out score wins ties
+    best = rows.sort_values(["runs", "out"], ascending=[False, True], kind="stable")
+    best = best.groupby(keys, observed=True).head(1).set_index(keys)
+    summary["highestScore"] = best["runs"].astype(str) + np.where(best["out"], "", "*")
+    summary["avg"] = _ratio(summary["runs"], summary["outs"])
+    summary["strikeRate"] = _ratio(summary["runs"], summary["balls"], 100)
+    summary["notOut"] = summary["innings"] - summary["outs"]
+    columns = ["runs", "innings", "balls", "avg", "strikeRate", "hundreds", "fifties", "highestScore", "fours", "sixes", "notOut"]
+    return summary[columns]
+
+
+def bowling_summary(rows: pd.DataFrame, by=None) -> pd.DataFrame:
+    """
+    Aggregate bowling innings rows, optionally per ``by`` column(s).
+
+    Returns:
+        Frame indexed by ``by`` with innings, wicket, runs, balls, economy,
+        average, strikeRate, best_figure, three_w, fours and sixes
+    """
+    rows, keys = _with_keys(rows, by)
+    rows = rows.assign(is_three_w=rows["wickets"].ge(3))
+    summary = rows.groupby(keys, observed=True).agg(
+        innings=("runs", "size"),
+        wicket=("wickets", "sum"),
+        runs=("runs", "sum"),
+        balls=("balls", "sum"),
+        three_w=("is_three_w", "sum"),
+        fours=("fours", "sum"),
+        sixes=("sixes", "sum"),
+    )
+    best = rows.sort_values(["wickets", "runs"], ascending=[False, True], kind="stable")
+    best = best.groupby(keys, observed=True).head(1).set_index(keys)
+    summary["best_figure"] = best["wickets"].astype(str) + "/" + best["runs"].astype(str)
+    summary["economy"] = _ratio(summary["runs"], summary["balls"], 6)
+    summary["average"] = _ratio(summary["runs"], summary["wicket"])
+    summary["strikeRate"] = _ratio(summary["balls"], summary["wicket"])
+    columns = ["innings", "wicket", "runs", "balls", "economy", "average", "strikeRate", "best_figure", "three_w", "fours", "sixes"]
+    return summary[columns]
+
+
+def team_matches(store: DeliveryStore, names=None) -> pd.DataFrame:
+    """One row per (match, team) with the opponent and result flags, optionally for the teams in ``names`` only."""
+    m = store.matches if names is None else store.team_match_rows(names)
+    teams = np.concatenate([m["team1"].astype(str).to_numpy(), m["team2"].astype(str).to_numpy()])
+    opponents = np.concatenate([m["team2"].astype(str).to_numpy(), m["team1"].astype(str).to_numpy()])
+    winner = np.tile(m["winner"].astype(object).to_numpy(), 2)
+    won = teams == winner
+    rows = pd.DataFrame({
+        "match_code": np.tile(m["match_code"].to_numpy(), 2),
+        "season": np.tile(m["season"].to_numpy(), 2),
+        "team": teams,
+        "opponent": opponents,
+        "won": won,
+        "no_result": pd.isna(winner),
+        "is_title": won & np.tile(m["is_final"].to_numpy(), 2),
+    })
+    return rows if names is None else rows[rows["team"].isin(names)]
+
+
+def team_summary(rows: pd.DataFrame, by=None) -> pd.DataFrame:
+    """Aggregate (match, team) rows into played/won/lost/no-result/titles."""
+    rows, keys = _with_keys(rows, by)
+    summary = rows.groupby(keys, observed=True).agg(
+        match_played=("match_code", "size"),
+        match_won=("won", "sum"),
+        no_results=("no_result", "sum"),
+        titles_won=("is_title", "sum"),
+    )
+    summary["loss"] = summary["match_played"] - summary["match_won"] - summary["no_results"]
+    return summary[["match_played", "match_won", "loss", "no_results", "titles_won"]]
+
+
+_SUMMARIES = {
+    "batting": (lambda store: store.batting, batting_summary),
+    "bowling": (lambda store: store.bowling, bowling_summary),
+    "team": (team_matches, team_summary),
+}
+
+
+def summary_table(store: DeliveryStore, kind: str, keys: tuple[str, ...]) -> pd.DataFrame:
+    """
+    League-wide summary of ``kind`` ("batting", "bowling", "team") by ``keys``.
+
+    Built on first use and memoized on the store; the index is sorted so
+    per-entity lookups are binary searches.
+    """
+    cache_key = ("summary", kind, keys)
+    table = store.cache.get(cache_key)
+    if table is None:
+        table = build_summary(summary_source(store, kind), kind, keys)
+        store.cache[cache_key] = table
+    return table
+
+
+def summary_source(store: DeliveryStore, kind: str) -> pd.DataFrame:
+    """Rows a ``kind`` summary is aggregated from (innings or (match, team) rows)."""
+    source, _ = _SUMMARIES[kind]
+    return source(store)
+
+
+def build_summary(rows: pd.DataFrame, kind: str, keys: tuple[str, ...]) -> pd.DataFrame:
+    """Aggregate ``rows`` into a summary table with a sorted object-key index."""
+    _, summarize = _SUMMARIES[kind]
+    table = summarize(rows, list(keys)).reset_index()
+    # Plain object keys hash faster than categorical index levels
+    return table.astype({key: object for key in keys}).set_index(list(keys)).sort_index()
+
+
+def _lookup(table: pd.DataFrame, key, error: str) -> pd.DataFrame:
+    try:
+        rows = table.loc[[key]]
+    except KeyError:
+        raise UnknownEntityError(error) from None
+    if rows.empty:
+        raise UnknownEntityError(error)
+    return rows
+
+
+def _one(table: pd.DataFrame, key, error: str) -> dict:
+    return _records(_lookup(table, key, error))[0]
+
+
+def _per_key(table: pd.DataFrame, key: str, error: str) -> pd.DataFrame:
+    """Rows of a two-level table for the first-level ``key``, indexed by the second level."""
+    return _lookup(table, key, error).droplevel(0)
+
+
+def _awards(store: DeliveryStore) -> pd.Series:
+    awards = store.cache.get("awards")
+    if awards is None:
+        awards = store.matches["player_of_match"].value_counts()
+        store.cache["awards"] = awards
+    return awards
+
+
+def _mom_count(store: DeliveryStore, name: str) -> int:
+    return int(_awards(store).get(name, 0))
+
+
+def player_overall(store: DeliveryStore, name: str) -> dict:
+    overall = _one(summary_table(store, "batting", ("batter",)), name, f"Unknown player: {name}")
+    overall["mom"] = _mom_count(store, name)
+    return overall
+
+
+def player_stats(store: DeliveryStore, name: str) -> dict:
+    """Payload of ``/players/{name}/stats``."""
+    overall = player_overall(store, name)
+    against = _per_key(summary_table(store, "batting", ("batter", "bowling_team")), name, f"Unknown player: {name}")
+    return {"player": name, "overall": overall, "against": _keyed(against)}
+
+
+def player_growth(store: DeliveryStore, name: str) -> list[dict]:
+    """Payload of ``/players/{name}/growth``: per-season batting."""
+    seasons = _per_key(summary_table(store, "batting", ("batter", "season")), name, f"Unknown player: {name}")
+    seasons = seasons.rename(columns={"runs": "batsman_runs", "strikeRate": "strike_rate", "avg": "average"})
+    seasons = seasons.rename_axis("season").reset_index()
+    return _records(seasons[["season", "batsman_runs", "innings", "balls", "strike_rate", "average"]])
+
+
+def player_vs_team(store: DeliveryStore, name: str, team: str) -> dict:
+    """Payload of ``/players/{name}/vs-team/{team}``."""
+    table = summary_table(store, "batting", ("batter", "bowling_team"))
+    summary = _one(table, (name, team), f"No innings for {name} against {team}")
+    return {"player": name, "team": team, **summary}
+
+
+def bowler_overall(store: DeliveryStore, name: str) -> dict:
+    overall = _one(summary_table(store, "bowling", ("bowler",)), name, f"Unknown bowler: {name}")
+    overall["mom"] = _mom_count(store, name)
+    return overall
+
+
+def bowler_stats(store: DeliveryStore, name: str) -> dict:
+    """Payload of ``/bowlers/{name}/stats``."""
+    overall = bowler_overall(store, name)
+    against = _per_key(summary_table(store, "bowling", ("bowler", "batting_team")), name, f"Unknown bowler: {name}")
+    return {"bowler": name, "overall": overall, "against": _keyed(against)}
+
+
+def team_overall(store: DeliveryStore, team: str) -> dict:
+    return _one(summary_table(store, "team", ("team",)), team, f"Unknown team: {team}")
+
+
+def team_stats(store: DeliveryStore, team: str) -> dict:
+    """Payload of ``/teams/{name}/stats``."""
+    overall = team_overall(store, team)
+    against = _per_key(summary_table(store, "team", ("team", "opponent")), team, f"Unknown team: {team}")
+    return {"team": team, "overall": overall, "against": _keyed(against.drop(columns="titles_won"))}
+
+
+def _for_team(store: DeliveryStore, kind: str, keys: tuple[str, ...], team: str) -> pd.DataFrame:
+    """Rows of a (player, team, ...) summary for ``team``, indexed by the remaining keys."""
+    table = summary_table(store, kind, keys)
+    if team not in table.index.get_level_values(1):
+        return table.iloc[:0].droplevel(1)
+    return table.xs(team, level=1)
+
+
+def _team_awards(store: DeliveryStore, team: str, members: pd.Index) -> pd.Series:
+    """Player-of-the-match awards won for ``team``, by (player, season) members of its squad."""
+    m = store.team_match_rows([team]).dropna(subset=["player_of_match"])
+    keys = pd.MultiIndex.from_arrays([m["player_of_match"].astype(str).to_numpy(), m["season"].astype(int).to_numpy()])
+    awarded = keys[keys.isin(members)].get_level_values(0)
+    return pd.Series(1, index=awarded).groupby(level=0).sum()
+
+
+def team_squad(store: DeliveryStore, team: str) -> dict:
+    """
+    Payload of ``/teams/{name}/all``: overall record and every player who
+    batted or bowled for the team, with their totals for this team only.
+
+    ``batting`` and ``bowling`` hold one record per player (summary fields
+    for the player's innings for the team), ``seasons`` the player's runs
+    per season for the team and ``awards`` player-of-the-match awards won
+    in the team's matches.
+    """
+    overall = team_overall(store, team)
+    batting = _for_team(store, "batting", ("batter", "batting_team"), team)
+    bowling = _for_team(store, "bowling", ("bowler", "bowling_team"), team)
+    batting_seasons = _for_team(store, "batting", ("batter", "batting_team", "season"), team)
+    bowling_seasons = _for_team(store, "bowling", ("bowler", "bowling_team", "season"), team)
+    awards = _team_awards(store, team, batting_seasons.index.append(bowling_seasons.index))
+    batters = [str(name) for name in batting.index]
+    bowlers = [str(name) for name in bowling.index]
+    seasons = batting_seasons[["runs"]].rename_axis(["player", "season"]).reset_index()
+    return {
+        "team": team,
+        "overall": overall,
+        "players": sorted(set(batters).union(bowlers)),
+        "batters": batters,
+        "bowlers": bowlers,
+        "batting": _records(batting.rename_axis("player").reset_index()),
+        "bowling": _records(bowling.rename_axis("player").reset_index()),
+        "seasons": _records(seasons),
+        "awards": {str(name): int(count) for name, count in awards.items()},
+    }
+
+
+def team_head_to_head(store: DeliveryStore, team_a: str, team_b: str) -> dict:
+    """Payload of ``/teams/{team1}/vs/{team2}``."""
+    team_overall(store, team_a)
+    table = summary_table(store, "team", ("team", "opponent"))
+    try:
+        record = _one(table, (team_a, team_b), "")
+    except UnknownEntityError:
+        record = {"match_played": 0, "match_won": 0, "loss": 0, "no_results": 0}
+    return {
+        "team_a": team_a,
+        "team_b": team_b,
+        "matches": record["match_played"],
+        "team_a_wins": record["match_won"],
+        "team_b_wins": record["loss"],
+        "no_results": record["no_results"],
+    }
+
+
+def _div(num: int, den: int, scale: float = 1.0) -> float | None:
+    return round(num * scale / den, 2) if den else None
+
+
+def batter_vs_bowler(store: DeliveryStore, batter: str, bowler: str) -> dict:
+    """Payload of ``/players/{batter}/vs-bowler/{bowler}``."""
+    matrix = matchup_matrix(store)
+    if not matrix.has_batter(batter):
+        raise UnknownEntityError(f"Unknown player: {batter}")
+    if not matrix.has_bowler(bowler):
+        raise UnknownEntityError(f"Unknown bowler: {bowler}")
+    pair = matrix.pair(batter, bowler)
+    return {
+        "batter": batter,
+        "bowler": bowler,
+        "batting_view": {
+            "runs": pair["runs"],
+            "balls": pair["balls"],
+            "strike_rate": _div(pair["runs"], pair["balls"], 100),
+            "average": _div(pair["runs"], pair["dismissals"]),
+            "fours": pair["fours"],
+            "sixes": pair["sixes"],
+            "outs": pair["dismissals"],
+        },
+        "bowling_view": {
+            "runs_conceded": pair["runs_conceded"],
+            "balls": pair["legal_balls"],
+            "wickets": pair["dismissals"],
+            "economy": _div(pair["runs_conceded"], pair["legal_balls"], 6),
+            "strike_rate": _div(pair["legal_balls"], pair["dismissals"]),
+        },
+    }
+
+
+def batter_matchups(store: DeliveryStore, batter: str) -> list[dict]:
+    """Payload of ``/players/{name}/vs-bowlers``: one row per bowler faced."""
+    matrix = matchup_matrix(store)
+    if not matrix.has_batter(batter):
+        raise UnknownEntityError(f"Unknown player: {batter}")
+    return _records(matrix.row(batter))
+
+
+def bowler_matchups(store: DeliveryStore, bowler: str) -> list[dict]:
+    """Payload of ``/bowlers/{name}/vs-batters``: one row per batter bowled to."""
+    matrix = matchup_matrix(store)
+    if not matrix.has_bowler(bowler):
+        raise UnknownEntityError(f"Unknown bowler: {bowler}")
+    return _records(matrix.column(bowler))
+
+
+def _top(series: pd.Series, limit: int, name_field: str, value_field: str) -> list[dict]:
+    # Ties are broken by name, so the order does not depend on how the counts were built
+    series = series[series > 0]
+    series = series.set_axis(series.index.astype(str)).sort_index(kind="stable")
+    top = series.sort_values(ascending=False, kind="stable").head(limit)
+    return [{name_field: str(name), value_field: int(value)} for name, value in top.items()]
+
+
+def top_run_scorers(store: DeliveryStore, limit: int = 10) -> list[dict]:
+    return _top(summary_table(store, "batting", ("batter",))["runs"], limit, "batter", "batsman_runs")
+
+
+def top_six_hitters(store: DeliveryStore, limit: int = 10) -> list[dict]:
+    return _top(summary_table(store, "batting", ("batter",))["sixes"], limit, "batter", "sixes")
+
+
+def top_four_hitters(store: DeliveryStore, limit: int = 10) -> list[dict]:
+    return _top(summary_table(store, "batting", ("batter",))["fours"], limit, "batter", "fours")
+
+
+def top_wicket_takers(store: DeliveryStore, limit: int = 10) -> list[dict]:
+    return _top(summary_table(store, "bowling", ("bowler",))["wicket"], limit, "bowler", "bowler_wickets")
+
+
+def catches_by_fielder(store: DeliveryStore) -> pd.Series:
+    catches = store.cache.get("catches")
+    if catches is None:
+        d = store.deliveries
+        caught = d[d["dismissal_kind"].isin(CATCH_DISMISSALS)]
+        # Caught-and-bowled dismissals often leave the fielder blank
+        fielder = caught["fielder"].where(caught["fielder"].notna(), caught["bowler"])
+        catches = fielder.value_counts()
+        store.cache["catches"] = catches
+    return catches
+
+
+def top_catches(store: DeliveryStore, limit: int = 10) -> list[dict]:
+    return _top(catches_by_fielder(store), limit, "fielder", "catches")
+
+
+def top_player_of_match(store: DeliveryStore, limit: int = 10) -> list[dict]:
+    return _top(_awards(store), limit, "player_of_match", "awards")
+
+
+def innings_totals(store: DeliveryStore) -> pd.DataFrame:
+    """Team total per (match, inning)."""
+    totals = store.cache.get("innings_totals")
+    if totals is None:
+        totals = (
+            store.deliveries.groupby(["match_code", "inning"], observed=True, sort=False)
+            .agg(
+                total_runs=("total_runs", "sum"),
+                batting_team=("batting_team", "first"),
+                bowling_team=("bowling_team", "first"),
+                season=("season", "first"),
+                winner=("winner", "first"),
+            )
+            .reset_index()
+            .astype({"batting_team": str, "bowling_team": str, "winner": object})
+        )
+        store.cache["innings_totals"] = totals
+    return totals
+
+
+def top_team_totals(store: DeliveryStore, limit: int = 10) -> list[dict]:
+    """Payload of ``/teams/top-totals``."""
+    totals = innings_totals(store).nlargest(limit, "total_runs", keep="first")
+    return _records(totals[["batting_team", "total_runs", "bowling_team", "season"]])
+
+
+def top_team_chases(store: DeliveryStore, limit: int = 10) -> list[dict]:
+    """Payload of ``/teams/top-chases``: highest successful chases."""
+    totals = innings_totals(store)
+    first = totals[totals["inning"] == 1].set_index("match_code")["total_runs"]
+    chases = totals[(totals["inning"] == 2) & (totals["batting_team"] == totals["winner"])]
+    chases = chases.assign(target=chases["match_code"].map(first) + 1).dropna(subset=["target"])
+    chases = chases.nlargest(limit, "target", keep="first").astype({"target": int})
+    return _records(chases[["batting_team", "target", "bowling_team", "season"]])
+
+
+def _comparison(kind: str, names: list[str], overalls: list[dict]) -> dict:
+    # Each record names its entity, so clients need not rely on the order
+    overalls = [{kind: name, **overall} for name, overall in zip(names, overalls)]
+    payload = {f"{kind}s": overalls}
+    if len(overalls) >= 2:
+        payload[f"{kind}_a"], payload[f"{kind}_b"] = overalls[0], overalls[1]
+    return payload
+
+
+def compare_players(store: DeliveryStore, names: list[str]) -> dict:
+    """Payload of ``POST /players/compare``."""
+    return _comparison("player", names, [player_overall(store, name) for name in names])
+
+
+def compare_bowlers(store: DeliveryStore, names: list[str]) -> dict:
+    """Payload of ``POST /bowlers/compare``."""
+    return _comparison("bowler", names, [bowler_overall(store, name) for name in names])
+
+
+def compare_teams(store: DeliveryStore, names: list[str]) -> dict:
+    """Payload of ``POST /teams/compare``."""
+    return _comparison("team", names, [team_overall(store, name) for name in names])
@@ -0,0 +1,138 @@
+"""
+PSL Analytics Hub - Percentile Ranks
+====================================
+League percentiles for every displayed batting and bowling stat.
+
+For each (kind, season, qualifier) the qualified players' values are sorted
+once per metric; a percentile is then one ``np.searchsorted`` per metric.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .leaderboards import partial_aggregates
+from .payloads import UnknownEntityError, _records, summary_table
+from .store import DeliveryStore
+
+# Summary field -> higher_is_better, per kind
+PERCENTILE_FIELDS = {
+    "batting": {
+        "runs": True,
+        "innings": True,
+        "avg": True,
+        "strikeRate": True,
+        "hundreds": True,
+        "fifties": True,
+        "fours": True,
+        "sixes": True,
+        "notOut": True,
+    },
+    "bowling": {
+        "innings": True,
+        "wicket": True,
+        "economy": False,
+        "average": False,
+        "strikeRate": False,
+        "three_w": True,
+        "fours": False,
+        "sixes": False,
+    },
+}
+
+_ENTITY = {"batting": "batter", "bowling": "bowler"}
+
+
+class PercentileTable:
+    """Sorted qualified values per metric for one (kind, season, qualifier)."""
+
+    def __init__(self, kind: str, rows: pd.DataFrame):
+        self.kind = kind
+        self.size = len(rows)
+        self.sorted_values = {}
+        for field in PERCENTILE_FIELDS[kind]:
+            values = pd.to_numeric(rows[field], errors="coerce").to_numpy(dtype=np.float64)
+            self.sorted_values[field] = np.sort(values[np.isfinite(values)])
+
+    def percentile(self, field: str, value) -> float | None:
+        """
+        Share of qualified players this value is at least as good as (0-100).
+
+        Returns None for missing values or an empty population.
+        """
+        population = self.sorted_values.get(field)
+        if population is None or not len(population) or value is None:
+            return None
+        value = float(value)
+        if value != value:
+            return None
+        if PERCENTILE_FIELDS[self.kind][field]:
+            at_least_as_good = np.searchsorted(population, value, side="right")
+        else:
+            at_least_as_good = len(population) - np.searchsorted(population, value, side="left")
+        return round(100.0 * float(at_least_as_good) / len(population), 1)
+
+    def percentiles(self, row: dict) -> dict[str, float | None]:
+        return {field: self.percentile(field, row.get(field)) for field in PERCENTILE_FIELDS[self.kind]}
+
+
+def _scope_table(store: DeliveryStore, kind: str, season: int | None) -> pd.DataFrame:
+    entity = _ENTITY[kind]
+    return summary_table(store, kind, (entity,) if season is None else (entity, "season"))
+
+
+def _season_rows(store: DeliveryStore, kind: str, season: int | None) -> pd.DataFrame:
+    table = _scope_table(store, kind, season)
+    if season is None:
+        return table
+    return table[table.index.get_level_values("season") == season]
+
+
+def percentile_table(store: DeliveryStore, kind: str, season: int | None = None, min_innings: int = 0) -> PercentileTable:
+    """Return the percentile table, building it on first use."""
+    cache_key = ("percentiles", kind, season, min_innings)
+    table = store.cache.get(cache_key)
+    if table is None:
+        rows = _season_rows(store, kind, season)
+        table = PercentileTable(kind, rows[rows["innings"] >= min_innings])
+        store.cache[cache_key] = table
+    return table
+
+
+def entity_percentiles(store: DeliveryStore, kind: str, name: str, season: int | None = None, min_innings: int = 0) -> dict:
+    """
+    Percentiles of one batter or bowler against the qualified league.
+
+    Args:
+        store: Loaded delivery store
+        kind: "batting" or "bowling"
+        name: Player name
+        season: Season to rank within (career if None)
+        min_innings: Innings needed to be part of the population
+
+    Returns:
+        Payload with the population size, whether the player qualifies, the
+        player's stats in scope (summary fields plus ``mom``) and one
+        percentile per field
+
+    Raises:
+        UnknownEntityError: If the player has no innings in scope
+    """
+    key = name if season is None else (name, season)
+    try:
+        row = _records(_scope_table(store, kind, season).loc[[key]])[0]
+    except KeyError:
+        scope = f" in {season}" if season is not None else ""
+        raise UnknownEntityError(f"No {kind} innings for {name}{scope}") from None
+    awards = partial_aggregates(store, "awards").fold(None if season is None else [season])["mom"]
+    code = store.player_code(name)
+    table = percentile_table(store, kind, season, min_innings)
+    return {
+        _ENTITY[kind]: name,
+        "season": season,
+        "min_innings": min_innings,
+        "qualified": bool(row["innings"] >= min_innings),
+        "population": table.size,
+        "stats": {**row, "mom": 0 if code is None else int(awards[code])},
+        "percentiles": table.percentiles(row),
+    }
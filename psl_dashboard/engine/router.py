@@ -0,0 +1,168 @@
+"""
+PSL Analytics Hub - Local Router
+================================
+Map API endpoints to local payload builders so ``fetch_api`` can answer
+requests without a network round trip.
+"""
+from __future__ import annotations
+
+import re
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from . import leaderboards, payloads, percentiles, similarity
+from .store import DeliveryStore
+
+DEFAULT_LIMIT = 10
+
+
+class EndpointNotSupported(LookupError):
+    """Raised for endpoints the local engine cannot answer."""
+
+
+class BadRequestError(ValueError):
+    """Raised for invalid query parameters (the API answers these with HTTP 400)."""
+
+
+def _parse_int(value, key: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BadRequestError(f"{key} must be an integer, got {value!r}") from None
+
+
+def _limit(query: dict) -> int:
+    return max(1, _parse_int(query.get("limit", DEFAULT_LIMIT), "limit"))
+
+
+def _many(value) -> list[str]:
+    """Query values given as a list or a comma-separated string."""
+    if value in (None, ""):
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+def _int(query: dict, key: str, default: int = 0) -> int:
+    return max(0, _parse_int(query.get(key, default), key))
+
+
+def _leaderboard(store: DeliveryStore, query: dict) -> list[dict]:
+    metric = query.get("metric", "runs")
+    if metric not in leaderboards.LEADERBOARD_METRICS:
+        raise BadRequestError(f"Unknown leaderboard metric: {metric}")
+    seasons = [_parse_int(season, "season") for season in _many(query.get("season"))]
+    return leaderboards.top_k(
+        store,
+        metric,
+        k=_limit(query),
+        seasons=seasons,
+        teams=_many(query.get("team")),
+        min_balls=_int(query, "min_balls"),
+        min_innings=_int(query, "min_innings"),
+    )
+
+
+def _percentiles(store: DeliveryStore, query: dict, kind: str, name: str) -> dict:
+    season = _parse_int(query["season"], "season") if query.get("season") not in (None, "") else None
+    return percentiles.entity_percentiles(store, kind, name, season, _int(query, "min_innings"))
+
+
+def _similar(store: DeliveryStore, query: dict, kind: str, name: str) -> list[dict]:
+    min_innings = _int(query, "min_innings", similarity.DEFAULT_MIN_INNINGS)
+    return similarity.similar_players(store, kind, name, _limit(query), min_innings)
+
+
+# (method, path pattern, handler(store, query, body, **path_params))
+_ROUTES = [
+    ("GET", r"/", lambda s, q, b: {"message": "PSL Analytics Hub (local data source)"}),
+    ("GET", r"/health", lambda s, q, b: {"status": "ok", "source": "local"}),
+    ("GET", r"/players", lambda s, q, b: s.batter_names()),
+    ("GET", r"/bowlers", lambda s, q, b: s.bowler_names()),
+    ("GET", r"/teams", lambda s, q, b: [str(team) for team in s.teams]),
+    ("GET", r"/seasons", lambda s, q, b: leaderboards.season_list(s)),
+    ("GET", r"/leaderboards", lambda s, q, b: _leaderboard(s, q)),
+    ("GET", r"/players/top", lambda s, q, b: payloads.top_run_scorers(s, _limit(q))),
+    ("GET", r"/players/top-sixes", lambda s, q, b: payloads.top_six_hitters(s, _limit(q))),
+    ("GET", r"/players/top-fours", lambda s, q, b: payloads.top_four_hitters(s, _limit(q))),
+    ("GET", r"/players/top-catches", lambda s, q, b: payloads.top_catches(s, _limit(q))),
+    ("GET", r"/players/top-mom", lambda s, q, b: payloads.top_player_of_match(s, _limit(q))),
+    ("GET", r"/bowlers/top", lambda s, q, b: payloads.top_wicket_takers(s, _limit(q))),
+    ("GET", r"/teams/top-totals", lambda s, q, b: payloads.top_team_totals(s, _limit(q))),
+    ("GET", r"/teams/top-chases", lambda s, q, b: payloads.top_team_chases(s, _limit(q))),
+    ("POST", r"/players/compare", lambda s, q, b: payloads.compare_players(s, b.get("players", []))),
+    ("POST", r"/bowlers/compare", lambda s, q, b: payloads.compare_bowlers(s, b.get("bowlers", []))),
+    ("POST", r"/teams/compare", lambda s, q, b: payloads.compare_teams(s, b.get("teams", []))),
+    ("GET", r"/players/(?P<name>[^/]+)/stats", lambda s, q, b, name: payloads.player_stats(s, name)),
+    (
+        "GET",
+        r"/players/(?P<name>[^/]+)/percentiles",
+        lambda s, q, b, name: _percentiles(s, q, "batting", name),
+    ),
+    ("GET", r"/players/(?P<name>[^/]+)/similar", lambda s, q, b, name: _similar(s, q, "batting", name)),
+    ("GET", r"/players/(?P<name>[^/]+)/growth", lambda s, q, b, name: payloads.player_growth(s, name)),
+    (
+        "GET",
+        r"/players/(?P<name>[^/]+)/vs-team/(?P<team>[^/]+)",
+        lambda s, q, b, name, team: payloads.player_vs_team(s, name, team),
+    ),
+    (
+        "GET",
+        r"/players/(?P<batter>[^/]+)/vs-bowler/(?P<bowler>[^/]+)",
+        lambda s, q, b, batter, bowler: payloads.batter_vs_bowler(s, batter, bowler),
+    ),
+    ("GET", r"/players/(?P<name>[^/]+)/vs-bowlers", lambda s, q, b, name: payloads.batter_matchups(s, name)),
+    ("GET", r"/bowlers/(?P<name>[^/]+)/vs-batters", lambda s, q, b, name: payloads.bowler_matchups(s, name)),
+    (
+        "GET",
+        r"/bowlers/(?P<name>[^/]+)/percentiles",
+        lambda s, q, b, name: _percentiles(s, q, "bowling", name),
+    ),
+    ("GET", r"/bowlers/(?P<name>[^/]+)/similar", lambda s, q, b, name: _similar(s, q, "bowling", name)),
+    ("GET", r"/bowlers/(?P<name>[^/]+)/stats", lambda s, q, b, name: payloads.bowler_stats(s, name)),
+    ("GET", r"/teams/(?P<name>[^/]+)/stats", lambda s, q, b, name: payloads.team_stats(s, name)),
+    ("GET", r"/teams/(?P<name>[^/]+)/all", lambda s, q, b, name: payloads.team_squad(s, name)),
+    (
+        "GET",
+        r"/teams/(?P<team_a>[^/]+)/vs/(?P<team_b>[^/]+)",
+        lambda s, q, b, team_a, team_b: payloads.team_head_to_head(s, team_a, team_b),
+    ),
+]
+
+_COMPILED_ROUTES = [(method, re.compile(pattern), handler) for method, pattern, handler in _ROUTES]
+
+
+def handle_request(
+    store: DeliveryStore,
+    endpoint: str,
+    method: str = "GET",
+    params: dict | None = None,
+    json_data: dict | None = None,
+):
+    """
+    Answer an API endpoint from the local store.
+
+    Args:
+        store: Loaded delivery store
+        endpoint: Endpoint path, optionally with a query string
+        method: HTTP method
+        params: Query parameters
+        json_data: Request body for POST endpoints
+
+    Raises:
+        EndpointNotSupported: If no local handler exists
+        BadRequestError: If a query parameter is invalid
+        UnknownEntityError: If the requested player/bowler/team is unknown
+    """
+    parts = urlsplit(endpoint)
+    query = dict(parse_qsl(parts.query))
+    query.update(params or {})
+    path = "/" + parts.path.strip("/")
+    method = method.upper()
+
+    for route_method, pattern, handler in _COMPILED_ROUTES:
+        match = pattern.fullmatch(path)
+        if match and route_method == method:
+            path_params = {key: unquote(value) for key, value in match.groupdict().items()}
+            return handler(store, query, json_data or {}, **path_params)
+    raise EndpointNotSupported(f"{method} {path} is not available from the local data source")
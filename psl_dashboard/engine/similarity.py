@@ -0,0 +1,128 @@
+"""
+PSL Analytics Hub - Similar Players
+===================================
+k-nearest-neighbour search over standardized per-player stat vectors.
+
+Feature matrices are built once per (kind, qualifier) from the career summary
+tables and memoized on the store, so they are rebuilt only when the data
+changes. A query is one vectorized distance computation plus
+``np.argpartition``; at league scale (hundreds of players, under ten
+features) a brute-force scan beats a tree index.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .payloads import UnknownEntityError, summary_table
+from .store import DeliveryStore
+
+# Minimum innings for a player to be part of the searchable population
+DEFAULT_MIN_INNINGS = 5
+
+# Feature name -> function of the career summary table, per kind
+SIMILARITY_FEATURES = {
+    "batting": {
+        "runs_per_innings": lambda t: t["runs"] / t["innings"],
+        "average": lambda t: t["avg"],
+        "strike_rate": lambda t: t["strikeRate"],
+        "boundary_pct": lambda t: 100 * (4 * t["fours"] + 6 * t["sixes"]) / t["runs"],
+        "sixes_per_innings": lambda t: t["sixes"] / t["innings"],
+        "balls_per_innings": lambda t: t["balls"] / t["innings"],
+        "milestone_rate": lambda t: (t["fifties"] + t["hundreds"]) / t["innings"],
+    },
+    "bowling": {
+        "economy": lambda t: t["economy"],
+        "average": lambda t: t["average"],
+        "strike_rate": lambda t: t["strikeRate"],
+        "wickets_per_innings": lambda t: t["wicket"] / t["innings"],
+        "balls_per_innings": lambda t: t["balls"] / t["innings"],
+        "boundary_pct": lambda t: 100 * (t["fours"] + t["sixes"]) / t["balls"],
+        "three_w_rate": lambda t: t["three_w"] / t["innings"],
+    },
+}
+
+_ENTITY = {"batting": "batter", "bowling": "bowler"}
+
+
+def _features(table: pd.DataFrame, kind: str) -> pd.DataFrame:
+    columns = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name, feature in SIMILARITY_FEATURES[kind].items():
+            columns[name] = pd.to_numeric(feature(table), errors="coerce").astype(np.float64)
+    return pd.DataFrame(columns, index=table.index).replace([np.inf, -np.inf], np.nan)
+
+
+class SimilarityIndex:
+    """Standardized feature matrix of the qualified players of one kind."""
+
+    def __init__(self, kind: str, table: pd.DataFrame, min_innings: int):
+        self.kind = kind
+        self.min_innings = min_innings
+        self.features = _features(table, kind)
+        population = self.features[table["innings"] >= min_innings]
+        # Missing rates (e.g. no dismissals) sit at the population median
+        self.center = population.median()
+        filled = population.fillna(self.center)
+        self.mean = filled.mean().to_numpy()
+        self.scale = filled.std(ddof=0).replace(0, 1).fillna(1).to_numpy()
+        self.names = filled.index
+        self.matrix = ((filled.to_numpy() - self.mean) / self.scale).astype(np.float32)
+
+    def vector(self, name: str) -> np.ndarray:
+        raw = self.features.loc[name].fillna(self.center).to_numpy()
+        return ((raw - self.mean) / self.scale).astype(np.float32)
+
+    def query(self, name: str, k: int = 5) -> list[tuple[str, float]]:
+        """The ``k`` nearest qualified players to ``name`` (excluding itself)."""
+        if not len(self.names):
+            return []
+        distances = np.sqrt(((self.matrix - self.vector(name)) ** 2).sum(axis=1))
+        self_pos = self.names.get_indexer([name])[0]
+        if self_pos >= 0:
+            distances[self_pos] = np.inf
+        k = min(k, int(np.isfinite(distances).sum()))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return [(str(self.names[i]), float(distances[i])) for i in nearest]
+
+
+def similarity_index(store: DeliveryStore, kind: str, min_innings: int = DEFAULT_MIN_INNINGS) -> SimilarityIndex:
+    """Return the similarity index, building it on first use."""
+    cache_key = ("similarity", kind, min_innings)
+    index = store.cache.get(cache_key)
+    if index is None:
+        index = SimilarityIndex(kind, summary_table(store, kind, (_ENTITY[kind],)), min_innings)
+        store.cache[cache_key] = index
+    return index
+
+
+def similar_players(store: DeliveryStore, kind: str, name: str, limit: int = 5, min_innings: int = DEFAULT_MIN_INNINGS) -> list[dict]:
+    """
+    Players with the most similar career profile.
+
+    Args:
+        store: Loaded delivery store
+        kind: "batting" or "bowling"
+        name: Player to match
+        limit: Number of neighbours
+        min_innings: Innings needed to be a candidate
+
+    Returns:
+        Records with the neighbour, its distance and its feature values
+
+    Raises:
+        UnknownEntityError: If the player has no innings of this kind
+    """
+    index = similarity_index(store, kind, min_innings)
+    if name not in index.features.index:
+        raise UnknownEntityError(f"No {kind} innings for {name}")
+    records = []
+    for neighbour, distance in index.query(name, limit):
+        features = index.features.loc[neighbour].round(2)
+        record = {_ENTITY[kind]: neighbour, "distance": round(distance, 3)}
+        record.update({key: (None if value != value else float(value)) for key, value in features.items()})
+        records.append(record)
+    return records
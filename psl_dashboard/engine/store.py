@@ -0,0 +1,512 @@
+"""
+PSL Analytics Hub - Delivery Store
+==================================
+Columnar in-memory store of PSL ball-by-ball data.
+
+Player and team names are stored as categoricals sharing one category set
+per kind, so a player's integer code is the same whether they appear as
+batter, bowler, fielder or player of the match. Innings-level batting and
+bowling tables are aggregated once at load time; league-wide summaries are
+built from them on first use, so per-request payloads are index lookups.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Columns every dataset must provide (after alias renaming)
+REQUIRED_COLUMNS = (
+    "match_id",
+    "season",
+    "inning",
+    "batting_team",
+    "bowling_team",
+    "batter",
+    "bowler",
+    "batsman_runs",
+)
+
+# Common alternative column names found in ball-by-ball exports
+COLUMN_ALIASES = {
+    "id": "match_id",
+    "match_no": "match_id",
+    "innings": "inning",
+    "year": "season",
+    "striker": "batter",
+    "batsman": "batter",
+    "runs_off_bat": "batsman_runs",
+    "batter_runs": "batsman_runs",
+    "extras": "extra_runs",
+    "extra_type": "extras_type",
+    "wicket_type": "dismissal_kind",
+    "fielders": "fielder",
+    "fielders_involved": "fielder",
+    "match_winner": "winner",
+    "player_of_the_match": "player_of_match",
+}
+
+PLAYER_COLUMNS = ("batter", "bowler", "non_striker", "player_dismissed", "fielder", "player_of_match")
+TEAM_COLUMNS = ("batting_team", "bowling_team", "winner")
+
+WIDE_EXTRAS = frozenset({"wides", "wide"})
+NO_BALL_EXTRAS = frozenset({"noballs", "noball", "no ball"})
+
+# Dismissals not credited to the bowler / not counted as a batter's out
+NON_BOWLER_DISMISSALS = frozenset({"run out", "retired hurt", "retired out", "obstructing the field"})
+NOT_OUT_DISMISSALS = frozenset({"retired hurt"})
+CATCH_DISMISSALS = frozenset({"caught", "caught and bowled"})
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """Read a raw CSV or Parquet deliveries file."""
+    if path.suffix.lower() in (".parquet", ".pq"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, low_memory=False)
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """Strip text values and turn blanks into missing values."""
+    cleaned = series.astype("string").str.strip()
+    return cleaned.mask(cleaned.eq("") | cleaned.str.lower().isin(["nan", "none", "na"]))
+
+
+def normalize_deliveries(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rename, validate and type a raw ball-by-ball frame.
+
+    Args:
+        raw: Deliveries as read from CSV/Parquet
+
+    Returns:
+        Frame with canonical columns, categorical names and derived flags
+
+    Raises:
+        ValueError: If required columns are missing
+    """
+    df = raw.rename(columns=lambda c: str(c).strip().lower()).rename(columns=COLUMN_ALIASES)
+    df = df.loc[:, ~df.columns.duplicated()]
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Dataset is missing required columns: {', '.join(missing)}")
+
+    out = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    out["match_id"] = df["match_id"].astype(str).to_numpy()
+    out["match_code"] = pd.factorize(out["match_id"])[0].astype(np.int32)
+    out["season"] = pd.to_numeric(df["season"].astype(str).str[:4], errors="coerce").fillna(0).astype(np.int16).to_numpy()
+    out["inning"] = pd.to_numeric(df["inning"], errors="coerce").fillna(1).astype(np.int8).to_numpy()
+    for column in ("date", "stage"):
+        out[column] = _text(df[column]).to_numpy() if column in df.columns else pd.NA
+
+    batsman_runs = pd.to_numeric(df["batsman_runs"], errors="coerce").fillna(0).astype(np.int16)
+    extra_runs = pd.to_numeric(df.get("extra_runs", 0), errors="coerce")
+    extra_runs = pd.Series(extra_runs, index=df.index).fillna(0).astype(np.int16)
+    out["batsman_runs"] = batsman_runs.to_numpy()
+    out["extra_runs"] = extra_runs.to_numpy()
+    if "total_runs" in df.columns:
+        out["total_runs"] = pd.to_numeric(df["total_runs"], errors="coerce").fillna(0).astype(np.int16).to_numpy()
+    else:
+        out["total_runs"] = (batsman_runs + extra_runs).to_numpy()
+
+    extras_type = _text(df["extras_type"]).str.lower().fillna("") if "extras_type" in df.columns else pd.Series("", index=df.index)
+    dismissal = _text(df["dismissal_kind"]).str.lower().fillna("") if "dismissal_kind" in df.columns else pd.Series("", index=df.index)
+
+    players = {column: _text(df[column]) if column in df.columns else pd.Series(pd.NA, index=df.index, dtype="string") for column in PLAYER_COLUMNS}
+    teams = {column: _text(df[column]) if column in df.columns else pd.Series(pd.NA, index=df.index, dtype="string") for column in TEAM_COLUMNS}
+
+    player_categories = pd.Index(sorted(set().union(*(s.dropna().unique() for s in players.values()))))
+    team_categories = pd.Index(sorted(set().union(*(s.dropna().unique() for s in teams.values()))))
+    for column, series in players.items():
+        out[column] = pd.Categorical(series, categories=player_categories)
+    for column, series in teams.items():
+        out[column] = pd.Categorical(series, categories=team_categories)
+
+    if "is_wicket" in df.columns:
+        is_wicket = pd.to_numeric(df["is_wicket"], errors="coerce").fillna(0).astype(bool)
+    else:
+        is_wicket = players["player_dismissed"].notna()
+
+    is_wide = extras_type.isin(WIDE_EXTRAS)
+    is_no_ball = extras_type.isin(NO_BALL_EXTRAS)
+    out["is_wide"] = is_wide.to_numpy()
+    out["is_legal"] = (~is_wide & ~is_no_ball).to_numpy()
+    out["dismissal_kind"] = pd.Categorical(dismissal)
+    out["is_wicket"] = is_wicket.to_numpy()
+    out["bowler_wicket"] = (is_wicket & ~dismissal.isin(NON_BOWLER_DISMISSALS)).to_numpy()
+    out["bowler_runs"] = np.where(is_wide | is_no_ball, batsman_runs + extra_runs, batsman_runs).astype(np.int16)
+    out["is_four"] = (batsman_runs == 4).to_numpy()
+    out["is_six"] = (batsman_runs == 6).to_numpy()
+    return out
+
+
+def load_deliveries(path: str | Path) -> pd.DataFrame:
+    """Load and normalize a ball-by-ball CSV or Parquet file."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Local dataset not found: {path}")
+    return normalize_deliveries(read_frame(path))
+
+
+def flag_finals(matches: pd.DataFrame) -> pd.DataFrame:
+    """Set ``is_final`` from the stage column, or each season's last match without one."""
+    matches = matches.copy()
+    stage = matches["stage"].astype("string").str.lower()
+    if stage.notna().any():
+        matches["is_final"] = stage.eq("final").fillna(False).to_numpy()
+    else:
+        order = matches.sort_values(["season", "date", "match_code"], na_position="first")
+        last = order.groupby("season").tail(1).index
+        matches["is_final"] = matches.index.isin(last)
+    return matches
+
+
+def _aligned(frame: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """Recode categorical columns of ``frame`` onto ``dtypes`` (codes are reused when only categories were appended)."""
+    updates = {}
+    for column, dtype in dtypes.items():
+        values = frame[column]
+        categories = values.cat.categories
+        if categories.equals(dtype.categories):
+            continue
+        if dtype.categories[: len(categories)].equals(categories):
+            updates[column] = pd.Categorical.from_codes(values.array.codes, dtype=dtype, validate=False)
+        else:
+            updates[column] = values.cat.set_categories(dtype.categories)
+    return frame.assign(**updates) if updates else frame
+
+
+class ChunkedFrame:
+    """
+    Append-only frame kept as a list of chunks.
+
+    Appending never copies earlier rows. The union of the chunks is built
+    on first use and replaces them, so later appends start from one chunk
+    again. Categorical columns are recoded onto categories extended in
+    chunk order, which is the shared category set when names are only ever
+    appended (see :mod:`.ingest`).
+    """
+
+    def __init__(self, chunks: list[pd.DataFrame]):
+        offsets = np.cumsum([0, *(len(chunk) for chunk in chunks)])
+        # Swapped as one reference so readers never see chunks and offsets out of step
+        self._parts = (list(chunks), offsets)
+        self._dtypes: dict | None = None
+
+    def __len__(self) -> int:
+        return int(self._parts[1][-1])
+
+    @property
+    def chunks(self) -> list[pd.DataFrame]:
+        return self._parts[0]
+
+    def append(self, chunk: pd.DataFrame) -> "ChunkedFrame":
+        """Return a new frame with ``chunk`` appended; this one is unchanged."""
+        return ChunkedFrame([*self.chunks, chunk])
+
+    def dtypes(self) -> dict:
+        """Categorical dtype of each column that is categorical in every chunk."""
+        if self._dtypes is None:
+            chunks = self.chunks
+            dtypes = {}
+            for column, values in chunks[0].items():
+                if not isinstance(values.dtype, pd.CategoricalDtype):
+                    continue
+                if not all(isinstance(chunk[column].dtype, pd.CategoricalDtype) for chunk in chunks[1:]):
+                    continue
+                categories = values.cat.categories
+                for chunk in chunks[1:]:
+                    categories = categories.append(chunk[column].cat.categories.difference(categories, sort=False))
+                dtypes[column] = pd.CategoricalDtype(categories)
+            self._dtypes = dtypes
+        return self._dtypes
+
+    def frame(self) -> pd.DataFrame:
+        """All rows as one frame with a ``RangeIndex``."""
+        chunks, offsets = self._parts
+        if len(chunks) == 1:
+            return chunks[0]
+        dtypes = self.dtypes()
+        union = pd.concat([_aligned(chunk, dtypes) for chunk in chunks], ignore_index=True)
+        self._parts = ([union], offsets[[0, -1]])
+        return union
+
+    def take(self, positions) -> pd.DataFrame:
+        """Rows at ascending ``positions`` without building the union, indexed by position."""
+        positions = np.asarray(positions, dtype=np.int64)
+        chunks, offsets = self._parts
+        if len(chunks) == 1:
+            return chunks[0].iloc[positions].set_axis(positions)
+        dtypes = self.dtypes()
+        which = np.searchsorted(offsets, positions, side="right") - 1
+        pieces = [
+            _aligned(chunks[i].iloc[positions[which == i] - offsets[i]], dtypes)
+            for i in np.unique(which)
+        ] or [_aligned(chunks[0].iloc[:0], dtypes)]
+        return pd.concat(pieces).set_axis(positions)
+
+
+class FinalsIndex:
+    """
+    Which matches are finals, kept so new matches can be added without
+    re-sorting the league (same rule as :func:`flag_finals`).
+
+    Once any match has a stage, finals are the matches staged "final".
+    Otherwise each season's last match is its final, ordered by date
+    (missing dates first) and then match code.
+    """
+
+    def __init__(self, staged: bool, stage_finals: frozenset, season_last: dict):
+        self.staged = staged
+        self.stage_finals = stage_finals
+        self.season_last = season_last
+        self.codes = stage_finals if staged else frozenset(key[-1] for key in season_last.values())
+
+    @classmethod
+    def from_matches(cls, matches: pd.DataFrame) -> "FinalsIndex":
+        stage = matches["stage"].astype("string").str.lower()
+        codes = matches["match_code"].to_numpy()
+        order = matches.sort_values(["season", "date", "match_code"], na_position="first")
+        last = order.groupby("season").tail(1)
+        return cls(
+            staged=bool(stage.notna().any()),
+            stage_finals=frozenset(int(code) for code in codes[stage.eq("final").fillna(False).to_numpy()]),
+            season_last={
+                int(season): (int(pd.notna(date)), "" if pd.isna(date) else str(date), int(code))
+                for season, date, code in zip(last["season"], last["date"], last["match_code"])
+            },
+        )
+
+    def merge(self, other: "FinalsIndex") -> "FinalsIndex":
+        """Finals of both sets of matches together (``other`` holds the later match codes)."""
+        season_last = dict(self.season_last)
+        for season, key in other.season_last.items():
+            if season not in season_last or key > season_last[season]:
+                season_last[season] = key
+        return FinalsIndex(self.staged or other.staged, self.stage_finals | other.stage_finals, season_last)
+
+
+def _merge_positions(rows: dict, delta: dict, offset: int) -> dict:
+    """Extend a name -> ascending positions index with positions of appended rows."""
+    merged = dict(rows)
+    for name, positions in delta.items():
+        positions = positions + offset
+        merged[name] = np.concatenate([rows[name], positions]) if name in rows else positions
+    return merged
+
+
+class DeliveryStore:
+    """
+    Deliveries plus innings- and match-level aggregates built once at load.
+
+    The frames are :class:`ChunkedFrame` so :meth:`extend` can append new
+    matches without copying the history. A match's position in
+    :attr:`matches` is its ``match_code``.
+    """
+
+    def __init__(
+        self,
+        deliveries: pd.DataFrame | ChunkedFrame,
+        matches: pd.DataFrame | ChunkedFrame | None = None,
+        batting: pd.DataFrame | ChunkedFrame | None = None,
+        bowling: pd.DataFrame | ChunkedFrame | None = None,
+        row_index: tuple[dict, dict] | None = None,
+        finals: FinalsIndex | None = None,
+    ):
+        self._deliveries = deliveries if isinstance(deliveries, ChunkedFrame) else ChunkedFrame([deliveries])
+        # The newest chunk carries the full category sets
+        newest = self._deliveries.chunks[-1]
+        self.players = newest["batter"].cat.categories
+        self.teams = newest["batting_team"].cat.categories
+        if matches is None:
+            matches = self._build_matches()
+        self._matches = matches if isinstance(matches, ChunkedFrame) else ChunkedFrame([matches])
+        self.finals = FinalsIndex.from_matches(self._matches.frame()) if finals is None else finals
+        self._flagged_matches: pd.DataFrame | None = None
+        self._team_index: dict | None = None
+        self._batting = self._as_chunked(batting, self._build_batting_innings)
+        self._bowling = self._as_chunked(bowling, self._build_bowling_innings)
+        if row_index is None:
+            row_index = (
+                self.batting.groupby("batter", observed=True).indices,
+                self.bowling.groupby("bowler", observed=True).indices,
+            )
+        self._batting_rows, self._bowling_rows = row_index
+        # League-wide summary tables memoized by the payload builders
+        self.cache: dict = {}
+
+    @staticmethod
+    def _as_chunked(frame, build) -> ChunkedFrame:
+        if isinstance(frame, ChunkedFrame):
+            return frame
+        return ChunkedFrame([build() if frame is None else frame])
+
+    @classmethod
+    def from_path(cls, path: str | Path) -> "DeliveryStore":
+        return cls(load_deliveries(path))
+
+    @property
+    def deliveries(self) -> pd.DataFrame:
+        return self._deliveries.frame()
+
+    @property
+    def batting(self) -> pd.DataFrame:
+        return self._batting.frame()
+
+    @property
+    def bowling(self) -> pd.DataFrame:
+        return self._bowling.frame()
+
+    @property
+    def matches(self) -> pd.DataFrame:
+        """One row per match, in match code order, with ``is_final`` set."""
+        matches = self._flagged_matches
+        if matches is None:
+            matches = self._with_finals(self._matches.frame())
+            self._flagged_matches = matches
+        return matches
+
+    @property
+    def match_count(self) -> int:
+        return len(self._matches)
+
+    def _with_finals(self, matches: pd.DataFrame) -> pd.DataFrame:
+        return matches.assign(is_final=matches["match_code"].isin(list(self.finals.codes)).to_numpy())
+
+    def loaded_matches(self, match_ids) -> list[str]:
+        """Those of ``match_ids`` that are already in the store."""
+        wanted = pd.Index(match_ids).astype(str)
+        found = set()
+        for chunk in self._matches.chunks:
+            ids = chunk["match_id"].astype(str)
+            found.update(ids[ids.isin(wanted)])
+        return sorted(found)
+
+    def team_index(self) -> dict[str, np.ndarray]:
+        """Team -> codes of the matches it played, built on first use."""
+        index = self._team_index
+        if index is None:
+            m = self.matches
+            teams = np.concatenate([m["team1"].astype(str).to_numpy(), m["team2"].astype(str).to_numpy()])
+            codes = np.tile(m["match_code"].to_numpy(), 2)
+            index = {team: np.unique(codes[positions]) for team, positions in pd.Series(teams).groupby(teams).indices.items()}
+            self._team_index = index
+        return index
+
+    def team_match_rows(self, teams) -> pd.DataFrame:
+        """Match rows (with ``is_final``) of the matches any of ``teams`` played."""
+        index = self.team_index()
+        codes = [index[team] for team in teams if team in index]
+        codes = np.unique(np.concatenate(codes)) if codes else np.array([], dtype=np.int64)
+        return self._with_finals(self._matches.take(codes))
+
+    def extend(self, delta: "DeliveryStore") -> "DeliveryStore":
+        """
+        Return a new store with the matches of ``delta`` appended.
+
+        ``delta`` must use this store's category sets extended by appending,
+        and match codes continuing from :attr:`match_count`. Neither store
+        is modified and no earlier rows are copied; :attr:`cache` starts
+        empty.
+        """
+        extended = DeliveryStore(
+            self._deliveries.append(delta.deliveries),
+            matches=self._matches.append(delta._matches.frame()),
+            batting=self._batting.append(delta.batting),
+            bowling=self._bowling.append(delta.bowling),
+            row_index=(
+                _merge_positions(self._batting_rows, delta._batting_rows, len(self._batting)),
+                _merge_positions(self._bowling_rows, delta._bowling_rows, len(self._bowling)),
+            ),
+            finals=self.finals.merge(delta.finals),
+        )
+        if self._team_index is not None:
+            extended._team_index = _merge_positions(self._team_index, delta.team_index(), 0)
+        return extended
+
+    def player_code(self, name: str) -> int | None:
+        code = self.players.get_indexer([name])[0]
+        return None if code < 0 else int(code)
+
+    def team_code(self, name: str) -> int | None:
+        code = self.teams.get_indexer([name])[0]
+        return None if code < 0 else int(code)
+
+    def batting_rows(self, name: str) -> pd.DataFrame:
+        """Innings rows for a batter (empty if unknown)."""
+        return self._batting.take(self._batting_rows.get(name, []))
+
+    def bowling_rows(self, name: str) -> pd.DataFrame:
+        """Innings rows for a bowler (empty if unknown)."""
+        return self._bowling.take(self._bowling_rows.get(name, []))
+
+    def batter_names(self) -> list[str]:
+        return sorted(self._batting_rows)
+
+    def bowler_names(self) -> list[str]:
+        return sorted(self._bowling_rows)
+
+    def _build_matches(self) -> pd.DataFrame:
+        d = self.deliveries
+        first = d.sort_values(["match_code", "inning"], kind="stable").groupby("match_code", sort=True).head(1)
+        matches = pd.DataFrame({
+            "match_code": first["match_code"].to_numpy(),
+            "match_id": first["match_id"].to_numpy(),
+            "season": first["season"].to_numpy(),
+            "date": first["date"].to_numpy(),
+            "stage": first["stage"].to_numpy(),
+            "team1": first["batting_team"].to_numpy(),
+            "team2": first["bowling_team"].to_numpy(),
+            "winner": first["winner"].to_numpy(),
+            "player_of_match": first["player_of_match"].to_numpy(),
+        })
+        return flag_finals(matches)
+
+    def _build_batting_innings(self) -> pd.DataFrame:
+        d = self.deliveries
+        keys = ["match_code", "inning", "batter"]
+        innings = (
+            d.assign(faced=~d["is_wide"])
+            .groupby(keys, observed=True, sort=False)
+            .agg(
+                runs=("batsman_runs", "sum"),
+                balls=("faced", "sum"),
+                fours=("is_four", "sum"),
+                sixes=("is_six", "sum"),
+                season=("season", "first"),
+                batting_team=("batting_team", "first"),
+                bowling_team=("bowling_team", "first"),
+            )
+            .reset_index()
+        )
+        dismissed = d[d["player_dismissed"].notna() & ~d["dismissal_kind"].isin(NOT_OUT_DISMISSALS)]
+        outs = dismissed.groupby(["match_code", "inning", "player_dismissed"], observed=True).size()
+        outs.index = outs.index.set_names(keys)
+        innings = innings.join(outs.rename("outs"), on=keys)
+        innings["out"] = innings["outs"].fillna(0).gt(0)
+        innings = innings.drop(columns="outs")
+        for column in ("runs", "balls", "fours", "sixes"):
+            innings[column] = innings[column].astype(np.int32)
+        innings["is_fifty"] = innings["runs"].between(50, 99)
+        innings["is_hundred"] = innings["runs"].ge(100)
+        return innings
+
+    def _build_bowling_innings(self) -> pd.DataFrame:
+        d = self.deliveries
+        innings = (
+            d.groupby(["match_code", "inning", "bowler"], observed=True, sort=False)
+            .agg(
+                runs=("bowler_runs", "sum"),
+                balls=("is_legal", "sum"),
+                wickets=("bowler_wicket", "sum"),
+                fours=("is_four", "sum"),
+                sixes=("is_six", "sum"),
+                season=("season", "first"),
+                batting_team=("batting_team", "first"),
+                bowling_team=("bowling_team", "first"),
+            )
+            .reset_index()
+        )
+        for column in ("runs", "balls", "wickets", "fours", "sixes"):
+            innings[column] = innings[column].astype(np.int32)
+        return innings
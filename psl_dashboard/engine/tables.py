@@ -0,0 +1,385 @@
+"""
+PSL Analytics Hub - Memory-mapped Stat Tables
+=============================================
+Build the engine's league-wide aggregates offline into fixed-width ``.npy``
+columns and memory-map them at startup.
+
+Every Streamlit process that maps the same build shares one set of physical
+pages through the OS page cache instead of re-aggregating and holding its
+own copy. A build also holds the store's own frames (deliveries, matches
+and the innings-level batting and bowling tables), so a process with a
+usable build never parses the dataset: :func:`load_store` assembles the
+whole store from mapped columns. Text columns are dictionary-encoded
+(integer codes plus a fixed-width unicode dictionary) so every file stays
+fixed-width. Categorical columns keep their codes mapped; other text columns
+are decoded on load.
+
+Layout::
+
+    <out>/CURRENT                 name of the published build
+    <out>/<build>/manifest.json   source fingerprint and table metadata
+    <out>/<build>/<table>/<column>.npy
+    <out>/<build>/store/<frame>/<column>.npy
+
+A build is written to a fresh directory and published by atomically
+replacing ``CURRENT``; readers never see a half-written build.
+
+Usage:
+    python -m psl_dashboard.engine.tables --data Data/PSL.csv --out Data/tables
+    python -m psl_dashboard.engine.tables --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..config import LOCAL_DATA_PATH, LOCAL_TABLES_PATH
+from .leaderboards import PartialAggregates, partial_aggregates
+from .matchups import MatchupMatrix, matchup_matrix
+from .payloads import summary_table
+from .store import DeliveryStore
+
+FORMAT_VERSION = 2
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+KEEP_BUILDS = 2
+
+# table name -> (type, arguments); each maps onto one ``store.cache`` entry
+TABLE_SPECS = {
+    "batting_by_batter": ("summary", ("batting", ("batter",))),
+    "batting_by_batter_team": ("summary", ("batting", ("batter", "bowling_team"))),
+    "batting_by_batter_season": ("summary", ("batting", ("batter", "season"))),
+    "batting_by_batter_for_team": ("summary", ("batting", ("batter", "batting_team"))),
+    "batting_by_batter_for_team_season": ("summary", ("batting", ("batter", "batting_team", "season"))),
+    "bowling_by_bowler": ("summary", ("bowling", ("bowler",))),
+    "bowling_by_bowler_team": ("summary", ("bowling", ("bowler", "batting_team"))),
+    "bowling_by_bowler_season": ("summary", ("bowling", ("bowler", "season"))),
+    "bowling_by_bowler_for_team": ("summary", ("bowling", ("bowler", "bowling_team"))),
+    "bowling_by_bowler_for_team_season": ("summary", ("bowling", ("bowler", "bowling_team", "season"))),
+    "team_by_team": ("summary", ("team", ("team",))),
+    "team_by_team_opponent": ("summary", ("team", ("team", "opponent"))),
+    "team_by_team_season": ("summary", ("team", ("team", "season"))),
+    "partials_batting": ("partials", ("batting",)),
+    "partials_bowling": ("partials", ("bowling",)),
+    "partials_fielding": ("partials", ("fielding",)),
+    "partials_awards": ("partials", ("awards",)),
+    "matchups": ("matchups", ()),
+}
+
+# Store frames written with every build; text columns of the deliveries are stored as categoricals
+STORE_FRAMES = ("deliveries", "matches", "batting", "bowling")
+STORE_DIR = "store"
+
+# Store used by pool workers; inherited on fork, loaded by the initializer otherwise
+_WORKER_STORE: DeliveryStore | None = None
+
+
+def source_fingerprint(path: str | Path) -> dict:
+    """Identify a dataset file by path, size and modification time."""
+    stat = Path(path).stat()
+    return {"path": str(Path(path).resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _cache_key(table_type: str, args: tuple):
+    if table_type == "summary":
+        return ("summary", *args)
+    if table_type == "partials":
+        return ("partials", *args)
+    return "matchups"
+
+
+# ---------------------------------------------------------------------------
+# Column encoding
+# ---------------------------------------------------------------------------
+
+def _save_column(directory: Path, name: str, values) -> str:
+    """Write one column; returns its encoding ("plain", "categorical" or "dictionary")."""
+    if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+        categorical = values.array if isinstance(values, (pd.Series, pd.Index)) else values
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(categorical.codes))
+        np.save(directory / f"{name}.dict.npy", np.asarray([str(value) for value in categorical.categories], dtype=str))
+        return "categorical"
+    array = values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else np.asarray(values)
+    if array.dtype.kind in "biuf":
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(array))
+        return "plain"
+    codes, uniques = pd.factorize(pd.Series(array, dtype=object))
+    dictionary = np.asarray([str(value) for value in uniques], dtype=str)
+    np.save(directory / f"{name}.npy", codes.astype(np.int32))
+    np.save(directory / f"{name}.dict.npy", dictionary)
+    return "dictionary"
+
+
+def _load_column(directory: Path, name: str, encoding: str):
+    """
+    Map a plain column read-only, wrap mapped codes of a categorical column,
+    or decode a dictionary column to objects.
+    """
+    data = np.load(directory / f"{name}.npy", mmap_mode="r")
+    if encoding == "plain":
+        return data
+    if encoding == "categorical":
+        categories = pd.Index(np.load(directory / f"{name}.dict.npy").astype(object))
+        # validate=False keeps the mapped codes instead of copying them
+        return pd.Categorical.from_codes(data, dtype=pd.CategoricalDtype(categories), validate=False)
+    dictionary = np.load(directory / f"{name}.dict.npy").astype(object)
+    decoded = np.empty(len(data), dtype=object)
+    valid = data >= 0
+    decoded[valid] = dictionary[data[valid]]
+    decoded[~valid] = None
+    return decoded
+
+
+def _save_columns(directory: Path, columns: dict) -> dict[str, str]:
+    directory.mkdir(parents=True, exist_ok=True)
+    return {name: _save_column(directory, name, values) for name, values in columns.items()}
+
+
+def _load_columns(directory: Path, encodings: dict[str, str]) -> dict[str, np.ndarray]:
+    return {name: _load_column(directory, name, encoding) for name, encoding in encodings.items()}
+
+
+# ---------------------------------------------------------------------------
+# Table <-> columns
+# ---------------------------------------------------------------------------
+
+def _table_columns(store: DeliveryStore, table_type: str, args: tuple) -> dict:
+    if table_type == "summary":
+        kind, keys = args
+        return dict(summary_table(store, kind, keys).reset_index().items())
+    if table_type == "partials":
+        partials = partial_aggregates(store, *args)
+        columns = {"players": partials.players, "player": partials.player, "season": partials.season, "team": partials.team}
+        columns.update({f"sum_{name}": values for name, values in partials.sums.items()})
+        return columns
+    matrix = matchup_matrix(store)
+    return {"batters": matrix.batters, "bowlers": matrix.bowlers, "values": matrix.values}
+
+
+def _table_object(table_type: str, args: tuple, columns: dict[str, np.ndarray]):
+    if table_type == "summary":
+        _, keys = args
+        # copy=False keeps numeric columns backed by the shared mapping
+        frame = pd.DataFrame(columns, copy=False)
+        return frame.set_index(list(keys))
+    if table_type == "partials":
+        sums = {name[len("sum_"):]: values for name, values in columns.items() if name.startswith("sum_")}
+        return PartialAggregates(
+            players=pd.Index(columns["players"]),
+            player=columns["player"],
+            season=columns["season"],
+            team=columns["team"],
+            sums=sums,
+        )
+    return MatchupMatrix(pd.Index(columns["batters"]), pd.Index(columns["bowlers"]), columns["values"])
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def _init_worker(data_path: str):
+    global _WORKER_STORE
+    if _WORKER_STORE is None:
+        _WORKER_STORE = DeliveryStore.from_path(data_path)
+
+
+def _store_frame_columns(store: DeliveryStore, frame_name: str) -> dict:
+    frame = getattr(store, frame_name)
+    if frame_name == "deliveries":
+        # Per-delivery text (match id, date, stage) is mapped as categorical codes
+        return {name: values if pd.api.types.is_numeric_dtype(values) else values.astype("category") for name, values in frame.items()}
+    return dict(frame.items())
+
+
+def _build_store_frame(frame_name: str, build_dir: str) -> tuple[str, dict, float]:
+    """Write one of the store's frames in a pool worker."""
+    started = time.perf_counter()
+    columns = _store_frame_columns(_WORKER_STORE, frame_name)
+    encodings = _save_columns(Path(build_dir) / STORE_DIR / frame_name, columns)
+    return frame_name, encodings, time.perf_counter() - started
+
+
+def _build_table(name: str, build_dir: str) -> tuple[str, dict, float]:
+    """Aggregate and write one table in a pool worker."""
+    started = time.perf_counter()
+    table_type, args = TABLE_SPECS[name]
+    columns = _table_columns(_WORKER_STORE, table_type, args)
+    encodings = _save_columns(Path(build_dir) / name, columns)
+    return name, {"type": table_type, "args": json.loads(json.dumps(args)), "columns": encodings}, time.perf_counter() - started
+
+
+def publish_build(out_dir: Path, build_name: str):
+    """Point ``CURRENT`` at ``build_name`` atomically and prune old builds."""
+    pointer = out_dir / f"{CURRENT_FILE}.{os.getpid()}.tmp"
+    pointer.write_text(build_name)
+    os.replace(pointer, out_dir / CURRENT_FILE)
+
+    builds = sorted(p for p in out_dir.iterdir() if p.is_dir() and (p / MANIFEST_FILE).exists())
+    # Processes still mapping a pruned build keep their pages until they exit
+    for stale in builds[:-KEEP_BUILDS]:
+        if stale.name != build_name:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def build_tables(
+    data_path: str | Path,
+    out_dir: str | Path,
+    workers: int | None = None,
+    tables: list[str] | None = None,
+) -> dict:
+    """
+    Aggregate the dataset into memory-mappable tables using a process pool.
+
+    Args:
+        data_path: Ball-by-ball CSV or Parquet file
+        out_dir: Directory holding published builds
+        workers: Pool size (defaults to the CPU count)
+        tables: Subset of :data:`TABLE_SPECS` to build (all by default)
+
+    Returns:
+        The published manifest
+    """
+    global _WORKER_STORE
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    build_name = time.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+    build_dir = out_dir / build_name
+    build_dir.mkdir()
+
+    # Load once in the parent; forked workers inherit it without re-reading
+    _WORKER_STORE = DeliveryStore.from_path(data_path)
+    names = list(tables or TABLE_SPECS)
+    manifest = {
+        "version": FORMAT_VERSION,
+        "source": source_fingerprint(data_path),
+        "built_at": time.time(),
+        "store": {},
+        "tables": {},
+    }
+    timings = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(data_path),)) as pool:
+        frame_futures = [pool.submit(_build_store_frame, frame_name, str(build_dir)) for frame_name in STORE_FRAMES]
+        futures = [pool.submit(_build_table, name, str(build_dir)) for name in names]
+        for future in frame_futures:
+            frame_name, encodings, seconds = future.result()
+            manifest["store"][frame_name] = encodings
+            timings[f"{STORE_DIR}/{frame_name}"] = seconds
+        for future in futures:
+            name, entry, seconds = future.result()
+            manifest["tables"][name] = entry
+            timings[name] = seconds
+
+    (build_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    publish_build(out_dir, build_name)
+    manifest["timings"] = timings
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Load
+# ---------------------------------------------------------------------------
+
+def current_build(out_dir: str | Path) -> Path | None:
+    """Directory of the published build, or None if nothing is published."""
+    out_dir = Path(out_dir)
+    try:
+        build_name = (out_dir / CURRENT_FILE).read_text().strip()
+    except OSError:
+        return None
+    build_dir = out_dir / build_name
+    return build_dir if (build_dir / MANIFEST_FILE).exists() else None
+
+
+def _usable_build(out_dir: str | Path, data_path: str | Path | None) -> tuple[Path | None, dict]:
+    """Published build and its manifest, or (None, {}) if it cannot be used for ``data_path``."""
+    build_dir = current_build(out_dir)
+    if build_dir is None:
+        return None, {}
+    manifest = json.loads((build_dir / MANIFEST_FILE).read_text())
+    if manifest.get("version") != FORMAT_VERSION:
+        return None, {}
+    if data_path is not None and manifest.get("source") != source_fingerprint(data_path):
+        return None, {}
+    return build_dir, manifest
+
+
+def _load_cache(build_dir: Path, manifest: dict) -> dict:
+    cache = {}
+    for name, entry in manifest["tables"].items():
+        args = tuple(tuple(arg) if isinstance(arg, list) else arg for arg in entry["args"])
+        columns = _load_columns(build_dir / name, entry["columns"])
+        cache[_cache_key(entry["type"], args)] = _table_object(entry["type"], args, columns)
+    return cache
+
+
+def load_tables(out_dir: str | Path, data_path: str | Path | None = None) -> dict:
+    """
+    Memory-map the published build's aggregate tables as ``store.cache`` entries.
+
+    Args:
+        out_dir: Directory holding published builds
+        data_path: Dataset the store was loaded from; the build is skipped
+            if it was made from a different or since-modified file
+
+    Returns:
+        Mapping of ``store.cache`` keys to tables (empty if no usable build)
+    """
+    build_dir, manifest = _usable_build(out_dir, data_path)
+    return _load_cache(build_dir, manifest) if build_dir is not None else {}
+
+
+def load_store(out_dir: str | Path, data_path: str | Path | None = None) -> DeliveryStore | None:
+    """
+    Assemble a :class:`DeliveryStore` entirely from the published build.
+
+    Numeric, boolean and categorical columns of the deliveries, matches and
+    innings tables stay backed by the mapped files, and the aggregate tables
+    are mapped into ``store.cache``. The dataset itself is not read.
+
+    Args:
+        out_dir: Directory holding published builds
+        data_path: Dataset the build must have been made from (not checked if None)
+
+    Returns:
+        The store, or None if there is no usable build
+    """
+    build_dir, manifest = _usable_build(out_dir, data_path)
+    if build_dir is None:
+        return None
+    frames = {
+        frame_name: pd.DataFrame(_load_columns(build_dir / STORE_DIR / frame_name, encodings), copy=False)
+        for frame_name, encodings in manifest["store"].items()
+    }
+    store = DeliveryStore(frames["deliveries"], matches=frames["matches"], batting=frames["batting"], bowling=frames["bowling"])
+    store.cache.update(_load_cache(build_dir, manifest))
+    return store
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build memory-mapped PSL stat tables.")
+    parser.add_argument("--data", default=LOCAL_DATA_PATH, help="Ball-by-ball CSV or Parquet file")
+    parser.add_argument("--out", default=LOCAL_TABLES_PATH, help="Output directory")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--tables", nargs="*", choices=list(TABLE_SPECS), help="Only build these tables")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    manifest = build_tables(args.data, args.out, args.workers, args.tables)
+    for name, seconds in sorted(manifest["timings"].items(), key=lambda item: item[1], reverse=True):
+        print(f"  {name:<28} {seconds * 1000:8.1f} ms")
+    print(f"Built {len(manifest['store'])} store frames and {len(manifest['tables'])} tables in {time.perf_counter() - started:.2f}s -> {current_build(args.out)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+PSL Analytics Hub - Bulk Export
+===============================
+Export every player's, bowler's or team's stats, or every player's season
+growth, to CSV or Parquet.
+
+The export is a generator pipeline. Entities are fetched in chunks on a
+bounded thread pool. Each chunk becomes one small DataFrame, which is
+appended to the output before the next chunk is fetched, so memory stays
+flat however many entities are exported. Requests bypass the Streamlit
+data cache so that an export does not fill it.
+
+Usage:
+    python -m psl_dashboard.export players stats --out players.csv
+    python -m psl_dashboard.export players growth --format parquet --out growth.parquet
+    python -m psl_dashboard.export teams stats --local --data Data/PSL.csv --out teams.csv
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
+
+import pandas as pd
+import requests
+
+from .api import encode_value, fetch_uncached
+from .config import API_BASE_URL, FETCH_CONCURRENCY, LOCAL_DATA_PATH, TEAM_FALLBACK
+
+# kind -> dataset -> endpoint suffix under /{kind}/{name}
+EXPORT_DATASETS = {
+    "players": {"stats": "/stats", "growth": "/growth"},
+    "bowlers": {"stats": "/stats"},
+    "teams": {"stats": "/stats"},
+}
+
+# Output format -> MIME type
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Entities fetched and written per chunk
+EXPORT_CHUNK_SIZE = 50
+
+_ENTITY_FIELD = {"players": "player", "bowlers": "bowler", "teams": "team"}
+
+# fetch(endpoint, params=None) -> payload, or None when the entity is unknown.
+# Any other failure raises, so a transient error is never mistaken for no data.
+Fetcher = Callable[..., object]
+
+
+def api_fetcher(base_url: str) -> Fetcher:
+    """Uncached GET against the API; unknown entities (404) return None, other failures raise."""
+
+    def fetch(endpoint: str, params: dict | None = None):
+        try:
+            return fetch_uncached(base_url, endpoint, params)
+        except requests.HTTPError as exc:
+            if exc.response is not None and exc.response.status_code == 404:
+                return None
+            raise
+
+    return fetch
+
+
+def local_fetcher(store) -> Fetcher:
+    """GET answered by the local engine; unknown entities return None."""
+    from .engine import handle_request
+
+    def fetch(endpoint: str, params: dict | None = None):
+        try:
+            return handle_request(store, endpoint, "GET", params)
+        except LookupError:
+            return None
+
+    return fetch
+
+
+def entity_names(kind: str, fetch: Fetcher) -> list[str]:
+    """All players, bowlers or teams known to the data source."""
+    names = fetch(f"/{kind}")
+    if isinstance(names, list) and names:
+        return sorted(str(name) for name in names)
+    # The API does not list teams
+    return list(TEAM_FALLBACK) if kind == "teams" else []
+
+
+def _rows(kind: str, dataset: str, name: str, payload) -> list[dict]:
+    field = _ENTITY_FIELD[kind]
+    if dataset == "growth":
+        records = payload if isinstance(payload, list) else []
+        return [{field: name, **record} for record in records if isinstance(record, dict)]
+    if not isinstance(payload, dict):
+        return []
+    overall = payload.get("overall", payload)
+    # Nested breakdowns (e.g. "against") are not flattened into the export
+    return [{field: name, **{key: value for key, value in overall.items() if not isinstance(value, (dict, list))}}]
+
+
+def iter_export(
+    kind: str,
+    dataset: str,
+    fetch: Fetcher,
+    names: list[str] | None = None,
+    max_workers: int = FETCH_CONCURRENCY,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield export rows one chunk of entities at a time.
+
+    Args:
+        kind: "players", "bowlers" or "teams"
+        dataset: Key of :data:`EXPORT_DATASETS` for ``kind``
+        fetch: Endpoint fetcher (see :func:`api_fetcher`, :func:`local_fetcher`)
+        names: Entities to export (all by default)
+        max_workers: Maximum concurrent requests
+        chunk_size: Entities per yielded frame
+
+    Yields:
+        One DataFrame per chunk with at least one row
+
+    Raises:
+        requests.RequestException: If an entity cannot be fetched (the
+            export stops rather than leave it out)
+    """
+    suffix = EXPORT_DATASETS[kind][dataset]
+    if names is None:
+        names = entity_names(kind, fetch)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for start in range(0, len(names), chunk_size):
+            chunk = names[start : start + chunk_size]
+            payloads = pool.map(fetch, [f"/{kind}/{encode_value(name)}{suffix}" for name in chunk])
+            records = [row for name, payload in zip(chunk, payloads) for row in _rows(kind, dataset, name, payload)]
+            if records:
+                yield pd.DataFrame.from_records(records)
+
+
+def _write_csv(frames: Iterable[pd.DataFrame], out: BinaryIO) -> int:
+    columns = None
+    rows = 0
+    for frame in frames:
+        # The first chunk fixes the header; later chunks are aligned to it
+        header = columns is None
+        if header:
+            columns = list(frame.columns)
+        out.write(frame.reindex(columns=columns).to_csv(index=False, header=header).encode("utf-8"))
+        rows += len(frame)
+    return rows
+
+
+def _arrow_types(frame: pd.DataFrame) -> dict[str, str]:
+    types = {}
+    for column, dtype in frame.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            types[column] = "boolean"
+        elif pd.api.types.is_integer_dtype(dtype):
+            types[column] = "Int64"
+        elif pd.api.types.is_float_dtype(dtype):
+            types[column] = "float64"
+        else:
+            types[column] = "string"
+    return types
+
+
+def _conform(frame: pd.DataFrame, types: dict[str, str]) -> pd.DataFrame:
+    """Cast a chunk onto the first chunk's column types so every row group shares one schema."""
+    frame = frame.reindex(columns=list(types))
+    columns = {}
+    for column, dtype in types.items():
+        values = frame[column]
+        if dtype == "string":
+            columns[column] = values.astype("string")
+        else:
+            columns[column] = pd.to_numeric(values, errors="coerce").astype(dtype)
+    return pd.DataFrame(columns)
+
+
+def _write_parquet(frames: Iterable[pd.DataFrame], out: BinaryIO) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    types = None
+    rows = 0
+    try:
+        for frame in frames:
+            if types is None:
+                types = _arrow_types(frame)
+            table = pa.Table.from_pandas(_conform(frame, types), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            # One row group per chunk
+            writer.write_table(table.cast(writer.schema))
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_export(frames: Iterable[pd.DataFrame], out: BinaryIO, fmt: str = "csv") -> int:
+    """
+    Stream frames into a binary file object.
+
+    Args:
+        frames: Chunks from :func:`iter_export`
+        out: Writable binary file object
+        fmt: "csv" or "parquet"
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if fmt == "csv":
+        return _write_csv(frames, out)
+    if fmt == "parquet":
+        return _write_parquet(frames, out)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_file_name(kind: str, dataset: str, fmt: str) -> str:
+    return f"psl_{kind}_{dataset}.{fmt}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export PSL stats for every player, bowler or team.")
+    parser.add_argument("kind", choices=list(EXPORT_DATASETS))
+    parser.add_argument("dataset", nargs="?", default="stats", help="stats (all kinds) or growth (players)")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv", dest="fmt")
+    parser.add_argument("--out", help="Output file (defaults to psl_<kind>_<dataset>.<format>)")
+    parser.add_argument("--api-base", default=API_BASE_URL, help="API base URL")
+    parser.add_argument("--local", action="store_true", help="Compute stats from the local dataset instead of the API")
+    parser.add_argument("--data", default=LOCAL_DATA_PATH, help="Ball-by-ball dataset used with --local")
+    parser.add_argument("--workers", type=int, default=FETCH_CONCURRENCY, help="Maximum concurrent requests")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Entities per written chunk")
+    args = parser.parse_args(argv)
+
+    if args.dataset not in EXPORT_DATASETS[args.kind]:
+        parser.error(f"{args.kind} supports: {', '.join(EXPORT_DATASETS[args.kind])}")
+    if args.local:
+        from .engine import DeliveryStore
+
+        fetch = local_fetcher(DeliveryStore.from_path(args.data))
+    else:
+        fetch = api_fetcher(args.api_base.rstrip("/"))
+
+    out_path = args.out or export_file_name(args.kind, args.dataset, args.fmt)
+    frames = iter_export(args.kind, args.dataset, fetch, max_workers=args.workers, chunk_size=max(1, args.chunk_size))
+    try:
+        with open(out_path, "wb") as out:
+            rows = write_export(frames, out, args.fmt)
+    except requests.RequestException as exc:
+        print(f"Export failed, {out_path} is incomplete: {exc}", file=sys.stderr)
+        return 1
+    print(f"Wrote {rows} rows to {out_path}")
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
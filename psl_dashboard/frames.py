@@ -0,0 +1,190 @@
+"""
+PSL Analytics Hub - DataFrame Conversion
+========================================
+Cached conversion of API payloads into compact, Arrow-friendly DataFrames.
+
+Frames are keyed by a hash of the payload, so identical responses are only
+converted once and then reused across reruns and sessions.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pandas as pd
+import streamlit as st
+
+from .profiler import profiled
+
+# Maximum number of converted frames kept in the cache
+FRAME_CACHE_MAX_ENTRIES = 256
+
+# Columns holding team or player names; stored as categoricals
+CATEGORY_COLUMNS = frozenset({
+    "team",
+    "opponent",
+    "batting_team",
+    "bowling_team",
+    "winner",
+    "batter",
+    "bowler",
+    "fielder",
+    "player",
+    "player_of_match",
+    "name",
+    "venue",
+})
+
+# Text columns with at most this share of unique values are also categorised
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Text columns named like identifiers are never coerced to numbers
+IDENTIFIER_COLUMNS = frozenset({"id", "code"})
+IDENTIFIER_SUFFIXES = ("_id", "_code")
+
+# Digit strings with a leading zero ("007") are codes, not numbers
+_LEADING_ZERO = r"^[+-]?0\d"
+
+
+def payload_hash(payload) -> str:
+    """Return a stable hash for a JSON-like payload."""
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def normalize_records(data, index_label: str = "item"):
+    """
+    Flatten dict payloads into a list of records.
+
+    Args:
+        data: List of records, dict of dicts, or dict of scalars
+        index_label: Column name used for the dict keys
+
+    Returns:
+        Records suitable for ``pd.DataFrame``
+    """
+    if isinstance(data, dict):
+        # dict of dicts
+        if all(isinstance(v, dict) for v in data.values()):
+            return [{index_label: k, **v} for k, v in data.items()]
+        # dict of scalars
+        return [{index_label: k, "value": v} for k, v in data.items()]
+    return data
+
+
+def _optimize_numeric(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if series.notna().all() and (series % 1 == 0).all():
+        return pd.to_numeric(series, downcast="integer")
+    # Rates and averages stay float64 so displayed and exported values keep their precision
+    return series.astype("float64")
+
+
+def _is_numeric_text(name, non_null: pd.Series) -> bool:
+    """True when every value parses as a number and the column does not hold codes."""
+    name = str(name).lower()
+    if name in IDENTIFIER_COLUMNS or name.endswith(IDENTIFIER_SUFFIXES):
+        return False
+    if not pd.to_numeric(non_null, errors="coerce").notna().all():
+        return False
+    text = non_null[non_null.map(type).eq(str)].str.strip()
+    return not text.str.match(_LEADING_ZERO).any()
+
+
+def _optimize_text(name, series: pd.Series) -> pd.Series:
+    non_null = series.dropna()
+    if non_null.empty:
+        return series.astype(str)
+
+    # Flags with gaps would otherwise parse as 1.0 / 0.0 / NaN
+    if non_null.map(pd.api.types.is_bool).all():
+        return series.astype("boolean")
+
+    if _is_numeric_text(name, non_null):
+        return _optimize_numeric(pd.to_numeric(series, errors="coerce"))
+
+    # Nested or mixed values (lists, dicts, numbers among strings) are not Arrow-safe
+    if not non_null.map(type).eq(str).all():
+        series = series.map(lambda v: v if v is None or isinstance(v, str) else str(v))
+        non_null = series.dropna()
+
+    is_name_column = str(name).lower() in CATEGORY_COLUMNS
+    if is_name_column or non_null.nunique() <= len(non_null) * CATEGORY_MAX_UNIQUE_RATIO:
+        return series.astype("category")
+    return series
+
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of ``df`` with compact dtypes.
+
+    Team and player names become categoricals and integers are downcast.
+    Flags with missing values become the nullable ``boolean`` dtype.
+    Fractional values (rates, averages) keep float64, and numeric-looking
+    text is converted only when every value parses and the column is not an
+    identifier or code column.
+    """
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        if pd.api.types.is_numeric_dtype(series):
+            columns[name] = _optimize_numeric(series)
+        else:
+            columns[name] = _optimize_text(name, series)
+    return pd.DataFrame(columns, index=df.index)
+
+
+@st.cache_data(show_spinner=False, max_entries=FRAME_CACHE_MAX_ENTRIES)
+def _build_frame(key: str, _data, index_label: str) -> pd.DataFrame:
+    # ``key`` identifies the payload; ``_data`` is excluded from Streamlit's hashing.
+    return optimize_dtypes(pd.DataFrame(normalize_records(_data, index_label)))
+
+
+@profiled("view")
+def to_frame(data, index_label: str = "item") -> pd.DataFrame:
+    """
+    Convert an API payload to a typed DataFrame, reusing cached conversions.
+
+    Args:
+        data: List of records, dict of dicts, or dict of scalars
+        index_label: Column name used for dict keys
+
+    Returns:
+        DataFrame with optimized dtypes
+    """
+    return _build_frame(payload_hash([index_label, data]), data, index_label)
+
+
+def filter_frame(df: pd.DataFrame, query: str) -> pd.DataFrame:
+    """Keep rows where any text column contains ``query`` (case-insensitive)."""
+    query = (query or "").strip()
+    if not query or df.empty:
+        return df
+
+    mask = pd.Series(False, index=df.index)
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Match against the (few) categories instead of every row
+            categories = series.cat.categories.astype(str)
+            matches = categories[categories.str.contains(query, case=False, regex=False)]
+            mask |= series.isin(matches)
+        elif not pd.api.types.is_numeric_dtype(series):
+            mask |= series.astype(str).str.contains(query, case=False, regex=False, na=False)
+    return df[mask]
+
+
+def sort_frame(df: pd.DataFrame, column: str | None, ascending: bool = True) -> pd.DataFrame:
+    """Stable sort by ``column``; unknown columns leave the frame untouched."""
+    if not column or column not in df.columns:
+        return df
+    return df.sort_values(column, ascending=ascending, kind="stable", na_position="last")
+
+
+def page_frame(df: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    """Return the 1-based ``page`` of ``df``."""
+    start = max(page - 1, 0) * page_size
+    return df.iloc[start : start + page_size]
@@ -0,0 +1,313 @@
+"""
+PSL Analytics Hub - Memory Diagnostics
+======================================
+Attribute a dashboard process's memory to caches, sessions and allocation
+sites (``PSL_MEMORY=1``).
+
+- A background sampler records RSS and ``tracemalloc`` totals every
+  ``PSL_MEMORY_SNAPSHOT_SECONDS`` and keeps the first and latest snapshots,
+  so the top allocation sites and their growth since startup can be listed.
+- Cache sizes cover:
+  - Streamlit data caches, including the ``_cached_request`` response
+    store (pickled bytes);
+  - resource caches (figures, view models, the engine store);
+  - the local engine's memoized tables.
+- Session sizes are the ``st.session_state`` footprint of every active
+  session.
+- When RSS crosses ``PSL_MEMORY_ALERT_MB``, a warning is logged and shown in
+  the sidebar.
+
+``tracemalloc`` slows allocation-heavy code noticeably, so this mode is
+meant for sizing runs, not for serving all traffic.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import streamlit as st
+
+from .config import (
+    BASE_DIR,
+    LOCAL_DATA_PATH,
+    LOCAL_INGEST_PATH,
+    LOCAL_TABLES_PATH,
+    MEMORY_ALERT_MB,
+    MEMORY_SNAPSHOT_SECONDS,
+    MEMORY_TOP_SITES,
+    MEMORY_TRACE_FRAMES,
+    is_local_source,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Samples kept for the RSS chart
+MAX_SAMPLES = 240
+
+# Frames from these files are left out of allocation statistics
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+_MB = 1024 * 1024
+
+_APP_DIR = str(BASE_DIR)
+
+
+def rss_bytes() -> int | None:
+    """Resident set size of this process (peak RSS where the current value is unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def estimate_size(obj) -> int:
+    """
+    Approximate deep size of ``obj`` in bytes.
+
+    pandas objects use ``memory_usage(deep=True)``. NumPy arrays use
+    ``nbytes``; memory-mapped arrays count as 0 because their pages belong
+    to the OS page cache. Containers are summed item by item. Anything else
+    goes to Streamlit's ``safe_sizeof``.
+    """
+    pd = sys.modules.get("pandas")
+    np = sys.modules.get("numpy")
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if np is not None and isinstance(obj, np.ndarray):
+        return 0 if isinstance(obj, np.memmap) else int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(key) + estimate_size(value) for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return sys.getsizeof(obj) + sum(estimate_size(item) for item in obj)
+    if hasattr(obj, "__dict__") and type(obj).__module__.startswith("psl_dashboard"):
+        return sys.getsizeof(obj) + estimate_size(vars(obj))
+    if hasattr(obj, "__slots__") and type(obj).__module__.startswith("psl_dashboard"):
+        return sys.getsizeof(obj) + sum(estimate_size(getattr(obj, slot, None)) for slot in obj.__slots__)
+
+    from streamlit.runtime.stats import safe_sizeof
+
+    return safe_sizeof(obj)
+
+
+def _site(traceback: tracemalloc.Traceback) -> str | None:
+    """Innermost dashboard frame of an allocation (the innermost frame if none is ours, None for tracemalloc's own)."""
+    for frame in reversed(traceback):
+        if frame.filename.startswith(_APP_DIR):
+            return f"{os.path.relpath(frame.filename, _APP_DIR)}:{frame.lineno}"
+    frame = traceback[-1]
+    if frame.filename in _IGNORED_FILES:
+        return None
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryMonitor:
+    """Process-wide sampler of RSS and ``tracemalloc`` snapshots."""
+
+    def __init__(self, interval: float, alert_mb: float, frames: int):
+        self.interval = interval
+        self.alert_bytes = alert_mb * _MB if alert_mb else None
+        self.frames = frames
+        self.samples: deque[dict] = deque(maxlen=MAX_SAMPLES)
+        self.high_water = 0
+        self.alert_since: float | None = None
+        # site -> (bytes, blocks) of the first and latest snapshots
+        self.baseline: dict[str, tuple[int, int]] | None = None
+        self.latest: dict[str, tuple[int, int]] | None = None
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+            self._thread = threading.Thread(target=self._run, name="psl-memory-sampler", daemon=True)
+        self.sample()
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.sample()
+
+    def sample(self) -> dict:
+        """Record RSS and traced totals, then snapshot and group allocations by site."""
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        rss = rss_bytes()
+        sample = {"at": time.time(), "rss_mb": round(rss / _MB, 1) if rss else None, "traced_mb": round(traced / _MB, 1), "traced_peak_mb": round(traced_peak / _MB, 1)}
+        with self._lock:
+            self.samples.append(sample)
+            if rss:
+                self.high_water = max(self.high_water, rss)
+            if self.alert_bytes and rss and rss >= self.alert_bytes:
+                if self.alert_since is None:
+                    self.alert_since = sample["at"]
+                    _LOGGER.warning("Memory high-water alert: RSS %.0f MB >= %.0f MB", rss / _MB, self.alert_bytes / _MB)
+            else:
+                self.alert_since = None
+
+        # Grouping walks every live trace in Python, so it runs here (normally
+        # on the sampler thread) and renders only read the result
+        with self._snapshot_lock:
+            sites = _group_sites(tracemalloc.take_snapshot())
+        with self._lock:
+            self.baseline = self.baseline or sites
+            self.latest = sites
+        return sample
+
+    def top_sites(self, limit: int = MEMORY_TOP_SITES) -> list[dict]:
+        """Largest live allocation sites in the latest snapshot."""
+        with self._lock:
+            latest = self.latest
+        if not latest:
+            return []
+        ranked = sorted(latest.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [{"site": site, "mb": round(size / _MB, 2), "blocks": count} for site, (size, count) in ranked]
+
+    def growth(self, limit: int = MEMORY_TOP_SITES) -> list[dict]:
+        """Allocation sites that grew the most since the first snapshot."""
+        with self._lock:
+            baseline, latest = self.baseline, self.latest
+        if baseline is None or latest is None or baseline is latest:
+            return []
+        diffs = {site: size - baseline.get(site, (0, 0))[0] for site, (size, _) in latest.items()}
+        ranked = sorted(diffs.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {"site": site, "growth_mb": round(diff / _MB, 2), "mb": round(latest[site][0] / _MB, 2)}
+            for site, diff in ranked
+            if diff > 0
+        ]
+
+
+def _group_sites(snapshot: tracemalloc.Snapshot) -> dict[str, tuple[int, int]]:
+    sites: dict[str, list[int]] = {}
+    for stat in snapshot.statistics("traceback"):
+        site = _site(stat.traceback)
+        if site is None:
+            continue
+        totals = sites.setdefault(site, [0, 0])
+        totals[0] += stat.size
+        totals[1] += stat.count
+    return {site: (size, count) for site, (size, count) in sites.items()}
+
+
+@st.cache_resource(show_spinner=False)
+def get_monitor() -> MemoryMonitor:
+    """Per-process monitor, started on first use."""
+    monitor = MemoryMonitor(MEMORY_SNAPSHOT_SECONDS, MEMORY_ALERT_MB, MEMORY_TRACE_FRAMES)
+    monitor.start()
+    return monitor
+
+
+# ---------------------------------------------------------------------------
+# Attribution
+# ---------------------------------------------------------------------------
+
+def cache_sizes() -> list[dict]:
+    """Size of every Streamlit cache and of the local engine's memoized tables, largest first."""
+    from streamlit.runtime.caching import get_data_cache_stats_provider
+
+    rows = {}
+    for stats in get_data_cache_stats_provider().get_stats().values():
+        for stat in stats:
+            row = rows.setdefault(stat.cache_name, {"cache": stat.cache_name, "type": "data", "entries": None, "mb": 0.0})
+            row["mb"] += stat.byte_length / _MB
+
+    # Resource caches hold live objects; Streamlit does not size them
+    try:
+        from streamlit.runtime.caching.cache_resource_api import _resource_caches
+
+        with _resource_caches._caches_lock:
+            caches = [cache for by_key in _resource_caches._function_caches.values() for cache in by_key.values()]
+        for cache in caches:
+            with cache._mem_cache_lock:
+                values = [result.value for result in cache._mem_cache.values()]
+            if cache.display_name.endswith("get_monitor"):
+                continue
+            rows[cache.display_name] = {
+                "cache": cache.display_name,
+                "type": "resource",
+                "entries": len(values),
+                "mb": sum(estimate_size(value) for value in values) / _MB,
+            }
+    except (ImportError, AttributeError):
+        pass
+
+    if is_local_source():
+        from .engine import get_live_store
+
+        store = get_live_store(LOCAL_DATA_PATH, LOCAL_TABLES_PATH, LOCAL_INGEST_PATH).current()
+        for name in ("deliveries", "batting", "bowling", "matches"):
+            rows[f"engine.{name}"] = {"cache": f"engine.{name}", "type": "engine", "entries": None, "mb": estimate_size(getattr(store, name)) / _MB}
+        for key, value in list(store.cache.items()):
+            label = f"engine.cache[{key!r}]"
+            rows[label] = {"cache": label, "type": "engine", "entries": None, "mb": estimate_size(value) / _MB}
+
+    for row in rows.values():
+        row["mb"] = round(row["mb"], 2)
+    return sorted(rows.values(), key=lambda row: row["mb"], reverse=True)
+
+
+def _state_size(state) -> tuple[int, int]:
+    items = dict(state)
+    return len(items), sum(estimate_size(value) for value in items.values())
+
+
+def session_sizes() -> list[dict]:
+    """``st.session_state`` footprint of every active session (this session only if the runtime is unavailable)."""
+    rows = []
+    try:
+        from streamlit.runtime import Runtime
+
+        sessions = Runtime.instance()._session_mgr.list_active_sessions()
+        for info in sessions:
+            keys, size = _state_size(info.session.session_state.filtered_state)
+            rows.append({"session": info.session.id[:8], "keys": keys, "kb": round(size / 1024, 1)})
+    except (RuntimeError, AttributeError):
+        keys, size = _state_size(st.session_state.to_dict())
+        rows.append({"session": "current", "keys": keys, "kb": round(size / 1024, 1)})
+    return sorted(rows, key=lambda row: row["kb"], reverse=True)
+
+
+def render_memory_diagnostics():
+    """Sidebar panel: RSS trend, high-water alert, caches, sessions and allocation sites."""
+    monitor = get_monitor()
+    with st.expander("🧠 Memory"):
+        if st.button("Take snapshot now", key="memory_snapshot", help="Groups every traced allocation; may take a few seconds"):
+            monitor.sample()
+        latest = monitor.samples[-1] if monitor.samples else {}
+        st.caption(
+            f"RSS {latest.get('rss_mb')} MB · high-water {monitor.high_water / _MB:.0f} MB · "
+            f"traced {latest.get('traced_mb')} MB (peak {latest.get('traced_peak_mb')} MB)"
+        )
+        if len(monitor.samples) > 1:
+            st.line_chart([{"rss_mb": sample["rss_mb"], "traced_mb": sample["traced_mb"]} for sample in monitor.samples], height=140)
+        st.markdown("**Caches**")
+        st.dataframe(cache_sizes(), hide_index=True, use_container_width=True)
+        st.markdown("**Sessions**")
+        st.dataframe(session_sizes(), hide_index=True, use_container_width=True)
+        st.markdown("**Top allocation sites**")
+        st.dataframe(monitor.top_sites(), hide_index=True, use_container_width=True)
+        growth = monitor.growth()
+        if growth:
+            st.markdown("**Growth since first snapshot**")
+            st.dataframe(growth, hide_index=True, use_container_width=True)
+    if monitor.alert_since is not None:
+        st.error(f"Memory high-water alert: RSS above {MEMORY_ALERT_MB:.0f} MB since {time.strftime('%H:%M:%S', time.localtime(monitor.alert_since))}")
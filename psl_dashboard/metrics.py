@@ -0,0 +1,389 @@
+"""
+PSL Analytics Hub - Fetch Metrics
+=================================
+Process-wide request metrics for ``fetch_api``, keyed by endpoint template
+(``/players/{name}/stats`` rather than one series per player).
+
+For each template this module records:
+
+- request counts by outcome:
+  - ``hit``: served from the data cache
+  - ``miss``: first network fetch of a request
+  - ``stale``: network re-fetch of a request that had been cached before
+    (its entry was evicted or cleared). The most recent
+    ``FETCHED_KEYS_MAX`` requests are remembered; an older one counts as a
+    ``miss`` again
+  - ``uncached``: fetched with the cache bypassed
+  - ``local``: answered by the local engine
+  - ``cancelled``: abandoned because its rerun was superseded
+  - ``error``: the request failed
+- latency histograms by outcome;
+- response size histograms;
+- decode time histograms by wire format (``json``, ``msgpack`` or ``text``);
+- error counts by kind.
+
+Metrics are shown in the sidebar and rendered in the Prometheus text
+exposition format. They can be served on ``PSL_METRICS_PORT`` and/or
+written to ``PSL_METRICS_FILE`` (for a node-exporter textfile collector).
+
+Only the standard library is imported, so importing this module costs
+nothing at startup.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DECODE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+
+# Outcomes that did the work (network fetch or local computation), as
+# opposed to cache hits; the sidebar's latency columns cover these
+WORK_OUTCOMES = ("miss", "stale", "uncached", "local")
+
+# Second path segments that are fixed routes rather than names
+_FIXED_SEGMENTS = frozenset({
+    "top",
+    "top-sixes",
+    "top-fours",
+    "top-catches",
+    "top-mom",
+    "top-totals",
+    "top-chases",
+    "compare",
+})
+
+# Placeholders for /{collection}/{a}/{route}/{b}
+_PAIR_PLACEHOLDERS = {
+    "vs-bowler": ("{batter}", "{bowler}"),
+    "vs-team": ("{name}", "{team}"),
+    "vs": ("{team1}", "{team2}"),
+}
+
+_TEMPLATE_CACHE_MAX = 4096
+
+# Distinct fetched requests remembered for telling ``stale`` from ``miss``
+FETCHED_KEYS_MAX = 65_536
+_template_cache: dict[str, str] = {}
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Collapse an endpoint onto its route template.
+
+    ``/players/Babar%20Azam/stats?x=1`` -> ``/players/{name}/stats``
+    """
+    template = _template_cache.get(endpoint)
+    if template is not None:
+        return template
+    parts = [part for part in urlsplit(endpoint).path.split("/") if part]
+    if len(parts) >= 2 and parts[1] not in _FIXED_SEGMENTS:
+        route = parts[2] if len(parts) >= 3 else None
+        first, second = _PAIR_PLACEHOLDERS.get(route, ("{name}", "{other}"))
+        parts[1] = first
+        if len(parts) >= 4:
+            parts[3] = second
+    template = "/" + "/".join(parts)
+    if len(_template_cache) < _TEMPLATE_CACHE_MAX:
+        _template_cache[endpoint] = template
+    return template
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> list[int]:
+        running, counts = 0, []
+        for count in self.counts:
+            running += count
+            counts.append(running)
+        return counts
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the ``q`` quantile (None if empty or beyond the last bucket)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, running in zip(self.bounds, self.cumulative()):
+            if running >= target:
+                return bound
+        return None
+
+
+class FetchMetrics:
+    """Thread-safe fetch counters and histograms for one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.requests: dict[tuple[str, str, str], int] = {}
+            self.latency: dict[tuple[str, str], Histogram] = {}
+            self.sizes: dict[str, Histogram] = {}
+            self.decode: dict[tuple[str, str], Histogram] = {}
+            self.errors: dict[tuple[str, str], int] = {}
+            # Least recently fetched first
+            self._fetched: OrderedDict[int, None] = OrderedDict()
+
+    def was_fetched(self, request_key: tuple) -> bool:
+        """Mark a cacheable request as fetched; True if it had been fetched before."""
+        key = hash(request_key)
+        with self._lock:
+            seen = key in self._fetched
+            self._fetched[key] = None
+            self._fetched.move_to_end(key)
+            if len(self._fetched) > FETCHED_KEYS_MAX:
+                self._fetched.popitem(last=False)
+        return seen
+
+    def record(
+        self,
+        endpoint: str,
+        method: str,
+        outcome: str,
+        seconds: float,
+        size: int | None = None,
+        error: str | None = None,
+    ):
+        """Record one request."""
+        template = endpoint_template(endpoint)
+        with self._lock:
+            key = (template, method, outcome)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.get((template, outcome))
+            if histogram is None:
+                histogram = self.latency[(template, outcome)] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+            if size is not None:
+                sizes = self.sizes.get(template)
+                if sizes is None:
+                    sizes = self.sizes[template] = Histogram(SIZE_BUCKETS)
+                sizes.observe(size)
+            if error is not None:
+                self.errors[(template, error)] = self.errors.get((template, error), 0) + 1
+
+    def record_decode(self, endpoint: str, codec: str, seconds: float):
+        """Record the time spent decoding one response body."""
+        template = endpoint_template(endpoint)
+        with self._lock:
+            histogram = self.decode.get((template, codec))
+            if histogram is None:
+                histogram = self.decode[(template, codec)] = Histogram(DECODE_BUCKETS)
+            histogram.observe(seconds)
+
+    def summary(self) -> list[dict]:
+        """One row per endpoint template, busiest first."""
+        with self._lock:
+            rows: dict[str, dict] = {}
+            for (template, _, outcome), count in self.requests.items():
+                row = rows.setdefault(template, {"endpoint": template, "requests": 0})
+                row["requests"] += count
+                row[outcome] = row.get(outcome, 0) + count
+            for template, row in rows.items():
+                work = Histogram(LATENCY_BUCKETS)
+                for outcome in WORK_OUTCOMES:
+                    histogram = self.latency.get((template, outcome))
+                    if histogram is not None:
+                        work.total += histogram.total
+                        work.count += histogram.count
+                        work.counts = [a + b for a, b in zip(work.counts, histogram.counts)]
+                cacheable = row.get("hit", 0) + row.get("miss", 0) + row.get("stale", 0)
+                p95 = work.quantile(0.95)
+                sizes = self.sizes.get(template)
+                decode = [histogram for (name, _), histogram in self.decode.items() if name == template]
+                decoded = sum(histogram.count for histogram in decode)
+                row.update({
+                    "hit_pct": round(100 * row.get("hit", 0) / cacheable, 1) if cacheable else None,
+                    "avg_ms": round(1000 * work.total / work.count, 1) if work.count else None,
+                    "p95_ms": round(1000 * p95, 1) if p95 is not None else None,
+                    "decode_ms": round(1000 * sum(histogram.total for histogram in decode) / decoded, 2) if decoded else None,
+                    "kb": round(sizes.total / 1000, 1) if sizes else 0.0,
+                    "errors": sum(count for (name, _), count in self.errors.items() if name == template),
+                })
+        columns = ["endpoint", "requests", "hit", "miss", "stale", "uncached", "local", "cancelled", "hit_pct", "avg_ms", "p95_ms", "decode_ms", "kb", "errors"]
+        table = [{column: row.get(column, 0) for column in columns} for row in rows.values()]
+        return sorted(table, key=lambda row: row["requests"], reverse=True)
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP psl_fetch_requests_total Fetches by endpoint template, method and outcome.",
+                "# TYPE psl_fetch_requests_total counter",
+            ]
+            for (template, method, outcome), count in sorted(self.requests.items()):
+                lines.append(f"psl_fetch_requests_total{_labels(endpoint=template, method=method, outcome=outcome)} {count}")
+            lines += [
+                "# HELP psl_fetch_latency_seconds Fetch latency by endpoint template and outcome.",
+                "# TYPE psl_fetch_latency_seconds histogram",
+            ]
+            for (template, outcome), histogram in sorted(self.latency.items()):
+                lines += _histogram_lines("psl_fetch_latency_seconds", histogram, endpoint=template, outcome=outcome)
+            lines += [
+                "# HELP psl_fetch_response_bytes Response body size of network fetches.",
+                "# TYPE psl_fetch_response_bytes histogram",
+            ]
+            for template, histogram in sorted(self.sizes.items()):
+                lines += _histogram_lines("psl_fetch_response_bytes", histogram, endpoint=template)
+            lines += [
+                "# HELP psl_fetch_decode_seconds Response decode time by endpoint template and wire format.",
+                "# TYPE psl_fetch_decode_seconds histogram",
+            ]
+            for (template, codec), histogram in sorted(self.decode.items()):
+                lines += _histogram_lines("psl_fetch_decode_seconds", histogram, endpoint=template, codec=codec)
+            lines += [
+                "# HELP psl_fetch_errors_total Failed fetches by endpoint template and error kind.",
+                "# TYPE psl_fetch_errors_total counter",
+            ]
+            for (template, kind), count in sorted(self.errors.items()):
+                lines.append(f"psl_fetch_errors_total{_labels(endpoint=template, kind=kind)} {count}")
+            lines += [
+                "# HELP psl_fetch_metrics_start_time_seconds When these metrics were last reset.",
+                "# TYPE psl_fetch_metrics_start_time_seconds gauge",
+                f"psl_fetch_metrics_start_time_seconds {self.started:.3f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, histogram: Histogram, **labels) -> list[str]:
+    lines = [
+        f"{name}_bucket{_labels(**labels, le=_number(bound))} {count}"
+        for bound, count in zip(histogram.bounds, histogram.cumulative())
+    ]
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.total:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+def error_kind(exc: BaseException) -> str:
+    """Short error label: ``http_<status>``, ``timeout``, ``connection`` or the exception name."""
+    response = getattr(exc, "response", None)
+    if response is not None and getattr(response, "status_code", None):
+        return f"http_{response.status_code}"
+    name = type(exc).__name__
+    if "Timeout" in name:
+        return "timeout"
+    if "Connection" in name:
+        return "connection"
+    return name
+
+
+# The process-wide registry
+FETCH_METRICS = FetchMetrics()
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def write_metrics_file(path: str | Path, metrics: FetchMetrics = FETCH_METRICS):
+    """Write the Prometheus text atomically, so scrapers never read a partial file."""
+    path = Path(path)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(metrics.to_prometheus())
+    os.replace(temporary, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    metrics = FETCH_METRICS
+
+    def do_GET(self):  # noqa: N802
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.metrics.to_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def start_exporter(port: int = 0, path: str | None = None, interval: float = 15.0) -> bool:
+    """
+    Start the metrics exporters once per process.
+
+    Args:
+        port: Serve ``/metrics`` on this port (0 disables)
+        path: Rewrite this file every ``interval`` seconds (empty disables)
+        interval: Seconds between file writes
+
+    Returns:
+        True if the exporters were started by this call
+    """
+    global _exporter_started
+    if not port and not path:
+        return False
+    with _exporter_lock:
+        if _exporter_started:
+            return False
+        _exporter_started = True
+
+    if port:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+        except OSError:
+            # Another dashboard process on this host already serves the port
+            server = None
+        if server is not None:
+            threading.Thread(target=server.serve_forever, name="psl-metrics-http", daemon=True).start()
+    if path:
+
+        def write_periodically():
+            while True:
+                try:
+                    write_metrics_file(path)
+                except OSError:
+                    pass
+                time.sleep(interval)
+
+        threading.Thread(target=write_periodically, name="psl-metrics-file", daemon=True).start()
+    return True
+
@@ -0,0 +1,209 @@
+"""
+PSL Analytics Hub - Render Profiler
+===================================
+Opt-in per-rerun timing of tabs, fetches, components, view models and heavy
+Streamlit elements (``PSL_PROFILE=1``).
+
+Each rerun builds a tree of spans on the script thread:
+
+- ``tab``: ``tabs.render_*``
+- ``fetch``: ``fetch_api`` / ``fetch_many``
+- ``component``: ``components.render_*``
+- ``view``: view models and frame conversion (pandas, Plotly figures)
+- ``streamlit``: ``st.plotly_chart``, ``st.image``, ``st.dataframe``, ``st.table``
+
+The tree is shown under the page, and the last ``PSL_PROFILE_HISTORY``
+reruns of a session can be downloaded as JSON.
+
+When profiling is off, :func:`profiled` returns the function unchanged, so
+the instrumentation costs nothing.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from collections.abc import Callable
+
+import streamlit as st
+
+from .config import PROFILE_HISTORY, PROFILE_RENDERS
+
+# Streamlit elements timed while profiling
+STREAMLIT_ELEMENTS = ("plotly_chart", "image", "dataframe", "table")
+
+_HISTORY_KEY = "_render_profiles"
+
+# Open span stack of the rerun running on this thread (unset outside a rerun)
+_local = threading.local()
+
+
+class Span:
+    """One timed call and the calls made inside it."""
+
+    __slots__ = ("name", "kind", "started", "seconds", "children")
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.children: list[Span] = []
+
+    def to_dict(self) -> dict:
+        child_seconds = sum(child.seconds for child in self.children)
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "ms": round(1000 * self.seconds, 2),
+            "self_ms": round(1000 * max(self.seconds - child_seconds, 0.0), 2),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class _SpanContext:
+    __slots__ = ("name", "kind", "span")
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.span = None
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack:
+            self.span = Span(self.name, self.kind)
+            stack[-1].children.append(self.span)
+            stack.append(self.span)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.span is not None:
+            self.span.seconds = time.perf_counter() - self.span.started
+            _local.stack.pop()
+        return False
+
+
+def span(name: str, kind: str) -> _SpanContext:
+    """Time a block as a child of the current span (no-op outside a profiled rerun)."""
+    return _SpanContext(name, kind)
+
+
+def profiled(kind: str, label: Callable[..., str] | None = None):
+    """
+    Decorator that times each call as a ``kind`` span.
+
+    Args:
+        kind: Span kind shown in the breakdown
+        label: Builds the span name from the call's arguments (defaults to
+            the function name)
+
+    Returns:
+        The function itself when profiling is disabled
+    """
+
+    def decorate(func):
+        if not PROFILE_RENDERS:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label(*args, **kwargs) if label else func.__name__, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+_instrumented = False
+
+
+def _instrument_streamlit():
+    """Wrap heavy ``st.*`` elements once per process."""
+    global _instrumented
+    if _instrumented:
+        return
+    _instrumented = True
+    for name in STREAMLIT_ELEMENTS:
+        setattr(st, name, profiled("streamlit", lambda *a, _name=name, **k: f"st.{_name}")(getattr(st, name)))
+
+
+def start_rerun():
+    """Open the root span of this rerun."""
+    if not PROFILE_RENDERS:
+        return
+    _instrument_streamlit()
+    _local.stack = [Span("rerun", "rerun")]
+
+
+def finish_rerun() -> dict | None:
+    """Close this rerun's profile and keep it in the session history."""
+    stack = getattr(_local, "stack", None)
+    if not stack:
+        return None
+    root = stack[0]
+    root.seconds = time.perf_counter() - root.started
+    _local.stack = None
+
+    profile = {"at": time.strftime("%Y-%m-%dT%H:%M:%S"), **root.to_dict()}
+    history = st.session_state.setdefault(_HISTORY_KEY, [])
+    history.append(profile)
+    del history[:-PROFILE_HISTORY]
+    return profile
+
+
+def flatten(profile: dict, min_ms: float = 0.0) -> list[dict]:
+    """Depth-first rows of a profile tree with indented names."""
+    total = profile["ms"] or 1.0
+    rows = []
+
+    def visit(node: dict, depth: int):
+        if depth and node["ms"] < min_ms:
+            return
+        rows.append({
+            "span": "  " * depth + node["name"],
+            "kind": node["kind"],
+            "ms": node["ms"],
+            "self_ms": node["self_ms"],
+            "pct": round(100 * node["ms"] / total, 1),
+        })
+        for child in node["children"]:
+            visit(child, depth + 1)
+
+    visit(profile, 0)
+    return rows
+
+
+def kind_totals(profile: dict) -> dict[str, float]:
+    """Self time per span kind, so nested spans are not counted twice."""
+    totals: dict[str, float] = {}
+
+    def visit(node: dict):
+        totals[node["kind"]] = round(totals.get(node["kind"], 0.0) + node["self_ms"], 2)
+        for child in node["children"]:
+            visit(child)
+
+    visit(profile)
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def render_profile(profile: dict | None):
+    """Show this rerun's breakdown and offer the session's recent profiles for download."""
+    if profile is None:
+        return
+    with st.expander(f"⏱️ Render profile: {profile['ms']:.0f} ms"):
+        totals = " · ".join(f"{kind} {ms:.0f} ms" for kind, ms in kind_totals(profile).items())
+        st.caption(f"Self time by kind: {totals}")
+        min_ms = st.number_input("Hide spans faster than (ms)", min_value=0.0, value=1.0, step=0.5, key="profile_min_ms")
+        st.dataframe(flatten(profile, min_ms), hide_index=True, use_container_width=True)
+        history = st.session_state.get(_HISTORY_KEY, [])
+        st.download_button(
+            f"Download last {len(history)} rerun profiles",
+            data=json.dumps(history, indent=2),
+            file_name="psl_render_profiles.json",
+            mime="application/json",
+            on_click="ignore",
+            key="profile_download",
+        )
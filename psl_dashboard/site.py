@@ -0,0 +1,642 @@
+"""
+PSL Analytics Hub - Static Site Export
+======================================
+Pre-render every player, bowler and team page, the leaderboards and the
+head-to-head matrix to static HTML, so read-only browsing can be served from
+a CDN while the Streamlit app handles interactive comparisons.
+
+Pages reuse the dashboard's view models (metric cards, growth, squad and
+head-to-head charts) and leaderboard definitions. Charts are embedded Plotly
+figures sharing one copy of plotly.js, and player photos and team logos are
+shrunk to thumbnails.
+
+- Payloads are fetched in the parent on a bounded thread pool, through the
+  API or the local engine, chunk by chunk as in :mod:`psl_dashboard.export`.
+- Pages are rendered and written on a process pool.
+- Builds are incremental. Each page's payloads, options and image are
+  hashed into ``.manifest.json``, and only pages whose hash changed are
+  re-rendered. Pages of entities that disappeared are removed.
+- A page whose fetch fails, or whose main payload is missing, is reported
+  as failed and keeps its previous file and manifest entry.
+
+Files are replaced atomically, so a sync to the CDN never picks up a
+half-written page.
+
+Usage:
+    python -m psl_dashboard.site --out site --local --data Data/PSL.csv --workers 4
+    python -m psl_dashboard.site --out site --app-url https://psl.example.com --kinds players leaderboards
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import requests
+
+from .api import encode_value
+from .config import (
+    API_BASE_URL,
+    FETCH_CONCURRENCY,
+    LOCAL_DATA_PATH,
+    PERCENTILE_MIN_INNINGS,
+    PLACEHOLDER_IMAGE,
+    PROJECT_NAME,
+    SITE_OUT_PATH,
+    get_team_logo,
+)
+from .export import EXPORT_CHUNK_SIZE, Fetcher, api_fetcher, entity_names, local_fetcher
+from .frames import payload_hash
+
+# Bump when page markup changes so every page is re-rendered
+SITE_FORMAT_VERSION = 1
+MANIFEST_FILE = ".manifest.json"
+
+SITE_KINDS = ("players", "bowlers", "teams", "leaderboards")
+ENTITY_KINDS = ("players", "bowlers", "teams")
+
+# Pages that link to entity pages, so the slug map is one of their inputs
+_LINKING_PAGES = {"home", "teams", "teams-index", "players-index", "bowlers-index"}
+
+# Longest side of generated thumbnails, in pixels
+THUMBNAIL_SIZE = 240
+
+SITE_CSS = """
+body { font-family: system-ui, sans-serif; margin: 0; color: #1f2933; background: #f7f9fb; }
+nav { background: #01411c; padding: 0.75rem 1.5rem; }
+nav a { color: #fff; margin-right: 1.25rem; text-decoration: none; font-weight: 600; }
+main { max-width: 1100px; margin: 0 auto; padding: 1.5rem; }
+footer { max-width: 1100px; margin: 0 auto; padding: 1rem 1.5rem 2rem; color: #6b7785; font-size: 0.85rem; }
+.hero { display: flex; align-items: center; gap: 1.25rem; }
+.hero img { width: 120px; height: auto; border-radius: 8px; }
+.cards { display: grid; grid-template-columns: repeat(auto-fill, minmax(150px, 1fr)); gap: 0.75rem; margin: 1rem 0; }
+.card { background: #fff; border-radius: 8px; padding: 0.75rem; box-shadow: 0 1px 2px rgba(0, 0, 0, 0.08); }
+.card .label { display: block; font-size: 0.8rem; color: #6b7785; }
+.card .value { display: block; font-size: 1.5rem; font-weight: 600; }
+.card .pct { display: block; font-size: 0.75rem; color: #6b7785; }
+table.data { border-collapse: collapse; background: #fff; margin: 0.5rem 0 1rem; font-size: 0.9rem; }
+table.data th, table.data td { padding: 0.35rem 0.6rem; border-bottom: 1px solid #e4e7eb; text-align: right; }
+table.data th:first-child, table.data td:first-child { text-align: left; }
+.grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 1rem; }
+ul.names { columns: 3; list-style: none; padding: 0; }
+.caption { color: #6b7785; font-size: 0.85rem; }
+"""
+
+
+class Page(NamedTuple):
+    """One output page: its path under the site root, renderer and entity."""
+
+    path: str
+    kind: str
+    name: str = ""
+
+
+class Site(NamedTuple):
+    """What every page of one build shares: links, sections and assets."""
+
+    slugs: dict[str, dict[str, str]]
+    kinds: tuple[str, ...]
+    plotly_js: str
+    app_url: str | None = None
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "page"
+
+
+def _slugs(names: list[str]) -> dict[str, str]:
+    """URL slug per name; names that collide get a numeric suffix in sorted order."""
+    slugs: dict[str, str] = {}
+    used: set[str] = set()
+    for name in sorted(names):
+        slug = base = slugify(name)
+        counter = 2
+        while slug in used:
+            slug = f"{base}-{counter}"
+            counter += 1
+        used.add(slug)
+        slugs[name] = slug
+    return slugs
+
+
+def _memoized(fetch: Fetcher) -> Fetcher:
+    """Share payloads between pages (e.g. a player's stats on their page and their team's squad)."""
+    cache: dict[str, object] = {}
+    lock = threading.Lock()
+
+    def fetch_once(endpoint: str, params: dict | None = None):
+        key = json.dumps([endpoint, params], sort_keys=True, default=str)
+        with lock:
+            if key in cache:
+                return cache[key]
+        payload = fetch(endpoint, params)
+        with lock:
+            cache[key] = payload
+        return payload
+
+    return fetch_once
+
+
+# ---------------------------------------------------------------------------
+# Payloads (parent process)
+# ---------------------------------------------------------------------------
+
+def _overall(payload) -> dict | None:
+    if not isinstance(payload, dict):
+        return None
+    return payload.get("overall") or payload.get("all") or payload
+
+
+def _entity_payloads(kind: str, name: str, fetch: Fetcher, local: bool) -> dict:
+    endpoint = f"/{kind}/{encode_value(name)}"
+    payloads = {"stats": fetch(f"{endpoint}/stats")}
+    if kind == "players":
+        payloads["growth"] = fetch(f"{endpoint}/growth")
+    # Percentiles and similar players come from the local engine only
+    if local:
+        payloads["percentiles"] = fetch(f"{endpoint}/percentiles", {"min_innings": PERCENTILE_MIN_INNINGS})
+        payloads["similar"] = fetch(f"{endpoint}/similar", {"limit": 5})
+    return payloads
+
+
+def _team_payloads(team: str, fetch: Fetcher) -> dict:
+    from .tabs.teams import squad_members
+
+    endpoint = f"/teams/{encode_value(team)}"
+    squad = squad_members(fetch(f"{endpoint}/all"), lambda endpoints: {each: fetch(each) for each in endpoints})
+    return {"stats": fetch(f"{endpoint}/stats"), "squad": squad}
+
+
+def _payloads(page: Page, fetch: Fetcher, names: dict[str, list[str]], local: bool) -> dict:
+    """Everything ``page`` renders from, fetched through ``fetch``."""
+    if page.kind in ("players", "bowlers"):
+        return _entity_payloads(page.kind, page.name, fetch, local)
+    if page.kind == "teams":
+        return _team_payloads(page.name, fetch)
+    if page.kind == "leaderboards":
+        from .tabs.leaderboards import LEADERBOARDS
+
+        return {board["endpoint"]: fetch(board["endpoint"]) for board in LEADERBOARDS}
+    if page.kind == "teams-index":
+        from .tabs.teams import head_to_head_endpoint
+
+        teams = names["teams"]
+        pairs = {f"{a}|{b}": fetch(head_to_head_endpoint(a, b)) for i, a in enumerate(teams) for b in teams[i + 1 :]}
+        return {
+            "pairs": {key: payload for key, payload in pairs.items() if isinstance(payload, dict)},
+            "totals": fetch("/teams/top-totals"),
+            "chases": fetch("/teams/top-chases"),
+        }
+    # Home and list pages only need the entity names
+    return {}
+
+
+def _fetch_page(page: Page, fetch: Fetcher, names: dict[str, list[str]], local: bool) -> tuple[dict | None, str | None]:
+    """A page's payloads, or the reason it cannot be rendered this build."""
+    try:
+        payloads = _payloads(page, fetch, names, local)
+    except requests.RequestException as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+    if page.kind in ENTITY_KINDS and payloads.get("stats") is None:
+        return None, "no stats available"
+    if page.kind == "leaderboards" and all(payload is None for payload in payloads.values()):
+        return None, "no leaderboards available"
+    return payloads, None
+
+
+def _image_source(page: Page) -> str | None:
+    from .utils import local_image_for_name
+
+    if page.kind == "players" or page.kind == "bowlers":
+        return local_image_for_name(page.name) or PLACEHOLDER_IMAGE
+    if page.kind == "teams":
+        return get_team_logo(page.name) or local_image_for_name(page.name, base_dir="images") or PLACEHOLDER_IMAGE
+    return None
+
+
+def _image_fingerprint(source: str | None):
+    if not source or "://" in source:
+        return source
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    return [source, stat.st_size, stat.st_mtime_ns]
+
+
+# ---------------------------------------------------------------------------
+# Rendering (pool workers)
+# ---------------------------------------------------------------------------
+
+def _thumbnail(source: str | None, out_dir: Path) -> str | None:
+    """Write a thumbnail of ``source`` under ``assets/thumbs``; returns its site-relative path."""
+    if not source:
+        return None
+    if "://" in source:
+        return source
+    from PIL import Image
+
+    target = out_dir / "assets" / "thumbs" / f"{Path(source).stem}.webp"
+    relative = target.relative_to(out_dir).as_posix()
+    if target.exists() and target.stat().st_mtime_ns >= os.stat(source).st_mtime_ns:
+        return relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as image:
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        image.save(temporary, format="WEBP", quality=80)
+    os.replace(temporary, target)
+    return relative
+
+
+def _escape(value) -> str:
+    return html.escape("N/A" if value in (None, "", []) else str(value))
+
+
+def _cards(metrics: list[tuple[str, object]], percentiles: list | None = None) -> str:
+    from .components import _ordinal
+
+    percentiles = percentiles or [None] * len(metrics)
+    cards = []
+    for (label, value), percentile in zip(metrics, percentiles):
+        note = f'<span class="pct">{_ordinal(int(round(percentile)))} percentile</span>' if percentile is not None else ""
+        cards.append(f'<div class="card"><span class="label">{html.escape(label)}</span><span class="value">{_escape(value)}</span>{note}</div>')
+    return f'<div class="cards">{"".join(cards)}</div>'
+
+
+def _table(frame, index: bool = True) -> str:
+    return frame.to_html(classes="data", border=0, index=index, na_rep="—", float_format=lambda value: f"{value:,.2f}")
+
+
+def _chart(fig, chart_id: str) -> str:
+    # Fixed div ids keep unchanged pages byte-identical between builds
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=chart_id, config={"displayModeBar": False, "responsive": True})
+
+
+def _link(root: str, kind: str, name: str, site: Site) -> str:
+    slug = site.slugs.get(kind, {}).get(name)
+    if slug is None:
+        return html.escape(name)
+    return f'<a href="{root}{kind}/{slug}.html">{html.escape(name)}</a>'
+
+
+def _hero(title: str, thumbnail: str | None, root: str) -> str:
+    image = ""
+    if thumbnail:
+        src = thumbnail if "://" in thumbnail else f"{root}{thumbnail}"
+        image = f'<img src="{html.escape(src)}" alt="{html.escape(title)}" loading="lazy">'
+    return f'<div class="hero">{image}<h1>{html.escape(title)}</h1></div>'
+
+
+def _vs_teams(stats: dict, heading: str) -> str:
+    from .frames import to_frame
+
+    vs_teams = stats.get("against") or stats.get("againstTeams")
+    if not vs_teams:
+        return ""
+    return f"<h2>{heading}</h2>{_table(to_frame(vs_teams, 'team'), index=False)}"
+
+
+def _render_entity(page: Page, payloads: dict, thumbnail: str | None, root: str, site: Site) -> str:
+    from .frames import to_frame
+    from .view_models import entity_metrics, growth_view, metric_percentiles
+
+    stats = payloads.get("stats")
+    overall = _overall(stats)
+    if not overall:
+        return f"<h1>{html.escape(page.name)}</h1><p>No data available.</p>"
+    singular = page.kind[:-1]
+    metrics = entity_metrics(singular, overall)
+    title = f"Overall Stats: {page.name}" if singular == "player" else f"Overall Bowling Stats: {page.name}"
+    parts = [_hero(page.name, thumbnail, root), f"<h2>{html.escape(title)}</h2>"]
+    percentiles = payloads.get("percentiles") if isinstance(payloads.get("percentiles"), dict) else None
+    parts.append(_cards(metrics, metric_percentiles(singular, percentiles)))
+    if percentiles:
+        parts.append(f'<p class="caption">Percentiles: career vs {percentiles["population"]} players with {PERCENTILE_MIN_INNINGS}+ innings</p>')
+
+    similar = payloads.get("similar")
+    if similar:
+        frame = to_frame(similar).rename(columns=lambda column: column.replace("_", " ").title())
+        parts.append(f"<h2>{singular.title()}s like {html.escape(page.name)}</h2>{_table(frame, index=False)}")
+    parts.append(_vs_teams(stats, "Performance vs Teams" if singular == "player" else "Bowling vs Teams"))
+
+    growth = payloads.get("growth")
+    view = growth_view(page.name, growth) if growth else None
+    if view:
+        parts.append(f"<h2>Season Growth</h2>{_chart(view[1], 'growth')}")
+    return "".join(parts)
+
+
+def _render_team(page: Page, payloads: dict, thumbnail: str | None, root: str, site: Site) -> str:
+    from .view_models import squad_view, team_metrics
+
+    stats = payloads.get("stats")
+    overall = _overall(stats)
+    if not overall:
+        return f"<h1>{html.escape(page.name)}</h1><p>No data available.</p>"
+    parts = [_hero(page.name, thumbnail, root), _cards(team_metrics(overall)), _vs_teams(stats, "Performance vs Opponents")]
+    squad = payloads.get("squad")
+    if squad:
+        from .tabs.teams import squad_caption
+
+        table, fig = squad_view(page.name, squad)
+        if not table.empty:
+            table = table.copy()
+            table.index = [_link(root, "players", name, site) for name in table.index]
+            parts.append(f"<h2>Squad ({len(table)} players)</h2>")
+            parts.append(f'<p class="caption">{html.escape(squad_caption(squad, page.name))}</p>')
+            parts.append(table.to_html(classes="data", border=0, escape=False, na_rep="—", float_format=lambda value: f"{value:,.1f}"))
+            if fig is not None:
+                parts.append(f"<h3>Season Runs by Player</h3>{_chart(fig, 'squad')}")
+    return "".join(parts)
+
+
+def _render_teams_index(page: Page, payloads: dict, thumbnail: str | None, root: str, site: Site) -> str:
+    from .frames import to_frame
+    from .view_models import h2h_matrix
+
+    teams = list(site.slugs.get("teams", {}))
+    links = "".join(f"<li>{_link(root, 'teams', team, site)}</li>" for team in teams)
+    parts = ["<h1>Teams</h1>", f'<ul class="names">{links}</ul>']
+    if payloads["pairs"]:
+        _, fig = h2h_matrix(teams, payloads["pairs"])
+        parts.append(f"<h2>Head-to-Head Matrix</h2>{_chart(fig, 'h2h')}")
+        parts.append('<p class="caption">Row team\'s wins / matches against the column team.</p>')
+    highlights = []
+    for key, heading, renames in (
+        ("totals", "Most runs scored (team totals)", {"batting_team": "Team", "total_runs": "Total Runs"}),
+        ("chases", "Most runs chased (successful chases)", {"batting_team": "Team", "target": "Target"}),
+    ):
+        if payloads[key]:
+            highlights.append(f"<div><h3>{heading}</h3>{_table(to_frame(payloads[key]).rename(columns=renames), index=False)}</div>")
+    if highlights:
+        parts.append(f'<h2>Team Highlights</h2><div class="grid">{"".join(highlights)}</div>')
+    return "".join(parts)
+
+
+def _render_leaderboards(page: Page, payloads: dict, thumbnail: str | None, root: str, site: Site) -> str:
+    from .tabs.leaderboards import LEADERBOARDS, leaderboard_frame
+
+    boards = []
+    for board in LEADERBOARDS:
+        data = payloads.get(board["endpoint"])
+        frame = leaderboard_frame(data, board["columns"]) if data else None
+        body = _table(frame, index=False) if frame is not None else "<p>No data available.</p>"
+        boards.append(f'<div><h3>{html.escape(board["title"])}</h3>{body}<p class="caption">{html.escape(board["caption"])}</p></div>')
+    return f'<h1>Leaderboards</h1><div class="grid">{"".join(boards)}</div>'
+
+
+def _render_list(page: Page, payloads: dict, thumbnail: str | None, root: str, site: Site) -> str:
+    kind = page.kind.removesuffix("-index")
+    items = "".join(f"<li>{_link(root, kind, name, site)}</li>" for name in site.slugs.get(kind, {}))
+    return f'<h1>{kind.title()}</h1><ul class="names">{items}</ul>'
+
+
+def _render_home(page: Page, payloads: dict, thumbnail: str | None, root: str, site: Site) -> str:
+    items = []
+    for label, href in _sections(root, site):
+        count = len(site.slugs.get(label.lower(), {}))
+        items.append(f'<li><a href="{href}">{label}</a>{f" ({count})" if count else ""}</li>')
+    return f"<h1>{html.escape(PROJECT_NAME)}</h1><ul>{''.join(items)}</ul>"
+
+
+_RENDERERS: dict[str, Callable[..., str]] = {
+    "players": _render_entity,
+    "bowlers": _render_entity,
+    "teams": _render_team,
+    "teams-index": _render_teams_index,
+    "players-index": _render_list,
+    "bowlers-index": _render_list,
+    "leaderboards": _render_leaderboards,
+    "home": _render_home,
+}
+
+
+def _sections(root: str, site: Site) -> list[tuple[str, str]]:
+    """(label, href) of each published section."""
+    return [
+        (kind.title(), f"{root}{kind}/index.html" if kind in ENTITY_KINDS else f"{root}{kind}.html")
+        for kind in site.kinds
+    ]
+
+
+def _layout(title: str, body: str, root: str, site: Site) -> str:
+    nav = [f'<a href="{root}index.html">Home</a>']
+    nav += [f'<a href="{href}">{label}</a>' for label, href in _sections(root, site)]
+    if site.app_url:
+        nav.append(f'<a href="{html.escape(site.app_url)}">Compare &amp; explore</a>')
+    script = f'<script src="{root}{site.plotly_js}"></script>' if 'class="plotly-graph-div"' in body else ""
+    return (
+        '<!doctype html>\n<html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f"<title>{html.escape(title)} · {html.escape(PROJECT_NAME)}</title>"
+        f'<link rel="stylesheet" href="{root}assets/site.css">{script}</head>'
+        f'<body><nav>{"".join(nav)}</nav><main>{body}</main>'
+        f"<footer>Static snapshot of the {html.escape(PROJECT_NAME)}.</footer></body></html>\n"
+    )
+
+
+def _write_text(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(text, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def render_page(out_dir: str, page: Page, payloads: dict, image: str | None, site: Site) -> tuple[str, float]:
+    """Render one page and write it under ``out_dir`` (runs in a pool worker)."""
+    started = time.perf_counter()
+    out = Path(out_dir)
+    root = "../" * page.path.count("/")
+    thumbnail = _thumbnail(image, out)
+    body = _RENDERERS[page.kind](page, payloads, thumbnail, root, site)
+    title = page.name or page.kind.removesuffix("-index").title()
+    _write_text(out / page.path, _layout(title, body, root, site))
+    return page.path, time.perf_counter() - started
+
+
+def _noop():
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def _write_assets(out_dir: Path) -> str:
+    """Write the stylesheet and plotly.js; returns plotly.js's site-relative path."""
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    # Versioned name, so a CDN can cache it forever
+    plotly_js = f"assets/plotly-{get_plotlyjs_version()}.min.js"
+    if not (out_dir / plotly_js).exists():
+        _write_text(out_dir / plotly_js, get_plotlyjs())
+    _write_text(out_dir / "assets" / "site.css", SITE_CSS.lstrip())
+    return plotly_js
+
+
+def _site_pages(site: Site) -> list[Page]:
+    pages = [Page("index.html", "home")]
+    for kind in site.kinds:
+        if kind in ENTITY_KINDS:
+            pages.append(Page(f"{kind}/index.html", f"{kind}-index"))
+            pages.extend(Page(f"{kind}/{slug}.html", kind, name) for name, slug in site.slugs[kind].items())
+        else:
+            pages.append(Page(f"{kind}.html", kind))
+    return pages
+
+
+def _read_manifest(out_dir: Path) -> dict:
+    try:
+        manifest = json.loads((out_dir / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("pages", {}) if manifest.get("version") == SITE_FORMAT_VERSION else {}
+
+
+def build_site(
+    out_dir: str | Path,
+    fetch: Fetcher,
+    kinds: Iterable[str] = SITE_KINDS,
+    workers: int | None = None,
+    fetch_workers: int = FETCH_CONCURRENCY,
+    local: bool = False,
+    app_url: str | None = None,
+    force: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> dict:
+    """
+    Render the static site, re-rendering only pages whose inputs changed.
+
+    Args:
+        out_dir: Site root
+        fetch: Endpoint fetcher (see :func:`psl_dashboard.export.api_fetcher`)
+        kinds: Subset of :data:`SITE_KINDS` to publish
+        workers: Render process pool size (defaults to the CPU count)
+        fetch_workers: Maximum concurrent requests
+        local: ``fetch`` is the local engine (adds percentiles and similar players)
+        app_url: Live dashboard URL linked from every page
+        force: Re-render every page
+        chunk_size: Pages fetched before their renders are queued
+
+    Returns:
+        Counts of rendered, unchanged, removed and failed pages, and the
+        slowest renders
+
+    Raises:
+        requests.RequestException: If the entity lists cannot be fetched
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    kinds = tuple(kind for kind in SITE_KINDS if kind in set(kinds))
+    fetch = _memoized(fetch)
+    names = {kind: entity_names(kind, fetch) for kind in ENTITY_KINDS if kind in kinds}
+    site = Site({kind: _slugs(entity) for kind, entity in names.items()}, kinds, _write_assets(out), app_url)
+    previous = _read_manifest(out)
+    pages = _site_pages(site)
+    options = {"version": SITE_FORMAT_VERSION, "local": local, "app_url": app_url, "plotly": site.plotly_js, "kinds": kinds}
+
+    hashes: dict[str, str] = {}
+    rendered: dict[str, float] = {}
+    failed: dict[str, str] = {}
+    unchanged = 0
+    with ProcessPoolExecutor(max_workers=workers) as render_pool:
+        # Start the workers before any fetch threads exist; forking a
+        # process with running threads can deadlock the child
+        render_pool.submit(_noop).result()
+        futures: dict[str, Future] = {}
+        with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as fetch_pool:
+            for start in range(0, len(pages), chunk_size):
+                chunk = pages[start : start + chunk_size]
+                for page, (payloads, error) in zip(chunk, fetch_pool.map(lambda page: _fetch_page(page, fetch, names, local), chunk)):
+                    if error is not None:
+                        # Keep the last good page rather than render a gap
+                        failed[page.path] = error
+                        if page.path in previous:
+                            hashes[page.path] = previous[page.path]
+                        continue
+                    image = _image_source(page)
+                    links = site.slugs if page.kind in _LINKING_PAGES else None
+                    digest = payload_hash({"options": options, "payloads": payloads, "image": _image_fingerprint(image), "links": links})
+                    hashes[page.path] = digest
+                    if not force and previous.get(page.path) == digest and (out / page.path).exists():
+                        unchanged += 1
+                        continue
+                    futures[page.path] = render_pool.submit(render_page, str(out), page, payloads, image, site)
+        for path, future in futures.items():
+            try:
+                rendered[path] = future.result()[1]
+            except Exception as exc:  # a failed page is reported, not fatal
+                failed[path] = f"{type(exc).__name__}: {exc}"
+                hashes.pop(path, None)
+
+    removed = 0
+    for path in set(previous) - set(hashes) - set(failed):
+        # Only pages this build no longer publishes (kinds left out keep theirs)
+        if path.split("/", 1)[0].removesuffix(".html") in kinds:
+            (out / path).unlink(missing_ok=True)
+            removed += 1
+        else:
+            hashes[path] = previous[path]
+    _write_text(out / MANIFEST_FILE, json.dumps({"version": SITE_FORMAT_VERSION, "built_at": time.time(), "pages": hashes}, indent=1, sort_keys=True))
+    return {
+        "pages": len(pages),
+        "rendered": len(rendered),
+        "unchanged": unchanged,
+        "removed": removed,
+        "failed": failed,
+        "slowest": dict(sorted(rendered.items(), key=lambda item: item[1], reverse=True)[:5]),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-render the dashboard's read-only pages to a static site.")
+    parser.add_argument("--out", default=SITE_OUT_PATH, help="Site root directory")
+    parser.add_argument("--kinds", nargs="*", choices=SITE_KINDS, default=list(SITE_KINDS), help="Sections to publish")
+    parser.add_argument("--api-base", default=API_BASE_URL, help="API base URL")
+    parser.add_argument("--local", action="store_true", help="Compute pages from the local dataset instead of the API")
+    parser.add_argument("--data", default=LOCAL_DATA_PATH, help="Ball-by-ball dataset used with --local")
+    parser.add_argument("--workers", type=int, default=None, help="Render process pool size")
+    parser.add_argument("--fetch-workers", type=int, default=FETCH_CONCURRENCY, help="Maximum concurrent requests")
+    parser.add_argument("--app-url", help="Live dashboard URL linked from every page")
+    parser.add_argument("--force", action="store_true", help="Re-render unchanged pages too")
+    args = parser.parse_args(argv)
+
+    if args.local:
+        from .engine import DeliveryStore
+
+        fetch = local_fetcher(DeliveryStore.from_path(args.data))
+    else:
+        fetch = api_fetcher(args.api_base.rstrip("/"))
+
+    started = time.perf_counter()
+    try:
+        summary = build_site(args.out, fetch, args.kinds, args.workers, args.fetch_workers, args.local, args.app_url, args.force)
+    except requests.RequestException as exc:
+        # The entity lists could not be fetched; the previous build is left as it was
+        print(f"Site build failed: {exc}", file=sys.stderr)
+        return 1
+    for path, seconds in summary["slowest"].items():
+        print(f"  {path:<48} {seconds * 1000:8.1f} ms")
+    for path, error in summary["failed"].items():
+        print(f"  failed {path}: {error}", file=sys.stderr)
+    print(
+        f"Rendered {summary['rendered']} of {summary['pages']} pages ({summary['unchanged']} unchanged, "
+        f"{summary['removed']} removed) in {time.perf_counter() - started:.2f}s -> {args.out}"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+PSL Analytics Hub - Startup Profile
+===================================
+Measure the import cost of the dashboard's first script run with
+``python -X importtime`` and check it against the startup budget.
+
+``app.main`` renders every tab inside ``st.tabs`` on each run, so the first
+run imports every tab module and the libraries they use (pandas, Plotly).
+The profile therefore runs ``app.py`` once, headlessly with ``AppTest`` in
+a fresh interpreter, instead of timing ``import app`` alone. Anything
+imported during that run counts towards the budget; Streamlit itself and
+the test harness are preloaded and reported separately.
+
+The run fetches data from the configured source (``PSL_API_BASE`` or the
+local dataset), so its wall time is reported too, but only import cost is
+checked against the budget.
+
+Usage:
+    python -m psl_dashboard.startup
+    python -m psl_dashboard.startup --budget-ms 300 --top 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+from .config import BASE_DIR, STARTUP_BUDGET_MS
+
+# Imported before measuring; the Streamlit server (or the test harness) has already loaded these
+PRELOADED_MODULES = ["streamlit", "streamlit.testing.v1"]
+
+# Modules the harness imports while running the script; not part of a real first render
+HARNESS_PREFIXES = ("streamlit.testing",)
+
+# Written to stderr between the preloaded imports and the first run
+_FIRST_RUN_MARKER = "--- first run ---"
+
+# Runs app.py once and prints the run's wall time and its render profile as JSON on stdout
+_FIRST_RUN_SCRIPT = f"""
+import json, sys, time
+{"; ".join(f"import {module}" for module in PRELOADED_MODULES)}
+from streamlit.testing.v1 import AppTest
+print({_FIRST_RUN_MARKER!r}, file=sys.stderr, flush=True)
+at = AppTest.from_file("app.py", default_timeout=120)
+started = time.perf_counter()
+at.run()
+seconds = time.perf_counter() - started
+profiles = at.session_state["_render_profiles"] if "_render_profiles" in at.session_state else []
+print(json.dumps({{"seconds": seconds, "profile": profiles[-1] if profiles else None}}))
+"""
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_importtime(output: str) -> list[dict]:
+    """
+    Parse ``-X importtime`` output.
+
+    Rows after the first-run marker are flagged with ``first_run``.
+
+    Args:
+        output: stderr of a ``python -X importtime`` run
+
+    Returns:
+        List of dicts with module, depth, self_us, cumulative_us and first_run
+    """
+    rows = []
+    first_run = False
+    for line in output.splitlines():
+        if line.strip() == _FIRST_RUN_MARKER:
+            first_run = True
+            continue
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module,
+            "depth": (len(indent) - 1) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "first_run": first_run,
+        })
+    return rows
+
+
+def profile_first_run() -> tuple[list[dict], dict]:
+    """
+    Run ``app.py`` once in a fresh interpreter under ``-X importtime``.
+
+    The render profiler is switched on for the run, so time per tab is
+    available too.
+
+    Returns:
+        Import rows, and the run's wall time (``seconds``) and render profile
+
+    Raises:
+        RuntimeError: If the run fails
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _FIRST_RUN_SCRIPT],
+        cwd=BASE_DIR,
+        env={**os.environ, "PSL_PROFILE": "1", "PSL_METRICS_PORT": "0", "PSL_METRICS_FILE": ""},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"First run failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _tab_spans(node: dict | None):
+    if node is None:
+        return
+    if node["kind"] == "tab":
+        yield node
+    for child in node["children"]:
+        yield from _tab_spans(child)
+
+
+def build_report(rows: list[dict], run: dict, budget_ms: float, top: int = 15) -> dict:
+    """
+    Summarize import rows and the run into preloaded and first-run costs.
+
+    Tab modules are loaded with ``importlib``, which ``-X importtime`` does
+    not report, so their imports are attributed to the packages they load
+    and the tabs are timed with the render profiler instead.
+
+    Returns:
+        Dictionary with first-run import cost, time per tab, heaviest
+        packages, wall time and budget status
+    """
+    preloaded = {
+        module: max((row["cumulative_us"] / 1000 for row in rows if row["module"] == module and not row["first_run"]), default=0.0)
+        for module in PRELOADED_MODULES
+    }
+    first_run = [row for row in rows if row["first_run"] and not row["module"].startswith(HARNESS_PREFIXES)]
+    first_run_ms = sum(row["cumulative_us"] for row in first_run if row["depth"] == 0) / 1000
+    tabs = {span["name"].removeprefix("tabs.render_"): span["ms"] for span in _tab_spans(run["profile"])}
+
+    # Third-party packages loaded during the run, by their largest cumulative import
+    heaviest: dict[str, float] = {}
+    for row in first_run:
+        name = row["module"]
+        if "." not in name and name not in ("app", "psl_dashboard"):
+            heaviest[name] = max(heaviest.get(name, 0.0), row["cumulative_us"] / 1000)
+
+    return {
+        "preloaded_ms": preloaded,
+        "first_run_imports_ms": first_run_ms,
+        "tabs_ms": tabs,
+        "heaviest": sorted(heaviest.items(), key=lambda item: item[1], reverse=True)[:top],
+        "first_run_wall_ms": 1000 * run["seconds"],
+        "budget_ms": budget_ms,
+        "within_budget": first_run_ms <= budget_ms,
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = ["Startup import profile", "======================"]
+    lines.append("Preloaded by the Streamlit server (not counted):")
+    lines.extend(f"  {module:<36} {ms:8.1f} ms" for module, ms in report["preloaded_ms"].items())
+    status = "OK" if report["within_budget"] else "OVER BUDGET"
+    lines.append("First script run:")
+    lines.append(
+        f"  {'imports':<36} {report['first_run_imports_ms']:8.1f} ms"
+        f"  (budget {report['budget_ms']:.0f} ms: {status})"
+    )
+    lines.append(f"  {'wall time (includes data fetches)':<36} {report['first_run_wall_ms']:8.1f} ms")
+    lines.append("Time per tab in the first run (imports, fetches and rendering):")
+    lines.extend(f"  {tab:<36} {ms:8.1f} ms" for tab, ms in report["tabs_ms"].items())
+    lines.append("Heaviest packages loaded by the dashboard (cumulative):")
+    lines.extend(f"  {module:<36} {ms:8.1f} ms" for module, ms in report["heaviest"])
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Report the import cost of the dashboard's first script run.")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="First-run import budget")
+    parser.add_argument("--top", type=int, default=15, help="Number of heaviest dependencies to list")
+    args = parser.parse_args(argv)
+
+    rows, run = profile_first_run()
+    report = build_report(rows, run, args.budget_ms, args.top)
+    print(format_report(report))
+    return 0 if report["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,33 @@
-from .home import render_home
-from .players import render_players
-from .bowlers import render_bowlers
-from .teams import render_teams
-from .compare import render_compare
-from .leaderboards import render_leaderboards
-from .api_docs import render_api_docs
+"""
+Dashboard tabs.
+
+Tab modules are imported on first access rather than with the package, so
+importing ``psl_dashboard.tabs`` stays cheap for tools that only need one
+tab's helpers. ``app.main`` renders every tab inside ``st.tabs`` on each
+run, so the dashboard still imports all of them during its first run;
+``python -m psl_dashboard.startup`` measures that run.
+"""
+from importlib import import_module
+
+from ..profiler import profiled
+
+_TAB_MODULES = {
+    "render_home": ".home",
+    "render_players": ".players",
+    "render_bowlers": ".bowlers",
+    "render_teams": ".teams",
+    "render_compare": ".compare",
+    "render_leaderboards": ".leaderboards",
+    "render_api_docs": ".api_docs",
+}
+
+__all__ = list(_TAB_MODULES)
+
+
+def __getattr__(name: str):
+    module_name = _TAB_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    render = profiled("tab", lambda *args, **kwargs: f"tabs.{name}")(getattr(import_module(module_name, __name__), name))
+    globals()[name] = render
+    return render
@@ -1,6 +1,8 @@
+import tempfile
+
 import streamlit as st
 
-from ..config import get_base_url
+from ..config import LOCAL_DATA_PATH, LOCAL_INGEST_PATH, LOCAL_TABLES_PATH, get_base_url, is_local_source
 
 
 def render_api_docs(container):
@@ -38,3 +40,48 @@ def render_api_docs(container):
         st.code(f"{base_url}/teams/{{name}}/all", language="text")
         st.code(f"{base_url}/teams/top-totals", language="text")
         st.code(f"{base_url}/teams/top-chases", language="text")
+
+        render_bulk_export()
+
+
+def render_bulk_export():
+    """Download every player's, bowler's or team's stats as CSV or Parquet."""
+    from ..export import EXPORT_DATASETS, EXPORT_FORMATS, api_fetcher, export_file_name, iter_export, local_fetcher, write_export
+
+    st.markdown("### Bulk Export")
+    cols = st.columns(3)
+    with cols[0]:
+        kind = st.selectbox("Entities", list(EXPORT_DATASETS), key="export_kind")
+    with cols[1]:
+        dataset = st.selectbox("Dataset", list(EXPORT_DATASETS[kind]), key="export_dataset")
+    with cols[2]:
+        fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key="export_format")
+
+    # Resolved here: the download callable runs outside the script thread
+    if is_local_source():
+        from ..engine import get_live_store
+
+        fetch = local_fetcher(get_live_store(LOCAL_DATA_PATH, LOCAL_TABLES_PATH, LOCAL_INGEST_PATH).current())
+    else:
+        base_url = get_base_url()
+        if not base_url:
+            st.info("Configure the API base URL to export.")
+            return
+        fetch = api_fetcher(base_url)
+
+    def build_export():
+        # Chunks are spooled to disk; only the finished file is read back
+        out = tempfile.TemporaryFile()
+        write_export(iter_export(kind, dataset, fetch), out, fmt)
+        out.seek(0)
+        return out
+
+    st.download_button(
+        f"Export {kind} {dataset}",
+        data=build_export,
+        file_name=export_file_name(kind, dataset, fmt),
+        mime=EXPORT_FORMATS[fmt],
+        on_click="ignore",
+        key="export_download",
+    )
+    st.caption("Fetched and written in chunks when you click; also available as python -m psl_dashboard.export.")
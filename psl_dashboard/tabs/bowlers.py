@@ -1,8 +1,7 @@
-import pandas as pd
 import streamlit as st
 
 from ..api import bowler_endpoint, fetch_api, list_bowlers
-from ..components import render_endpoint_copy, render_metric_card, render_table
+from ..components import render_endpoint_copy, render_ranked_metrics, render_similar, render_table
 from ..config import PLACEHOLDER_IMAGE
 from ..utils import fuzzy_search, local_image_for_name
 
@@ -36,27 +35,13 @@ def render_bowler_stats(name: str, available_names: list[str]):
     img_path = local_image_for_name(name, base_dir="downloads_psl_players") or PLACEHOLDER_IMAGE
     st.image(img_path, caption=name, width=120)
     st.subheader(f"Overall Bowling Stats: {name}")
-    metrics = [
-        ("Innings", overall.get("innings")),
-        ("Wickets", overall.get("wicket")),
-        ("Economy", overall.get("economy")),
-        ("Average", overall.get("average")),
-        ("Strike Rate", overall.get("strikeRate")),
-        ("Best Figure", overall.get("best_figure")),
-        ("3W+", overall.get("three_w")),
-        ("Fours Conceded", overall.get("fours")),
-        ("Sixes Conceded", overall.get("sixes")),
-        ("Player of Match", overall.get("mom")),
-    ]
-    for chunk_start in range(0, len(metrics), 5):
-        cols = st.columns(5)
-        for col, (label, value) in zip(cols, metrics[chunk_start : chunk_start + 5]):
-            with col:
-                render_metric_card(label, value)
+    render_ranked_metrics("bowler", name, overall, bowler_endpoint(name))
+
+    render_similar("bowler", name, bowler_endpoint(name))
 
     vs_teams = stats.get("against") or stats.get("againstTeams")
     if vs_teams:
         st.markdown("#### Bowling vs Teams")
-        render_table(vs_teams, index_label="team")
+        render_table(vs_teams, index_label="team", key="bowler_vs_teams")
 
     render_endpoint_copy("Copy bowler stats endpoint:", f"{bowler_endpoint(name)}/stats")
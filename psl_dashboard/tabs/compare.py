@@ -1,12 +1,33 @@
+import time
+
 import streamlit as st
 
-from ..api import encode_value, fetch_api, list_bowlers, list_players, list_teams
+from ..api import (
+    bowler_endpoint,
+    encode_value,
+    fetch_api,
+    fetch_percentiles,
+    list_bowlers,
+    list_players,
+    list_teams,
+    fetch_many,
+    notify_cancelled,
+    player_endpoint,
+    team_endpoint,
+)
+from ..cancellation import FetchCancelled, current_token
 from ..components import render_comparison_chart, render_endpoint_copy, render_metric_card
-from ..config import PLACEHOLDER_IMAGE
+from ..config import COMPARE_RETRY_SECONDS, PERCENTILE_MIN_INNINGS, PLACEHOLDER_IMAGE, is_local_source
 from ..utils import local_image_for_name
+from ..view_models import MATCHUP_COLUMNS, comparison_table, matchup_view, multi_comparison_figure
 from .bowlers import render_bowler_stats
 from .players import render_player_stats
 
+# Maximum entities in an N-way comparison
+MAX_COMPARE = 10
+
+_ENTITY_ENDPOINTS = {"player": player_endpoint, "bowler": bowler_endpoint, "team": team_endpoint}
+
 
 def render_compare(container):
     with container:
@@ -17,6 +38,8 @@ def render_compare(container):
             player_names = list_players()
             if not player_names:
                 st.warning("Player list unavailable.")
+            elif st.toggle(f"Compare up to {MAX_COMPARE} players", key="cmp_p_multi"):
+                render_multi_select("player", player_names)
             else:
                 p1 = st.selectbox("Player 1", player_names, key="cmp_p1")
                 p2 = st.selectbox("Player 2", player_names, key="cmp_p2")
@@ -27,6 +50,8 @@ def render_compare(container):
             bowler_names = list_bowlers()
             if not bowler_names:
                 st.warning("Bowler list unavailable.")
+            elif st.toggle(f"Compare up to {MAX_COMPARE} bowlers", key="cmp_b_multi"):
+                render_multi_select("bowler", bowler_names)
             else:
                 b1 = st.selectbox("Bowler 1", bowler_names, key="cmp_b1")
                 b2 = st.selectbox("Bowler 2", bowler_names, key="cmp_b2")
@@ -35,10 +60,13 @@ def render_compare(container):
 
         with sub_tabs[2]:
             team_names = list_teams()
-            t1 = st.selectbox("Team 1", team_names, key="cmp_t1")
-            t2 = st.selectbox("Team 2", team_names, key="cmp_t2")
-            if t1 and t2 and t1 != t2:
-                render_team_comparison(t1, t2)
+            if st.toggle("Compare several teams", key="cmp_t_multi"):
+                render_multi_select("team", team_names)
+            else:
+                t1 = st.selectbox("Team 1", team_names, key="cmp_t1")
+                t2 = st.selectbox("Team 2", team_names, key="cmp_t2")
+                if t1 and t2 and t1 != t2:
+                    render_team_comparison(t1, t2)
 
         with sub_tabs[3]:
             player_names = list_players()
@@ -47,6 +75,77 @@ def render_compare(container):
             bowler = st.selectbox("Bowler", bowler_names, key="bat_vs_bowl_bowl")
             if batsman and bowler:
                 render_batsman_bowler_h2h(batsman, bowler)
+            render_matchup_matrix(player_names, bowler_names)
+
+
+def fetch_comparison(kind: str, names: list[str]) -> list[dict]:
+    """
+    Overall stats for every entity in one batched, cached request.
+
+    Records are matched to names by their ``player``/``bowler``/``team``
+    field. Names the response leaves out are fetched concurrently from
+    their ``/stats`` endpoints. A compare endpoint that fails is skipped by
+    the session for ``COMPARE_RETRY_SECONDS``, so an API without one is not
+    asked on every rerun.
+
+    Raises:
+        FetchCancelled: If the rerun is superseded or passes its deadline
+    """
+    plural = f"{kind}s"
+    compare_endpoint = f"/{plural}/compare"
+    unsupported = st.session_state.setdefault("_compare_unsupported", {})
+    now = time.monotonic()
+    by_name: dict[str, dict] = {}
+    with st.spinner(f"Comparing {len(names)} {plural}..."):
+        if now - unsupported.get(compare_endpoint, -COMPARE_RETRY_SECONDS) >= COMPARE_RETRY_SECONDS:
+            # The compare endpoints are read-only, so their POST responses can be cached
+            data = fetch_api(compare_endpoint, method="POST", json_data={plural: list(names)}, use_cache=True, suppress_warning=True)
+            records = data.get(plural) if isinstance(data, dict) else None
+            if isinstance(records, list):
+                unsupported.pop(compare_endpoint, None)
+                by_name = {str(record[kind]): record for record in records if isinstance(record, dict) and kind in record}
+            else:
+                # A cancelled request is not a missing endpoint
+                token = current_token()
+                if token is not None:
+                    token.check()
+                unsupported[compare_endpoint] = now
+        endpoints = {name: f"{_ENTITY_ENDPOINTS[kind](name)}/stats" for name in names if name not in by_name}
+        results = fetch_many(list(endpoints.values())) if endpoints else {}
+    for name, endpoint in endpoints.items():
+        payload = results.get(endpoint)
+        by_name[name] = (payload.get("overall") or payload) if isinstance(payload, dict) else {}
+    return [by_name[name] for name in names]
+
+
+def render_multi_select(kind: str, names: list[str]):
+    selected = st.multiselect(f"{kind.title()}s", names, max_selections=MAX_COMPARE, key=f"cmp_{kind}_multi_names")
+    if len(selected) < 2:
+        st.info(f"Select at least two {kind}s to compare.")
+        return
+    render_multi_comparison(kind, selected)
+
+
+def render_multi_comparison(kind: str, names: list[str]):
+    try:
+        records = fetch_comparison(kind, names)
+    except FetchCancelled as exc:
+        notify_cancelled(exc)
+        return
+    table = comparison_table(kind, names, records)
+    if table.isna().all(axis=None):
+        st.warning("No comparison data available.")
+        return
+    st.dataframe(table, use_container_width=True)
+    chart = st.radio("Chart", ["Radar", "Grouped bars"], horizontal=True, key=f"cmp_{kind}_multi_chart")
+    st.plotly_chart(multi_comparison_figure(kind, chart, table), use_container_width=True)
+    st.caption("Each metric is scaled across the selection: 1 is the best value and 0 the worst (economy, average and strike rate for bowlers are inverted).")
+
+
+def _career_percentiles(entity_endpoint: str) -> dict:
+    """Career percentiles by field (empty when unavailable)."""
+    payload = fetch_percentiles(entity_endpoint, None, PERCENTILE_MIN_INNINGS)
+    return (payload or {}).get("percentiles") or {}
 
 
 def render_player_comparison(p1: str, p2: str):
@@ -62,25 +161,27 @@ def render_player_comparison(p1: str, p2: str):
         st.warning("Unexpected comparison payload.")
         return
 
+    pct_a = _career_percentiles(player_endpoint(p1))
+    pct_b = _career_percentiles(player_endpoint(p2))
     cols = st.columns(2)
     with cols[0]:
         img_a = local_image_for_name(p1) or PLACEHOLDER_IMAGE
         st.image(img_a, caption=p1, width=120)
-        render_metric_card("Runs", player_a.get("runs"))
-        render_metric_card("Average", player_a.get("avg"))
-        render_metric_card("Strike Rate", player_a.get("strikeRate"))
-        render_metric_card("Hundreds", player_a.get("hundreds"))
-        render_metric_card("Fours", player_a.get("fours"))
-        render_metric_card("Sixes", player_a.get("sixes"))
+        render_metric_card("Runs", player_a.get("runs"), percentile=pct_a.get("runs"))
+        render_metric_card("Average", player_a.get("avg"), percentile=pct_a.get("avg"))
+        render_metric_card("Strike Rate", player_a.get("strikeRate"), percentile=pct_a.get("strikeRate"))
+        render_metric_card("Hundreds", player_a.get("hundreds"), percentile=pct_a.get("hundreds"))
+        render_metric_card("Fours", player_a.get("fours"), percentile=pct_a.get("fours"))
+        render_metric_card("Sixes", player_a.get("sixes"), percentile=pct_a.get("sixes"))
     with cols[1]:
         img_b = local_image_for_name(p2) or PLACEHOLDER_IMAGE
         st.image(img_b, caption=p2, width=120)
-        render_metric_card("Runs", player_b.get("runs"))
-        render_metric_card("Average", player_b.get("avg"))
-        render_metric_card("Strike Rate", player_b.get("strikeRate"))
-        render_metric_card("Hundreds", player_b.get("hundreds"))
-        render_metric_card("Fours", player_b.get("fours"))
-        render_metric_card("Sixes", player_b.get("sixes"))
+        render_metric_card("Runs", player_b.get("runs"), percentile=pct_b.get("runs"))
+        render_metric_card("Average", player_b.get("avg"), percentile=pct_b.get("avg"))
+        render_metric_card("Strike Rate", player_b.get("strikeRate"), percentile=pct_b.get("strikeRate"))
+        render_metric_card("Hundreds", player_b.get("hundreds"), percentile=pct_b.get("hundreds"))
+        render_metric_card("Fours", player_b.get("fours"), percentile=pct_b.get("fours"))
+        render_metric_card("Sixes", player_b.get("sixes"), percentile=pct_b.get("sixes"))
 
     labels = ["Runs", "Average", "Strike Rate", "Hundreds", "Sixes", "Fours"]
     values_a = [
@@ -116,21 +217,23 @@ def render_bowler_comparison(b1: str, b2: str):
         st.warning("Unexpected comparison payload.")
         return
 
+    pct_a = _career_percentiles(bowler_endpoint(b1))
+    pct_b = _career_percentiles(bowler_endpoint(b2))
     cols = st.columns(2)
     with cols[0]:
         img_a = local_image_for_name(b1, base_dir="downloads_psl_players") or PLACEHOLDER_IMAGE
         st.image(img_a, caption=b1, width=120)
-        render_metric_card("Wickets", bowler_a.get("wicket"))
-        render_metric_card("Economy", bowler_a.get("economy"))
-        render_metric_card("Average", bowler_a.get("average"))
-        render_metric_card("Strike Rate", bowler_a.get("strikeRate"))
+        render_metric_card("Wickets", bowler_a.get("wicket"), percentile=pct_a.get("wicket"))
+        render_metric_card("Economy", bowler_a.get("economy"), percentile=pct_a.get("economy"))
+        render_metric_card("Average", bowler_a.get("average"), percentile=pct_a.get("average"))
+        render_metric_card("Strike Rate", bowler_a.get("strikeRate"), percentile=pct_a.get("strikeRate"))
     with cols[1]:
         img_b = local_image_for_name(b2, base_dir="downloads_psl_players") or PLACEHOLDER_IMAGE
         st.image(img_b, caption=b2, width=120)
-        render_metric_card("Wickets", bowler_b.get("wicket"))
-        render_metric_card("Economy", bowler_b.get("economy"))
-        render_metric_card("Average", bowler_b.get("average"))
-        render_metric_card("Strike Rate", bowler_b.get("strikeRate"))
+        render_metric_card("Wickets", bowler_b.get("wicket"), percentile=pct_b.get("wicket"))
+        render_metric_card("Economy", bowler_b.get("economy"), percentile=pct_b.get("economy"))
+        render_metric_card("Average", bowler_b.get("average"), percentile=pct_b.get("average"))
+        render_metric_card("Strike Rate", bowler_b.get("strikeRate"), percentile=pct_b.get("strikeRate"))
 
     labels = ["Wickets", "Economy", "Average", "Strike Rate", "Best Figure"]
     values_a = [
@@ -203,7 +306,7 @@ def render_batsman_bowler_h2h(batsman: str, bowler: str):
     endpoint = f"/players/{encode_value(batsman)}/vs-bowler/{encode_value(bowler)}"
     st.markdown("##### Head-to-Head: Batter vs Bowler")
     with st.spinner("Fetching batter vs bowler..."):
-        data = fetch_api(endpoint, use_cache=False)
+        data = fetch_api(endpoint)
     if not data:
         st.info("Head-to-head data unavailable.")
         return
@@ -234,3 +337,38 @@ def render_batsman_bowler_h2h(batsman: str, bowler: str):
         render_metric_card("Strike Rate", _fmt(bowl.get("strike_rate")))
 
     render_endpoint_copy("Copy batter vs bowler endpoint:", endpoint)
+
+
+def render_matchup_matrix(player_names: list[str], bowler_names: list[str]):
+    st.markdown("##### Matchup Matrix")
+    if not is_local_source():
+        st.caption("Full matchup rows are computed from the local dataset (set PSL_DATA_SOURCE=local).")
+        return
+
+    mode = st.radio("View", ["Batter vs all bowlers", "Bowler vs all batters"], horizontal=True, key="matchup_mode")
+    cols = st.columns([2, 2, 1, 1])
+    with cols[0]:
+        if mode == "Batter vs all bowlers":
+            name = st.selectbox("Batter", player_names, key="matchup_batter")
+            endpoint, label = f"{player_endpoint(name)}/vs-bowlers" if name else "", "bowler"
+        else:
+            name = st.selectbox("Bowler", bowler_names, key="matchup_bowler")
+            endpoint, label = f"{bowler_endpoint(name)}/vs-batters" if name else "", "batter"
+    with cols[1]:
+        titles = dict(MATCHUP_COLUMNS)
+        sort_by = st.selectbox("Sort by", list(titles), format_func=titles.get, index=1, key="matchup_sort")
+    with cols[2]:
+        min_balls = st.number_input("Min balls", min_value=0, value=6, step=6, key="matchup_min_balls")
+    with cols[3]:
+        top = st.number_input("Show top", min_value=5, max_value=100, value=20, step=5, key="matchup_top")
+    if not endpoint:
+        return
+
+    rows = fetch_api(endpoint)
+    view = matchup_view(name, rows, label, sort_by, int(min_balls), int(top)) if rows else None
+    if not view:
+        st.info("No matchups meet the filters.")
+        return
+    table, fig = view
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(table, use_container_width=True, hide_index=True)
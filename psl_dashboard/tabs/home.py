@@ -2,7 +2,7 @@ import streamlit as st
 
 from ..api import fetch_api
 from ..components import render_metric_card
-from ..config import get_base_url, PLACEHOLDER_IMAGE
+from ..config import get_base_url, is_local_source, PLACEHOLDER_IMAGE
 from ..utils import local_image_for_name
 
 
@@ -11,7 +11,7 @@ def render_home(container):
         st.header("🏠 PSL Stats Dashboard")
         st.write("Explore PSL player, bowler, and team performance via the FastAPI backend.")
         base_url = get_base_url()
-        if not base_url:
+        if not base_url and not is_local_source():
             st.warning("Set a valid API base URL in the sidebar to start.")
             return
 
@@ -1,51 +1,32 @@
-import pandas as pd
 import streamlit as st
 
-from ..api import fetch_api
+from ..api import fetch_api, list_teams
+from ..config import is_local_source
+from ..frames import to_frame
+
+# Fixed leaderboards, shown in two columns (also pre-rendered by psl_dashboard.site)
+LEADERBOARDS = [
+    {"title": "Top Run Scorers", "endpoint": "/players/top", "columns": [("batter", "Batter"), ("batsman_runs", "Runs")], "caption": "Sorted by runs"},
+    {"title": "Most Sixes", "endpoint": "/players/top-sixes", "columns": [("batter", "Batter"), ("sixes", "Sixes")], "caption": "Sorted by sixes"},
+    {"title": "Most Fours", "endpoint": "/players/top-fours", "columns": [("batter", "Batter"), ("fours", "Fours")], "caption": "Sorted by fours"},
+    {"title": "Top Wicket Takers", "endpoint": "/bowlers/top", "columns": [("bowler", "Bowler"), ("bowler_wickets", "Wickets")], "caption": "Sorted by wickets"},
+    {"title": "Most Catches", "endpoint": "/players/top-catches", "columns": [("fielder", "Fielder"), ("catches", "Catches")], "caption": "Sorted by catches"},
+    {"title": "Most Player of Match", "endpoint": "/players/top-mom", "columns": [("player_of_match", "Player"), ("awards", "Awards")], "caption": "Sorted by awards"},
+]
 
 
 def render_leaderboards(container):
     with container:
         st.subheader("📊 Leaderboards")
+        if is_local_source():
+            render_custom_leaderboard()
+            st.divider()
         cols = st.columns(2)
-        with cols[0]:
-            render_leaderboard(
-                title="Top Run Scorers",
-                endpoint="/players/top",
-                columns=[("batter", "Batter"), ("batsman_runs", "Runs")],
-                caption="Sorted by runs",
-            )
-            render_leaderboard(
-                title="Most Sixes",
-                endpoint="/players/top-sixes",
-                columns=[("batter", "Batter"), ("sixes", "Sixes")],
-                caption="Sorted by sixes",
-            )
-            render_leaderboard(
-                title="Most Fours",
-                endpoint="/players/top-fours",
-                columns=[("batter", "Batter"), ("fours", "Fours")],
-                caption="Sorted by fours",
-            )
-        with cols[1]:
-            render_leaderboard(
-                title="Top Wicket Takers",
-                endpoint="/bowlers/top",
-                columns=[("bowler", "Bowler"), ("bowler_wickets", "Wickets")],
-                caption="Sorted by wickets",
-            )
-            render_leaderboard(
-                title="Most Catches",
-                endpoint="/players/top-catches",
-                columns=[("fielder", "Fielder"), ("catches", "Catches")],
-                caption="Sorted by catches",
-            )
-            render_leaderboard(
-                title="Most Player of Match",
-                endpoint="/players/top-mom",
-                columns=[("player_of_match", "Player"), ("awards", "Awards")],
-                caption="Sorted by awards",
-            )
+        half = -(-len(LEADERBOARDS) // 2)
+        for col, boards in zip(cols, (LEADERBOARDS[:half], LEADERBOARDS[half:])):
+            with col:
+                for board in boards:
+                    render_leaderboard(**board)
 
 
 def render_leaderboard(title: str, endpoint: str, columns: list[tuple[str, str]], caption: str):
@@ -55,11 +36,55 @@ def render_leaderboard(title: str, endpoint: str, columns: list[tuple[str, str]]
     if not data:
         st.info("No data available.")
         return
-    df = pd.DataFrame(data)
-    missing = [key for key, _ in columns if key not in df.columns]
-    if missing:
+    df = leaderboard_frame(data, columns)
+    if df is None:
         st.info("Unexpected leaderboard format.")
         return
-    display_cols = {key: label for key, label in columns}
-    st.dataframe(df[list(display_cols.keys())].rename(columns=display_cols), use_container_width=True)
+    st.dataframe(df, use_container_width=True)
     st.caption(caption)
+
+
+def leaderboard_frame(data, columns: list[tuple[str, str]]):
+    """Leaderboard payload as a frame of the ``(field, label)`` columns, or None if any field is missing."""
+    df = to_frame(data)
+    if any(key not in df.columns for key, _ in columns):
+        return None
+    display_cols = dict(columns)
+    return df[list(display_cols)].rename(columns=display_cols)
+
+
+def render_custom_leaderboard():
+    """Top-k for any metric with season, team and qualifier filters (local source only)."""
+    from ..engine import LEADERBOARD_METRICS
+
+    st.markdown("#### Custom Leaderboard")
+    cols = st.columns([2, 2, 2, 1, 1])
+    with cols[0]:
+        metric = st.selectbox(
+            "Metric",
+            list(LEADERBOARD_METRICS),
+            format_func=lambda key: LEADERBOARD_METRICS[key][1],
+            key="lb_metric",
+        )
+    with cols[1]:
+        seasons = st.multiselect("Seasons", fetch_api("/seasons") or [], key="lb_seasons")
+    with cols[2]:
+        teams = st.multiselect("Teams", list_teams(), key="lb_teams")
+    with cols[3]:
+        min_balls = st.number_input("Min balls", min_value=0, value=0, step=10, key="lb_min_balls")
+    with cols[4]:
+        limit = st.number_input("Top", min_value=1, max_value=100, value=10, key="lb_limit")
+
+    params = {
+        "metric": metric,
+        "season": seasons,
+        "team": teams,
+        "min_balls": int(min_balls),
+        "limit": int(limit),
+    }
+    data = fetch_api("/leaderboards", params=params)
+    if not data:
+        st.info("No players match these filters.")
+        return
+    df = to_frame(data).rename(columns={metric: LEADERBOARD_METRICS[metric][1]}).rename(columns=str.title)
+    st.dataframe(df, use_container_width=True, hide_index=True)
@@ -1,10 +1,15 @@
-import pandas as pd
+import time
+from typing import Callable
+
 import streamlit as st
 
-from ..api import encode_value, fetch_api, list_teams, team_endpoint
+from ..api import bowler_endpoint, encode_value, fetch_api, fetch_many, list_teams, notify_cancelled, player_endpoint, team_endpoint
+from ..cancellation import FetchCancelled
 from ..components import render_endpoint_copy, render_metric_card, render_table
-from ..config import PLACEHOLDER_IMAGE
+from ..config import H2H_RETRY_SECONDS, PLACEHOLDER_IMAGE
+from ..frames import to_frame
 from ..utils import local_image_for_name
+from ..view_models import h2h_matrix, squad_view, team_metrics
 
 
 def render_teams(container):
@@ -24,6 +29,8 @@ def render_teams(container):
         if team_a and team_b and team_a != team_b:
             render_team_head_to_head(team_a, team_b)
 
+        render_head_to_head_matrix(team_names)
+
         st.markdown("#### Team Highlights")
         cols = st.columns(2)
         with cols[0]:
@@ -31,7 +38,7 @@ def render_teams(container):
             with st.spinner("Highest totals..."):
                 totals = fetch_api("/teams/top-totals")
             if totals:
-                df_totals = pd.DataFrame(totals)
+                df_totals = to_frame(totals)
                 if {"batting_team", "total_runs"}.issubset(df_totals.columns):
                     df_totals = df_totals.rename(columns={"batting_team": "Team", "total_runs": "Total Runs"})
                 st.dataframe(df_totals, use_container_width=True)
@@ -40,7 +47,7 @@ def render_teams(container):
             with st.spinner("Best chases..."):
                 chases = fetch_api("/teams/top-chases")
             if chases:
-                df_chases = pd.DataFrame(chases)
+                df_chases = to_frame(chases)
                 if {"batting_team", "target"}.issubset(df_chases.columns):
                     df_chases = df_chases.rename(columns={"batting_team": "Team", "target": "Target"})
                 st.dataframe(df_chases, use_container_width=True)
@@ -58,13 +65,7 @@ def render_team_stats(team: str):
     img = local_image_for_name(team, base_dir="images") or PLACEHOLDER_IMAGE
     st.image(img, caption=team, width=120)
     st.subheader(f"Team Stats: {team}")
-    metrics = [
-        ("Matches", overall.get("match_played")),
-        ("Wins", overall.get("match_won")),
-        ("No Result", overall.get("no_results")),
-        ("Losses", overall.get("loss")),
-        ("Titles", overall.get("titles_won")),
-    ]
+    metrics = team_metrics(overall)
     cols = st.columns(len(metrics))
     for col, (label, value) in zip(cols, metrics):
         with col:
@@ -73,16 +74,186 @@ def render_team_stats(team: str):
     vs_data = stats.get("against") or stats.get("againstTeams")
     if vs_data:
         st.markdown("#### Performance vs Opponents")
-        render_table(vs_data)
+        render_table(vs_data, key="team_vs_opponents")
 
     render_endpoint_copy("Copy team stats endpoint:", f"{team_endpoint(team)}/stats")
+    render_team_squad(team)
+
+
+def roster_names(payload, fields: tuple[str, ...]) -> list[str]:
+    """Player names from a roster payload (a list, or the first present of ``fields``, of names or records)."""
+    if isinstance(payload, dict):
+        items = next((payload[field] for field in fields if isinstance(payload.get(field), list)), [])
+    else:
+        items = payload if isinstance(payload, list) else []
+    names = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("player") or item.get("name") or item.get("batter") or item.get("bowler")
+        if item:
+            names.append(str(item))
+    return list(dict.fromkeys(names))
+
+
+def squad_members(roster, fetch_all: Callable[[list[str]], dict]) -> dict | None:
+    """
+    Squad figures from a ``/teams/{name}/all`` payload.
+
+    The local engine's payload carries each member's totals for the team
+    (``batting``, ``bowling``, ``seasons`` and ``awards``), which are used
+    as they are. A bare roster falls back to the members' career stats and
+    growth, requested with ``fetch_all`` (endpoints -> payloads).
+
+    Returns:
+        Dict with ``batting`` and ``bowling`` records (with a ``player``
+        field), ``seasons``, ``awards`` and ``team_only`` (False for career
+        figures), or None if the roster is empty
+    """
+    if isinstance(roster, dict) and isinstance(roster.get("batting"), list) and isinstance(roster.get("bowling"), list):
+        return {
+            "batting": roster["batting"],
+            "bowling": roster["bowling"],
+            "seasons": roster.get("seasons") or [],
+            "awards": roster.get("awards") or {},
+            "team_only": True,
+        }
+    batters = roster_names(roster, ("batters", "players", "squad"))
+    bowlers = roster_names(roster, ("bowlers", "players", "squad"))
+    if not batters and not bowlers:
+        return None
+
+    batting_endpoints = {name: f"{player_endpoint(name)}/stats" for name in batters}
+    growth_endpoints = {name: f"{player_endpoint(name)}/growth" for name in batters}
+    bowling_endpoints = {name: f"{bowler_endpoint(name)}/stats" for name in bowlers}
+    results = fetch_all([*batting_endpoints.values(), *growth_endpoints.values(), *bowling_endpoints.values()])
+
+    def overalls(endpoints: dict[str, str]) -> dict[str, dict]:
+        payloads = {name: results.get(endpoint) for name, endpoint in endpoints.items()}
+        return {name: payload.get("overall", payload) for name, payload in payloads.items() if isinstance(payload, dict)}
+
+    batting, bowling = overalls(batting_endpoints), overalls(bowling_endpoints)
+    seasons = [
+        {"player": name, **record}
+        for name, endpoint in growth_endpoints.items() if isinstance(results.get(endpoint), list)
+        for record in results[endpoint] if isinstance(record, dict)
+    ]
+    awards = {}
+    for stats in (batting, bowling):
+        for name, overall in stats.items():
+            if isinstance(overall.get("mom"), (int, float)):
+                awards[name] = max(awards.get(name, 0), overall["mom"])
+    return {
+        "batting": [{"player": name, **overall} for name, overall in batting.items()],
+        "bowling": [{"player": name, **overall} for name, overall in bowling.items()],
+        "seasons": seasons,
+        "awards": awards,
+        "team_only": False,
+    }
+
+
+def squad_caption(squad: dict, team: str) -> str:
+    scope = f"Figures for {team} only" if squad["team_only"] else "Career figures across all franchises"
+    return f"{scope}; shares are of the squad's combined runs and wickets."
+
+
+def render_team_squad(team: str):
+    """
+    Squad table and season run trend for everyone who has played for ``team``,
+    loaded on demand.
+
+    With the local engine one ``/teams/{name}/all`` request carries every
+    member's totals for the team. Against an API that only returns the
+    roster, member career stats are fetched concurrently through the request
+    cache instead.
+    """
+    st.markdown("#### Squad")
+    if not st.toggle("Show squad", key="team_squad"):
+        return
+    roster_endpoint = f"{team_endpoint(team)}/all"
+    with st.spinner("Fetching squad..."):
+        roster = fetch_api(roster_endpoint, suppress_warning=True)
+        try:
+            squad = squad_members(roster, fetch_many)
+        except FetchCancelled as exc:
+            notify_cancelled(exc)
+            return
+    if squad is None:
+        st.info("Squad unavailable.")
+        return
+    table, fig = squad_view(team, squad)
+    if table.empty:
+        st.info("Squad unavailable.")
+        return
+
+    st.caption(f"{len(table)} players. {squad_caption(squad, team)}")
+    st.dataframe(table, use_container_width=True)
+    if fig is not None:
+        st.markdown("##### Season Runs by Player")
+        st.plotly_chart(fig, use_container_width=True)
+    render_endpoint_copy("Copy squad endpoint:", roster_endpoint)
+
+
+def head_to_head_endpoint(team_a: str, team_b: str) -> str:
+    return f"/teams/{encode_value(team_a)}/vs/{encode_value(team_b)}"
+
+
+def render_head_to_head_matrix(team_names: list[str]):
+    """
+    Heatmap of every franchise pair's head-to-head record, shown on demand.
+
+    Each unordered pair is fetched once through the request cache, so adding a
+    team only fetches its new pairs; uncached pairs are fetched concurrently.
+    Failed pairs are not cached by the request cache, so the session remembers
+    them for ``H2H_RETRY_SECONDS`` instead of requesting them on every rerun.
+    Cancelled fetches are not failures and are requested again next rerun.
+    """
+    teams = list(dict.fromkeys(team_names))
+    if len(teams) < 2:
+        return
+    pairs = [(a, b) for i, a in enumerate(teams) for b in teams[i + 1 :]]
+    st.markdown("#### Head-to-Head Matrix")
+    if not st.toggle(f"Show all {len(pairs)} pairs", key="h2h_matrix"):
+        return
+
+    failed = st.session_state.setdefault("_h2h_failed", {})
+    now = time.monotonic()
+    endpoints = {pair: head_to_head_endpoint(*pair) for pair in pairs}
+    due = [endpoint for endpoint in endpoints.values() if now - failed.get(endpoint, -H2H_RETRY_SECONDS) >= H2H_RETRY_SECONDS]
+    with st.spinner("Fetching head-to-head records..."):
+        try:
+            results = fetch_many(due) if due else {}
+        except FetchCancelled as exc:
+            notify_cancelled(exc)
+            return
+    for endpoint in due:
+        if isinstance(results.get(endpoint), dict):
+            failed.pop(endpoint, None)
+        else:
+            failed[endpoint] = now
+    payloads = {f"{a}|{b}": results.get(endpoints[a, b]) for a, b in pairs}
+    missing = [key for key, payload in payloads.items() if not isinstance(payload, dict)]
+    payloads = {key: payload for key, payload in payloads.items() if isinstance(payload, dict)}
+    if not payloads:
+        st.info("Head-to-head records unavailable.")
+        return
+
+    table, fig = h2h_matrix(teams, payloads)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("Row team's wins / matches against the column team.")
+    if missing:
+        st.caption(
+            f"{len(missing)} pair(s) unavailable, retried after {H2H_RETRY_SECONDS:.0f}s: "
+            f"{', '.join(key.replace('|', ' vs ') for key in missing)}"
+        )
+    with st.expander("Matrix table"):
+        st.dataframe(table, use_container_width=True)
 
 
 def render_team_head_to_head(team_a: str, team_b: str):
     if not team_a or not team_b:
         return
     with st.spinner("Fetching head-to-head..."):
-        data = fetch_api(f"/teams/{encode_value(team_a)}/vs/{encode_value(team_b)}", use_cache=False)
+        data = fetch_api(head_to_head_endpoint(team_a, team_b), use_cache=False)
     if data:
         st.markdown(f"#### Head-to-Head: {team_a} vs {team_b}")
-        render_table([data])
+        render_table([data], key="team_head_to_head")
@@ -0,0 +1,119 @@
+"""
+PSL Analytics Hub - Traffic Capture
+===================================
+Opt-in recorder of every logical ``fetch_api`` request
+(``PSL_TRAFFIC_CAPTURE=trace.jsonl``), for replay with
+``python -m benchmarks.replay``.
+
+Each request is appended to the trace as one compact JSON line:
+
+- ``t``: wall-clock start time (epoch seconds)
+- ``s``: session ID hash, salted per process so it cannot be matched back to
+  a session ID
+- ``tpl`` / ``ep``: endpoint template and concrete endpoint
+- ``m``: HTTP method
+- ``p`` / ``b``: query parameters and JSON body (omitted when empty)
+- ``ms``: latency as seen by the app
+- ``out``: cache outcome (see :mod:`psl_dashboard.metrics`)
+- ``bytes``: response size (network fetches only)
+- ``err``: error kind (failed requests only)
+
+Each line is written with a single ``O_APPEND`` write, so several dashboard
+processes can share one trace file.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from .metrics import endpoint_template
+
+
+def _session_id() -> str | None:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+class TrafficRecorder:
+    """Appends one JSON line per request to a trace file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._salt = os.urandom(8)
+        self._hashes: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+
+    def _session_hash(self) -> str | None:
+        session_id = _session_id()
+        if session_id is None:
+            return None
+        digest = self._hashes.get(session_id)
+        if digest is None:
+            digest = hashlib.sha256(self._salt + session_id.encode("utf-8")).hexdigest()[:12]
+            self._hashes[session_id] = digest
+        return digest
+
+    def record(
+        self,
+        endpoint: str,
+        method: str,
+        params: dict | None,
+        json_data: dict | None,
+        outcome: str,
+        seconds: float,
+        size: int | None = None,
+        error: str | None = None,
+    ):
+        """Append one request; the write never raises into the caller."""
+        entry = {
+            "t": round(time.time() - seconds, 3),
+            "s": self._session_hash(),
+            "tpl": endpoint_template(endpoint),
+            "ep": endpoint,
+            "m": method,
+            "p": params or None,
+            "b": json_data or None,
+            "ms": round(1000 * seconds, 2),
+            "out": outcome,
+            "bytes": size,
+            "err": error,
+        }
+        line = json.dumps({key: value for key, value in entry.items() if value is not None}, separators=(",", ":"), default=str)
+        try:
+            with self._lock:
+                if self._fd is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                os.write(self._fd, (line + "\n").encode("utf-8"))
+        except OSError:
+            pass
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def read_trace(path: str | Path) -> list[dict]:
+    """Requests from a trace file, oldest first (malformed lines are skipped)."""
+    entries = []
+    with open(path, encoding="utf-8") as trace:
+        for line in trace:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and "ep" in entry and "t" in entry:
+                entries.append(entry)
+    entries.sort(key=lambda entry: entry["t"])
+    return entries
@@ -0,0 +1,477 @@
+"""
+PSL Analytics Hub - View Models
+===============================
+Derived view data (metric lists, chart frames, Plotly figures) computed once
+per entity and payload, then shared across reruns and sessions.
+
+Figures are cached as ``go.Figure`` objects: ``st.plotly_chart`` skips
+re-validation for figure instances, so a cache hit only pays for
+serialization. Cached objects are shared and must not be mutated.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from .frames import payload_hash
+from .profiler import profiled
+
+# Maximum number of cached view models / figures
+VIEW_CACHE_MAX_ENTRIES = 128
+
+PLAYER_METRICS = [
+    ("Runs", "runs"),
+    ("Innings", "innings"),
+    ("Average", "avg"),
+    ("Strike Rate", "strikeRate"),
+    ("Hundreds", "hundreds"),
+    ("Highest Score", "highestScore"),
+    ("Fours", "fours"),
+    ("Sixes", "sixes"),
+    ("Not Out", "notOut"),
+    ("Player of Match", "mom"),
+]
+
+BOWLER_METRICS = [
+    ("Innings", "innings"),
+    ("Wickets", "wicket"),
+    ("Economy", "economy"),
+    ("Average", "average"),
+    ("Strike Rate", "strikeRate"),
+    ("Best Figure", "best_figure"),
+    ("3W+", "three_w"),
+    ("Fours Conceded", "fours"),
+    ("Sixes Conceded", "sixes"),
+    ("Player of Match", "mom"),
+]
+
+
+def player_metrics(overall: dict) -> list[tuple[str, object]]:
+    """Return the (label, value) metric cards for a player's overall stats."""
+    return [(label, overall.get(field)) for label, field in PLAYER_METRICS]
+
+
+def bowler_metrics(overall: dict) -> list[tuple[str, object]]:
+    """Return the (label, value) metric cards for a bowler's overall stats."""
+    return [(label, overall.get(field)) for label, field in BOWLER_METRICS]
+
+
+def entity_metrics(kind: str, stats: dict) -> list[tuple[str, object]]:
+    """Metric cards of a "player" (batter) or "bowler"."""
+    return player_metrics(stats) if kind == "player" else bowler_metrics(stats)
+
+
+TEAM_METRICS = [
+    ("Matches", "match_played"),
+    ("Wins", "match_won"),
+    ("No Result", "no_results"),
+    ("Losses", "loss"),
+    ("Titles", "titles_won"),
+]
+
+
+def team_metrics(overall: dict) -> list[tuple[str, object]]:
+    """Return the (label, value) metric cards for a team's overall stats."""
+    return [(label, overall.get(field)) for label, field in TEAM_METRICS]
+
+
+def metric_percentiles(kind: str, payload: dict | None) -> list[float | None] | None:
+    """Percentiles aligned with :func:`player_metrics` / :func:`bowler_metrics` cards."""
+    if not payload:
+        return None
+    fields = PLAYER_METRICS if kind == "player" else BOWLER_METRICS
+    values = payload.get("percentiles") or {}
+    return [values.get(field) for _, field in fields]
+
+
+@st.cache_resource(show_spinner=False, max_entries=VIEW_CACHE_MAX_ENTRIES)
+def _growth_view(name: str, key: str, _growth) -> tuple[pd.DataFrame, go.Figure] | None:
+    df_growth = pd.DataFrame(_growth)
+    x_field = "season" if "season" in df_growth.columns else "year" if "year" in df_growth.columns else None
+    y_field = "batsman_runs" if "batsman_runs" in df_growth.columns else "runs" if "runs" in df_growth.columns else None
+    if not x_field or not y_field:
+        return None
+
+    df_growth = df_growth.sort_values(x_field)
+    df_growth["career_runs"] = df_growth[y_field].cumsum()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df_growth[x_field], y=df_growth[y_field], mode="lines+markers", name="Season Runs"))
+    fig.add_trace(go.Scatter(x=df_growth[x_field], y=df_growth["career_runs"], mode="lines+markers", name="Career Runs"))
+    fig.update_layout(height=320, xaxis_title="Season", yaxis_title="Runs")
+    return df_growth, fig
+
+
+@profiled("view")
+def growth_view(name: str, growth) -> tuple[pd.DataFrame, go.Figure] | None:
+    """
+    Build the Season Growth frame and chart for a player.
+
+    Args:
+        name: Player name
+        growth: Payload from ``/players/{name}/growth``
+
+    Returns:
+        ``(frame, figure)`` or None if the payload cannot be charted
+    """
+    return _growth_view(name, payload_hash(growth), growth)
+
+
+@st.cache_resource(show_spinner=False, max_entries=VIEW_CACHE_MAX_ENTRIES)
+def comparison_figure(
+    title: str,
+    labels: tuple,
+    values_a: tuple,
+    values_b: tuple,
+    name_a: str,
+    name_b: str,
+    color_a: str | None = None,
+    color_b: str | None = None,
+) -> go.Figure:
+    """Return the grouped bar chart comparing two entities."""
+    # Use team colors if available
+    marker_a = {"color": color_a} if color_a else {}
+    marker_b = {"color": color_b} if color_b else {}
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(name=name_a, x=list(labels), y=list(values_a), marker=marker_a))
+    fig.add_trace(go.Bar(name=name_b, x=list(labels), y=list(values_b), marker=marker_b))
+
+    fig.update_layout(
+        barmode="group",
+        height=400,
+        title=title,
+        template="plotly_white",
+        showlegend=True,
+    )
+    return fig
+
+
+# (label, payload field, higher_is_better) shown in N-way comparisons
+COMPARE_METRICS = {
+    "player": [
+        ("Runs", "runs", True),
+        ("Average", "avg", True),
+        ("Strike Rate", "strikeRate", True),
+        ("Hundreds", "hundreds", True),
+        ("Fifties", "fifties", True),
+        ("Fours", "fours", True),
+        ("Sixes", "sixes", True),
+    ],
+    "bowler": [
+        ("Wickets", "wicket", True),
+        ("Innings", "innings", True),
+        ("Economy", "economy", False),
+        ("Average", "average", False),
+        ("Strike Rate", "strikeRate", False),
+        ("3W+", "three_w", True),
+    ],
+    "team": [
+        ("Matches", "match_played", True),
+        ("Wins", "match_won", True),
+        ("Losses", "loss", False),
+        ("Titles", "titles_won", True),
+    ],
+}
+
+
+@st.cache_data(show_spinner=False, max_entries=VIEW_CACHE_MAX_ENTRIES)
+def _comparison_table(kind: str, names: tuple, key: str, _records: list) -> pd.DataFrame:
+    fields = COMPARE_METRICS[kind]
+    raw = pd.DataFrame([{field: (record or {}).get(field) for _, field, _ in fields} for record in _records], index=list(names))
+    table = raw.apply(pd.to_numeric, errors="coerce")
+    table.columns = [label for label, _, _ in fields]
+    return table.rename_axis(kind.title())
+
+
+@profiled("view")
+def comparison_table(kind: str, names: list[str], records: list[dict]) -> pd.DataFrame:
+    """One row per entity, one numeric column per :data:`COMPARE_METRICS` label."""
+    return _comparison_table(kind, tuple(names), payload_hash(records), records)
+
+
+@profiled("view")
+def normalize_comparison(kind: str, table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Min-max scale each metric to 0-1 across the compared entities.
+
+    Lower-is-better metrics are inverted so 1 is always best; a metric with
+    no spread scales to 1 and missing values to 0.
+    """
+    values = table.to_numpy(dtype=np.float64)
+    low = np.nanmin(np.where(np.isnan(values), np.inf, values), axis=0)
+    high = np.nanmax(np.where(np.isnan(values), -np.inf, values), axis=0)
+    spread = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.where(spread > 0, (values - low) / np.where(spread > 0, spread, 1), 1.0)
+    higher = np.array([higher for _, _, higher in COMPARE_METRICS[kind]])
+    scaled = np.where(higher, scaled, 1.0 - np.where(spread > 0, scaled, 0.0))
+    scaled = np.where(np.isnan(values), 0.0, scaled)
+    return pd.DataFrame(scaled.round(3), index=table.index, columns=table.columns)
+
+
+@st.cache_resource(show_spinner=False, max_entries=VIEW_CACHE_MAX_ENTRIES)
+def _multi_comparison_figure(kind: str, chart: str, key: str, _table: pd.DataFrame) -> go.Figure:
+    normalized = normalize_comparison(kind, _table)
+    labels = list(_table.columns)
+    fig = go.Figure()
+    for name in _table.index:
+        raw = _table.loc[name].tolist()
+        scaled = normalized.loc[name].tolist()
+        if chart == "Radar":
+            fig.add_trace(go.Scatterpolar(
+                r=scaled + scaled[:1],
+                theta=labels + labels[:1],
+                customdata=raw + raw[:1],
+                hovertemplate="%{theta}: %{customdata}<extra>" + str(name) + "</extra>",
+                fill="toself",
+                name=str(name),
+            ))
+        else:
+            fig.add_trace(go.Bar(
+                x=labels,
+                y=scaled,
+                customdata=raw,
+                hovertemplate="%{x}: %{customdata}<extra>" + str(name) + "</extra>",
+                name=str(name),
+            ))
+    if chart == "Radar":
+        fig.update_layout(polar={"radialaxis": {"visible": True, "range": [0, 1]}})
+    else:
+        fig.update_layout(barmode="group", yaxis_title="Relative (1 = best)")
+    fig.update_layout(height=480, template="plotly_white", showlegend=True)
+    return fig
+
+
+@profiled("view")
+def multi_comparison_figure(kind: str, chart: str, table: pd.DataFrame) -> go.Figure:
+    """Radar or grouped bar chart of the normalized comparison table."""
+    key = payload_hash({"index": [str(name) for name in table.index], "values": table.to_numpy().tolist()})
+    return _multi_comparison_figure(kind, chart, key, table)
+
+
+def _first(payload: dict, fields: tuple[str, ...]):
+    for field in fields:
+        value = payload.get(field)
+        if value is not None:
+            return pd.to_numeric(value, errors="coerce")
+    return np.nan
+
+
+@st.cache_resource(show_spinner=False, max_entries=VIEW_CACHE_MAX_ENTRIES)
+def _h2h_matrix(teams: tuple, key: str, _pairs: dict) -> tuple[pd.DataFrame, go.Figure]:
+    size = len(teams)
+    wins = np.full((size, size), np.nan)
+    played = np.full((size, size), np.nan)
+    for i, team_a in enumerate(teams):
+        for j in range(i + 1, size):
+            payload = _pairs.get(f"{team_a}|{teams[j]}") or {}
+            matches = _first(payload, ("matches", "total_matches", "match_played"))
+            wins_a = _first(payload, ("team_a_wins", "wins_a", "team1_wins"))
+            wins_b = _first(payload, ("team_b_wins", "wins_b", "team2_wins"))
+            if np.isnan(matches):
+                matches = wins_a + wins_b + np.nan_to_num(_first(payload, ("no_results", "no_result")))
+            played[i, j] = played[j, i] = matches
+            wins[i, j], wins[j, i] = wins_a, wins_b
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_pct = np.where(played > 0, 100 * wins / played, np.nan)
+    labels = list(teams)
+    text = [
+        [
+            "" if i == j or np.isnan(wins[i, j]) else f"{int(wins[i, j])}/{'?' if np.isnan(played[i, j]) else int(played[i, j])}"
+            for j in range(size)
+        ]
+        for i in range(size)
+    ]
+    fig = go.Figure(go.Heatmap(
+        z=win_pct,
+        x=labels,
+        y=labels,
+        text=text,
+        texttemplate="%{text}",
+        colorscale="RdYlGn",
+        zmin=0,
+        zmax=100,
+        colorbar={"title": "Win %"},
+        hovertemplate="%{y} vs %{x}<br>Won %{text}<br>Win %: %{z:.1f}<extra></extra>",
+    ))
+    fig.update_layout(height=120 + 60 * size, template="plotly_white", xaxis_title="Opponent", yaxis_title="Team")
+    fig.update_yaxes(autorange="reversed")
+    table = pd.DataFrame(text, index=labels, columns=labels).rename_axis("Team")
+    return table, fig
+
+
+@profiled("view")
+def h2h_matrix(teams: list[str], pairs: dict[str, dict]) -> tuple[pd.DataFrame, go.Figure]:
+    """
+    Wins/matches table and win % heatmap for every pair of teams.
+
+    Args:
+        teams: Teams in display order
+        pairs: ``"team_a|team_b"`` -> head-to-head payload for each ordered
+            pair where team_a comes first in ``teams``
+
+    Returns:
+        Tuple of ("wins/matches" table, heatmap figure)
+    """
+    return _h2h_matrix(tuple(teams), payload_hash(pairs), pairs)
+
+
+# Players shown individually in the squad run-trend chart; the rest are grouped
+SQUAD_TREND_PLAYERS = 8
+
+
+def _column(frame: pd.DataFrame, fields: tuple[str, ...]) -> pd.Series:
+    """First of ``fields`` present in ``frame`` as a numeric column (NaN if none)."""
+    for field in fields:
+        if field in frame.columns:
+            return pd.to_numeric(frame[field], errors="coerce")
+    return pd.Series(np.nan, index=frame.index)
+
+
+def _share(values: pd.Series) -> pd.Series:
+    total = values.sum()
+    return (100 * values / total).round(1) if total > 0 else values * np.nan
+
+
+def _by_player(records: list[dict]) -> pd.DataFrame:
+    frame = pd.DataFrame(records)
+    if "player" not in frame.columns:
+        return pd.DataFrame(index=pd.Index([], name="player"))
+    return frame.assign(player=frame["player"].astype(str)).drop_duplicates("player").set_index("player")
+
+
+@st.cache_resource(show_spinner=False, max_entries=VIEW_CACHE_MAX_ENTRIES)
+def _squad_view(team: str, key: str, _squad: dict) -> tuple[pd.DataFrame, go.Figure | None]:
+    batting = _by_player(_squad.get("batting") or [])
+    bowling = _by_player(_squad.get("bowling") or [])
+    names = sorted(set(batting.index) | set(bowling.index))
+    batting, bowling = batting.reindex(names), bowling.reindex(names)
+    runs = _column(batting, ("runs", "batsman_runs"))
+    wickets = _column(bowling, ("wicket", "wickets", "bowler_wickets"))
+    awards = pd.Series(_squad.get("awards") or {}, dtype="float64")
+    table = pd.DataFrame({
+        "Runs": runs,
+        "Bat Inns": _column(batting, ("innings",)),
+        "Average": _column(batting, ("avg", "average")),
+        "Strike Rate": _column(batting, ("strikeRate", "strike_rate")),
+        "Wickets": wickets,
+        "Bowl Inns": _column(bowling, ("innings",)),
+        "Economy": _column(bowling, ("economy",)),
+        "Runs %": _share(runs.fillna(0)),
+        "Wickets %": _share(wickets.fillna(0)),
+        "Player of Match": awards.reindex(names).to_numpy(),
+    }, index=pd.Index(names, name="Player"))
+    # Ranked by combined share of the squad's runs and wickets
+    order = (table["Runs %"].fillna(0) + table["Wickets %"].fillna(0)).sort_values(ascending=False, kind="stable")
+    table = table.loc[order.index]
+
+    growth = pd.DataFrame(_squad.get("seasons") or [])
+    if growth.empty or "player" not in growth.columns:
+        return table, None
+    growth["season"] = _column(growth, ("season", "year"))
+    growth["runs"] = _column(growth, ("runs", "batsman_runs"))
+    growth = growth.dropna(subset=["season"])
+    if growth.empty:
+        return table, None
+    trend = growth.pivot_table(index="season", columns="player", values="runs", aggfunc="sum", fill_value=0)
+    top = trend.sum().nlargest(SQUAD_TREND_PLAYERS).index
+    others = trend.drop(columns=top).sum(axis=1)
+    trend = trend[top]
+    if others.any():
+        trend = trend.assign(Others=others)
+
+    fig = go.Figure([go.Bar(x=trend.index, y=trend[column], name=str(column)) for column in trend.columns])
+    fig.update_layout(barmode="stack", height=360, template="plotly_white", xaxis_title="Season", yaxis_title="Runs")
+    return table, fig
+
+
+@profiled("view")
+def squad_view(team: str, squad: dict) -> tuple[pd.DataFrame, go.Figure | None]:
+    """
+    Squad contribution table and per-season run trend for a team.
+
+    Args:
+        team: Team name
+        squad: Squad figures as returned by ``tabs.teams.squad_members``
+            (``batting``/``bowling`` records with a ``player`` field,
+            ``seasons`` runs per player and season, ``awards`` per player)
+
+    Returns:
+        Tuple of (table ranked by share of squad runs and wickets, stacked
+        season-runs chart or None)
+    """
+    return _squad_view(team, payload_hash(squad), squad)
+
+
+MATCHUP_COLUMNS = [
+    ("runs", "Runs"),
+    ("balls", "Balls"),
+    ("strike_rate", "Strike Rate"),
+    ("dismissals", "Dismissals"),
+    ("average", "Average"),
+    ("fours", "Fours"),
+    ("sixes", "Sixes"),
+    ("economy", "Economy"),
+]
+
+
+@st.cache_resource(show_spinner=False, max_entries=VIEW_CACHE_MAX_ENTRIES)
+def _matchup_view(
+    name: str, key: str, _rows, label: str, sort_by: str, min_balls: int, top: int
+) -> tuple[pd.DataFrame, go.Figure] | None:
+    df = pd.DataFrame(_rows)
+    if df.empty or label not in df.columns:
+        return None
+    df = df[df["balls"] >= min_balls].sort_values(sort_by, ascending=False, kind="stable").head(top)
+    if df.empty:
+        return None
+
+    fields = [field for field, _ in MATCHUP_COLUMNS if field in df.columns]
+    values = df[fields].astype("float64")
+    # Scale each column to 0..1 so metrics with different units share one colour scale
+    spread = (values.max() - values.min()).replace(0, 1)
+    scaled = (values - values.min()) / spread
+    titles = dict(MATCHUP_COLUMNS)
+
+    fig = go.Figure(go.Heatmap(
+        z=scaled.to_numpy(),
+        x=[titles[field] for field in fields],
+        y=df[label].astype(str).tolist(),
+        text=values.round(1).astype(str).to_numpy(),
+        texttemplate="%{text}",
+        colorscale="RdYlGn",
+        showscale=False,
+        hovertemplate="%{y} — %{x}: %{text}<extra></extra>",
+    ))
+    fig.update_layout(
+        height=max(260, 28 * len(df) + 80),
+        title=f"{name}: matchups by {titles.get(sort_by, sort_by)}",
+        yaxis={"autorange": "reversed"},
+        margin={"l": 10, "r": 10, "t": 50, "b": 10},
+    )
+    table = df[[label, *fields]].rename(columns={label: label.title(), **titles})
+    return table, fig
+
+
+@profiled("view")
+def matchup_view(
+    name: str, rows, label: str, sort_by: str = "balls", min_balls: int = 0, top: int = 20
+) -> tuple[pd.DataFrame, go.Figure] | None:
+    """
+    Build the sortable matchup table and heatmap for one batter row or bowler column.
+
+    Args:
+        name: Batter or bowler the matchups belong to
+        rows: Payload from ``/players/{name}/vs-bowlers`` or ``/bowlers/{name}/vs-batters``
+        label: Opponent column in ``rows`` ("bowler" or "batter")
+        sort_by: Metric used to rank opponents
+        min_balls: Minimum balls faced for an opponent to be shown
+        top: Maximum number of opponents shown
+
+    Returns:
+        ``(table, figure)`` or None if nothing qualifies
+    """
+    return _matchup_view(name, payload_hash(rows), rows, label, sort_by, min_balls, top)
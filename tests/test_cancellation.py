@@ -0,0 +1,153 @@
+"""Fetch tokens abandon a rerun's requests on a deadline or a pending rerun, and give back their slots."""
+import gc
+import threading
+import time
+
+import pytest
+import requests
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData, ScriptRequests
+
+from psl_dashboard import api, cancellation
+from psl_dashboard.cancellation import FetchCancelled, FetchToken, pending_request, session_slots, supports_pending_request
+from psl_dashboard.codecs import Decoded
+
+
+def _decoded(payload) -> Decoded:
+    response = requests.Response()
+    response.status_code = 200
+    return Decoded(response, payload, 2, "json", 0.0)
+
+
+class _Server:
+    """Stands in for ``api._send``: counts requests and answers once released."""
+
+    def __init__(self, payload=None, error: Exception | None = None):
+        self.payload = payload
+        self.error = error
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, url, method, params, json_data):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return _decoded(self.payload)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    def install(**kwargs) -> _Server:
+        fake = _Server(**kwargs)
+        monkeypatch.setattr(api, "_send", fake)
+        return fake
+
+    return install
+
+
+def _fetch_with(monkeypatch, token: FetchToken, endpoint: str):
+    monkeypatch.setattr(api, "current_token", lambda: token)
+    return api._make_request("http://stub", endpoint, "GET", None, None)
+
+
+def _later(seconds: float, action):
+    timer = threading.Timer(seconds, action)
+    timer.start()
+    return timer
+
+
+def test_deadline_expiry_times_out_the_token():
+    token = FetchToken(deadline=time.monotonic() + 0.05)
+    assert not token.cancelled()
+    time.sleep(0.06)
+    assert token.cancelled() and token.timed_out
+    with pytest.raises(FetchCancelled) as raised:
+        token.check()
+    assert raised.value.timed_out
+
+
+def test_deadline_expiry_abandons_an_in_flight_request(monkeypatch, server):
+    fake = server(payload={"runs": 1})
+    token = FetchToken(deadline=time.monotonic() + 0.1)
+    with pytest.raises(FetchCancelled) as raised:
+        _fetch_with(monkeypatch, token, "/deadline")
+    fake.release.set()
+    assert raised.value.timed_out
+
+
+def test_pending_rerun_cancels_an_in_flight_request(monkeypatch, server):
+    fake = server(payload={"runs": 1})
+    script_requests = ScriptRequests()
+    assert supports_pending_request(script_requests)
+    token = FetchToken(script_requests)
+    _later(0.1, lambda: script_requests.request_rerun(RerunData()))
+    started = time.monotonic()
+    with pytest.raises(FetchCancelled) as raised:
+        _fetch_with(monkeypatch, token, "/rerun")
+    # Abandoned while the response was still outstanding
+    assert time.monotonic() - started < 1
+    assert pending_request(script_requests) == "RERUN"
+    assert not raised.value.timed_out
+
+    # The abandoned response warms the next rerun's identical request
+    fake.release.set()
+    deadline = time.monotonic() + 2
+    while not api._warm and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _fetch_with(monkeypatch, FetchToken(), "/rerun") == {"runs": 1}
+    assert fake.calls == 1
+
+
+def test_identical_requests_share_one_network_call(monkeypatch, server):
+    fake = server(payload=[1, 2])
+    token = FetchToken()
+    monkeypatch.setattr(api, "current_token", lambda: token)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(api._make_request("http://stub", "/shared", "GET", None, None)))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    _later(0.1, fake.release.set)
+    for thread in threads:
+        thread.join(5)
+    assert results == [[1, 2]] * 3
+    assert fake.calls == 1
+
+
+def test_slots_are_released_on_error(monkeypatch, server):
+    fake = server(error=requests.ConnectionError("refused"))
+    fake.release.set()
+    slots = threading.BoundedSemaphore(2)
+    token = FetchToken(slots=slots)
+    for attempt in range(3):
+        with pytest.raises(requests.ConnectionError):
+            _fetch_with(monkeypatch, token, f"/error/{attempt}")
+    # Every slot comes back (released by the request's done callback)
+    assert slots.acquire(timeout=1) and slots.acquire(timeout=1)
+
+
+def test_waiting_for_a_slot_honours_cancellation(monkeypatch, server):
+    fake = server(payload={})
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    token = FetchToken(deadline=time.monotonic() + 0.1, slots=slots)
+    with pytest.raises(FetchCancelled):
+        _fetch_with(monkeypatch, token, "/no-slot")
+    assert fake.calls == 0
+    slots.release()
+    assert slots.acquire(blocking=False)
+
+
+def test_session_slots_are_shared_per_session_and_dropped_with_their_tokens():
+    slots = session_slots("session-a")
+    assert session_slots("session-a") is slots
+    assert session_slots("session-b") is not slots
+    del slots
+    gc.collect()
+    assert "session-a" not in cancellation._session_slots
+
+
+def test_missing_request_state_falls_back_to_the_deadline():
+    assert not supports_pending_request(object())
@@ -0,0 +1,137 @@
+"""Responses decode from their bytes, fall back to text, and binary bodies fail loudly when malformed."""
+import io
+import json
+
+import pytest
+import requests
+
+from psl_dashboard import codecs
+from psl_dashboard.codecs import (
+    JSON_CODEC,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    Codec,
+    accept_header,
+    codec_for,
+    negotiate,
+    read_response,
+)
+
+
+class _TrickleRaw(io.BytesIO):
+    """A socket-like body that hands out at most ``step`` bytes per ``readinto``."""
+
+    def __init__(self, body: bytes, step: int):
+        super().__init__(body)
+        self.step = step
+        self.reads = 0
+
+    def readinto(self, buffer) -> int:
+        self.reads += 1
+        with memoryview(buffer) as view:
+            return super().readinto(view[: self.step])
+
+
+def _response(body: bytes, content_type: str | None = JSON_MEDIA_TYPE, status: int = 200, length: int | None = None, raw=None):
+    response = requests.Response()
+    response.status_code = status
+    response.encoding = "utf-8"
+    response.raw = raw if raw is not None else io.BytesIO(body)
+    if content_type is not None:
+        response.headers["Content-Type"] = content_type
+    response.headers["Content-Length"] = str(len(body) if length is None else length)
+    return response
+
+
+@pytest.fixture
+def binary_codec(monkeypatch):
+    """A registered binary codec standing in for MessagePack."""
+
+    def decode(body):
+        if not bytes(body).startswith(b"BIN:"):
+            raise ValueError("bad magic")
+        return json.loads(bytes(body)[4:])
+
+    codec = Codec("msgpack", MSGPACK_MEDIA_TYPE, "test", lambda payload: b"BIN:" + json.dumps(payload).encode(), decode)
+    monkeypatch.setitem(codecs.CODECS, MSGPACK_MEDIA_TYPE, codec)
+    return codec
+
+
+def test_accept_header_asks_for_msgpack_only_when_a_codec_is_registered(binary_codec, monkeypatch):
+    assert accept_header("json") == JSON_MEDIA_TYPE
+    assert accept_header("msgpack") == f"{MSGPACK_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.9"
+    monkeypatch.delitem(codecs.CODECS, MSGPACK_MEDIA_TYPE)
+    assert accept_header("msgpack") == JSON_MEDIA_TYPE
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, "json"),
+    ("text/html", "json"),
+    (f"{MSGPACK_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.9", "msgpack"),
+    (f"{MSGPACK_MEDIA_TYPE};q=0.5, {JSON_MEDIA_TYPE}", "json"),
+    (f"{JSON_MEDIA_TYPE}, {MSGPACK_MEDIA_TYPE}", "json"),
+    (f"{MSGPACK_MEDIA_TYPE};q=oops, {JSON_MEDIA_TYPE};q=0.1", "json"),
+])
+def test_negotiate_prefers_the_highest_quality_registered_codec(binary_codec, accept, expected):
+    assert negotiate(accept).name == expected
+
+
+def test_codec_for_reads_media_type_parameters_and_json_suffixes():
+    assert codec_for("application/json; charset=utf-8") is JSON_CODEC
+    assert codec_for("application/problem+json") is JSON_CODEC
+    assert codec_for("text/plain") is None
+
+
+def test_json_body_is_decoded():
+    decoded = read_response(_response(b'{"runs": 3080, "avg": 32.77}'))
+    assert decoded.payload == {"runs": 3080, "avg": 32.77}
+    assert decoded.codec == "json"
+    assert decoded.size == 28
+
+
+def test_non_json_body_falls_back_to_text():
+    decoded = read_response(_response(b"Service warming up", content_type="text/plain"))
+    assert decoded.payload == "Service warming up"
+    assert decoded.codec == "text"
+
+
+def test_error_responses_are_read_but_not_decoded():
+    decoded = read_response(_response(b'{"detail": "Player not found"}', status=404))
+    assert decoded.payload is None and decoded.codec is None
+    assert decoded.response.text == '{"detail": "Player not found"}'
+
+
+def test_binary_body_is_decoded(binary_codec):
+    decoded = read_response(_response(binary_codec.encode([1, 2, 3]), content_type=MSGPACK_MEDIA_TYPE))
+    assert decoded.payload == [1, 2, 3]
+    assert decoded.codec == "msgpack"
+
+
+def test_malformed_binary_body_raises_content_decoding_error(binary_codec):
+    with pytest.raises(requests.exceptions.ContentDecodingError, match="Malformed msgpack response"):
+        read_response(_response(b"\x00garbage", content_type=MSGPACK_MEDIA_TYPE))
+
+
+def test_large_body_is_read_into_one_buffer_across_short_reads():
+    body = json.dumps([{"player": f"P{i}", "runs": i} for i in range(500)]).encode()
+    raw = _TrickleRaw(body, step=1000)
+    decoded = read_response(_response(body, raw=raw), stream_threshold=0)
+    assert decoded.payload[-1] == {"player": "P499", "runs": 499}
+    assert decoded.size == len(body)
+    assert raw.reads > len(body) // 1000
+
+
+def test_truncated_body_is_trimmed_to_what_arrived():
+    body = b'"short"'
+    # The server promised more bytes than it sent
+    decoded = read_response(_response(body, length=len(body) + 10, raw=_TrickleRaw(body, step=3)), stream_threshold=0)
+    assert decoded.payload == "short"
+    assert decoded.size == len(body)
+
+
+def test_bodies_without_a_length_are_streamed_in_chunks():
+    body = json.dumps(list(range(1000))).encode()
+    response = _response(body)
+    del response.headers["Content-Length"]
+    decoded = read_response(response, stream_threshold=0)
+    assert decoded.payload == list(range(1000))
@@ -0,0 +1,90 @@
+"""Payload conversion keeps codes as text, rates as float64 and flags as booleans."""
+import pandas as pd
+import pytest
+
+from psl_dashboard.frames import filter_frame, optimize_dtypes, page_frame, payload_hash, sort_frame, to_frame
+
+
+def test_leading_zero_and_identifier_columns_stay_text():
+    frame = optimize_dtypes(pd.DataFrame({
+        "jersey": ["007", "10", "23"],
+        "match_id": ["1", "2", "3"],
+        "venue_code": ["11", "12", "13"],
+        "runs": ["10", "25", "3"],
+    }))
+    assert frame["jersey"].tolist() == ["007", "10", "23"]
+    assert frame["match_id"].tolist() == ["1", "2", "3"]
+    assert frame["venue_code"].tolist() == ["11", "12", "13"]
+    assert pd.api.types.is_integer_dtype(frame["runs"])
+
+
+def test_rates_keep_float64_and_whole_numbers_are_downcast():
+    frame = optimize_dtypes(pd.DataFrame({"strikeRate": [135.71, 142.0, None], "runs": [120.0, 85.0, 3.0]}))
+    assert frame["strikeRate"].dtype == "float64"
+    assert frame["strikeRate"].iloc[0] == 135.71
+    assert pd.api.types.is_integer_dtype(frame["runs"])
+    assert frame["runs"].tolist() == [120, 85, 3]
+
+
+@pytest.mark.parametrize("values", [[True, None, False], [False, True, True]])
+def test_flags_stay_booleans(values):
+    frame = optimize_dtypes(pd.DataFrame({"won": pd.Series(values, dtype=object)}))
+    assert pd.api.types.is_bool_dtype(frame["won"])
+    assert [None if pd.isna(value) else bool(value) for value in frame["won"]] == values
+
+
+def test_name_columns_become_categoricals():
+    frame = optimize_dtypes(pd.DataFrame({
+        "player": ["Babar Azam", "Fakhar Zaman", "Shadab Khan", "Imad Wasim"],
+        "note": ["a", "b", "c", "d"],
+        "role": ["bat", "bat", "bowl", "bat"],
+    }))
+    assert isinstance(frame["player"].dtype, pd.CategoricalDtype)
+    # Unique free text stays plain text; repetitive text is categorised
+    assert not isinstance(frame["note"].dtype, pd.CategoricalDtype)
+    assert isinstance(frame["role"].dtype, pd.CategoricalDtype)
+
+
+def test_mixed_values_are_made_arrow_safe():
+    frame = optimize_dtypes(pd.DataFrame({"highestScore": ["126*", 98, None]}))
+    assert frame["highestScore"].tolist()[:2] == ["126*", "98"]
+
+
+def test_to_frame_flattens_dict_payloads():
+    frame = to_frame({"Karachi Kings": {"won": 5}, "Lahore Qalandars": {"won": 7}}, index_label="team")
+    assert frame["team"].tolist() == ["Karachi Kings", "Lahore Qalandars"]
+    assert frame["won"].tolist() == [5, 7]
+    assert payload_hash({"a": 1, "b": 2}) == payload_hash({"b": 2, "a": 1})
+
+
+def _table() -> pd.DataFrame:
+    return optimize_dtypes(pd.DataFrame({
+        "player": ["Babar Azam", "Fakhar Zaman", "Azam Khan", "Shadab Khan", "Imad Wasim"],
+        "team": ["Peshawar Zalmi", "Lahore Qalandars", "Islamabad United", "Islamabad United", "Karachi Kings"],
+        "runs": [3080, 3285, 512, 900, 1100],
+    }))
+
+
+def test_filter_frame_matches_text_and_categories():
+    table = _table()
+    assert filter_frame(table, "azam")["player"].tolist() == ["Babar Azam", "Azam Khan"]
+    assert filter_frame(table, "ISLAMABAD")["player"].tolist() == ["Azam Khan", "Shadab Khan"]
+    # Numbers are not searched; an empty query keeps everything
+    assert filter_frame(table, "3080").empty
+    assert filter_frame(table, "  ") is table
+
+
+def test_sort_frame_is_stable_and_ignores_unknown_columns():
+    table = _table()
+    assert sort_frame(table, "runs", ascending=False)["runs"].tolist() == [3285, 3080, 1100, 900, 512]
+    by_team = sort_frame(table, "team")
+    assert by_team["player"].tolist()[:2] == ["Azam Khan", "Shadab Khan"]
+    assert sort_frame(table, "missing") is table
+
+
+def test_page_frame_returns_one_based_pages():
+    table = _table()
+    assert page_frame(table, 1, 2)["runs"].tolist() == [3080, 3285]
+    assert page_frame(table, 3, 2)["runs"].tolist() == [1100]
+    assert page_frame(table, 0, 2)["runs"].tolist() == [3080, 3285]
+    assert page_frame(table, 4, 2).empty
@@ -0,0 +1,154 @@
+"""Ingesting matches into a loaded store must answer like a store rebuilt from scratch."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from psl_dashboard.engine import DeliveryStore, handle_request, normalize_deliveries
+from psl_dashboard.engine.ingest import ingest_deliveries
+from psl_dashboard.engine.leaderboards import LEADERBOARD_METRICS
+
+TEAMS = ["Karachi Kings", "Lahore Qalandars", "Multan Sultans", "Peshawar Zalmi"]
+
+
+def _squad(team: str) -> list[str]:
+    return [f"{team.split()[0]} P{i}" for i in range(8)]
+
+
+def _match(rng, match_id, season, date, stage, batting_first, fielding_first, squads=None) -> pd.DataFrame:
+    squads = squads or {}
+    rows = []
+    for inning, (batting, bowling) in enumerate([(batting_first, fielding_first), (fielding_first, batting_first)], start=1):
+        batters = squads.get(batting, _squad(batting))
+        bowlers = squads.get(bowling, _squad(bowling))
+        striker, other, next_in = batters[0], batters[1], 2
+        for over in range(4):
+            for ball in range(1, 7):
+                extras = rng.choice(["", "", "", "", "", "", "wides", "noballs"])
+                runs = int(rng.choice([0, 0, 1, 1, 2, 4, 6]))
+                dismissal = rng.choice(["", "", "", "", "", "", "", "caught", "bowled", "run out"]) if not extras else ""
+                rows.append({
+                    "match_id": match_id,
+                    "season": season,
+                    "date": date,
+                    "stage": stage,
+                    "inning": inning,
+                    "over": over,
+                    "ball": ball,
+                    "batting_team": batting,
+                    "bowling_team": bowling,
+                    "batter": striker,
+                    "bowler": bowlers[4 + over % 4],
+                    "non_striker": other,
+                    "batsman_runs": runs,
+                    "extra_runs": 1 if extras else 0,
+                    "extras_type": extras,
+                    "is_wicket": int(bool(dismissal)),
+                    "player_dismissed": striker if dismissal else "",
+                    "dismissal_kind": dismissal,
+                    "fielder": rng.choice(bowlers) if dismissal == "caught" else "",
+                })
+                if dismissal and next_in < len(batters):
+                    striker, next_in = batters[next_in], next_in + 1
+    frame = pd.DataFrame(rows)
+    frame["winner"] = rng.choice([batting_first, fielding_first, ""])
+    frame["player_of_match"] = rng.choice(frame["batter"].unique())
+    return frame
+
+
+def _league(rng, matches: list[tuple], squads=None) -> pd.DataFrame:
+    return pd.concat([_match(rng, *match, squads=squads) for match in matches], ignore_index=True)
+
+
+def _fixtures(seasons, staged: bool, start: int = 1) -> list[tuple]:
+    fixtures, match_id = [], start
+    for season in seasons:
+        for day in range(1, 7):
+            home, away = TEAMS[day % 3], TEAMS[(day + 1) % 3]
+            stage = ("Final" if day == 6 else "League") if staged else None
+            fixtures.append((str(match_id), season, f"{season}-03-{day:02d}", stage, home, away))
+            match_id += 1
+    return fixtures
+
+
+def _store(*frames: pd.DataFrame) -> DeliveryStore:
+    return DeliveryStore(normalize_deliveries(pd.concat(frames, ignore_index=True)))
+
+
+def _endpoints(store: DeliveryStore) -> list[tuple]:
+    batters, bowlers, teams = store.batter_names(), store.bowler_names(), [str(team) for team in store.teams]
+    seasons = ",".join(str(season) for season in handle_request(store, "/seasons"))
+    requests = [("GET", path, None) for path in (
+        "/players", "/bowlers", "/teams", "/seasons",
+        "/players/top", "/players/top-sixes", "/players/top-fours", "/players/top-catches",
+        "/players/top-mom", "/bowlers/top", "/teams/top-totals", "/teams/top-chases",
+    )]
+    requests += [("GET", f"/leaderboards?metric={metric}&limit=50", None) for metric in LEADERBOARD_METRICS]
+    requests += [("GET", f"/leaderboards?metric=runs&season={seasons}&team={teams[0]}&limit=50", None)]
+    for name in batters:
+        requests += [("GET", f"/players/{name}/{view}", None) for view in ("stats", "growth", "percentiles", "similar", "vs-bowlers")]
+        requests += [("GET", f"/players/{name}/vs-team/{team}", None) for team in teams]
+        requests += [("GET", f"/players/{name}/vs-bowler/{bowlers[0]}", None)]
+    for name in bowlers:
+        requests += [("GET", f"/bowlers/{name}/{view}", None) for view in ("stats", "percentiles", "similar", "vs-batters")]
+    for team in teams:
+        requests += [("GET", f"/teams/{team}/{view}", None) for view in ("stats", "all")]
+        requests += [("GET", f"/teams/{team}/vs/{other}", None) for other in teams]
+    requests += [
+        ("POST", "/players/compare", {"players": batters[:4]}),
+        ("POST", "/bowlers/compare", {"bowlers": bowlers[:4]}),
+        ("POST", "/teams/compare", {"teams": teams}),
+    ]
+    return requests
+
+
+def _answer(store: DeliveryStore, method: str, path: str, body):
+    try:
+        return handle_request(store, path, method, json_data=body)
+    except LookupError as exc:
+        return ("error", type(exc).__name__, str(exc))
+
+
+def _assert_same_answers(ingested: DeliveryStore, rebuilt: DeliveryStore):
+    requests = _endpoints(rebuilt)
+    assert requests == _endpoints(ingested)
+    for method, path, body in requests:
+        assert _answer(ingested, method, path, body) == _answer(rebuilt, method, path, body), path
+
+
+def _warm(store: DeliveryStore):
+    """Answer every endpoint so the cache holds every aggregate ingest has to carry forward."""
+    for method, path, body in _endpoints(store):
+        _answer(store, method, path, body)
+
+
+@pytest.mark.parametrize("staged", [True, False], ids=["stage-column", "last-match-finals"])
+def test_ingest_matches_full_rebuild(staged):
+    rng = np.random.default_rng(7)
+    base = _league(rng, _fixtures([2021, 2022], staged))
+    # A newcomer team whose players sort before everyone else, a later 2022 match (moves the final without a stage column)
+    # and a new season
+    squads = {TEAMS[3]: [f"Abbas P{i}" for i in range(8)]}
+    new = _league(rng, [
+        ("13", 2022, "2022-03-09", "Final" if staged else None, TEAMS[0], TEAMS[3]),
+        ("14", 2023, "2023-03-01", "League" if staged else None, TEAMS[3], TEAMS[1]),
+    ], squads)
+    later = _league(rng, _fixtures([2023], staged, start=15))
+
+    store = _store(base)
+    _warm(store)
+    store, summary = ingest_deliveries(store, new)
+    assert summary["matches"] == ["13", "14"]
+    _assert_same_answers(store, _store(base, new))
+
+    # A second ingest appends to the chunks left by the first
+    _warm(store)
+    store, _ = ingest_deliveries(store, later)
+    _assert_same_answers(store, _store(base, new, later))
+
+
+def test_ingest_rejects_loaded_matches():
+    rng = np.random.default_rng(3)
+    base = _league(rng, _fixtures([2021], staged=True))
+    store = _store(base)
+    with pytest.raises(ValueError, match="already ingested"):
+        ingest_deliveries(store, base[base["match_id"] == "2"])